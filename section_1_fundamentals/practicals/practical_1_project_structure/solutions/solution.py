@@ -2,6 +2,12 @@
 
 # Ниже приведены полные реализации игровых классов согласно заданию
 
+import heapq
+import itertools
+import math
+from array import array
+from collections import OrderedDict
+
 
 class SimpleHero:
     """
@@ -226,13 +232,16 @@ class Location:
     """
     Класс для представления игровой локации.
     """
-    def __init__(self, name, description, dangerous=False):
+    def __init__(self, name, description, dangerous=False, position=None):
         self.name = name
         self.description = description
         self.dangerous = dangerous
+        self.position = position  # Координаты (x, y) на карте, если известны
         self.npcs = []
         self.items = []
         self.connections = []  # Список связанных локаций
+        self.connection_costs = {}  # Имя связанной локации -> длина пути
+        self.world = None  # Карта, которой принадлежит локация
 
     def add_npc(self, npc):
         """
@@ -240,12 +249,17 @@ class Location:
         """
         self.npcs.append(npc)
 
-    def add_connection(self, location):
+    def add_connection(self, location, distance=1.0):
         """
         Добавляет связь с другой локацией.
         """
+        if location in self.connections and self.connection_costs.get(location.name) == distance:
+            return  # Такая связь уже есть - маршруты не меняются
         if location not in self.connections:
             self.connections.append(location)
+        self.connection_costs[location.name] = distance
+        if self.world is not None:
+            self.world.connection_changed(self, location, distance)
 
     def describe(self):
         """
@@ -259,21 +273,368 @@ class Location:
         return f"Location(name='{self.name}', dangerous={self.dangerous})"
 
 
+class WorldGraph:
+    """
+    Граф мира в виде массивов смежности (CSR) для поиска маршрутов.
+
+    Локации пронумерованы, исходящие связи локации i лежат в
+    targets[offsets[i]:offsets[i + 1]], их длины - в weights. Для расстояний
+    до хабов хранится и обратный граф.
+
+    Граф меняется на месте: длина существующей связи правится в массивах,
+    новые связи и локации дописываются в небольшие словари extra. Если связь
+    стала короче или появилась новая, расстояния до хабов перестают быть
+    нижней оценкой: хабы помечаются устаревшими (hubs_stale), и поиск
+    работает Дейкстрой, пока их не пересчитают вызовом precompute_hubs.
+    """
+    def __init__(self, locations):
+        self.names = list(locations)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.offsets = array('l', [0])
+        self.targets = array('l')
+        self.weights = array('d')
+        self.extra = {}  # source -> [[target, длина], ...] - связи, добавленные после построения
+        self.reverse_extra = {}  # target -> [[source, длина], ...]
+        self.dangling = {}  # Имя локации не на карте -> [(source, длина), ...] связей к ней
+        for i, name in enumerate(self.names):
+            location = locations[name]
+            for other in location.connections:
+                cost = location.connection_costs.get(other.name, 1.0)
+                target = self.index.get(other.name)
+                if target is None:
+                    # Связь с локацией, которой нет на карте: учтем, когда ее добавят
+                    self.dangling.setdefault(other.name, []).append((i, cost))
+                    continue
+                self.targets.append(target)
+                self.weights.append(cost)
+            self.offsets.append(len(self.targets))
+        self.reverse_offsets, self.reverse_targets, self.reverse_weights = self._reverse()
+        self.hubs = []
+        self.hub_from = []  # hub_from[k][v] - расстояние от хаба k до v
+        self.hub_to = []  # hub_to[k][v] - расстояние от v до хаба k
+        self.hubs_stale = False
+
+    def __len__(self):
+        return len(self.names)
+
+    def _reverse(self):
+        size = len(self.names)
+        counts = [0] * (size + 1)
+        for target in self.targets:
+            counts[target + 1] += 1
+        for i in range(size):
+            counts[i + 1] += counts[i]
+        offsets = array('l', counts)
+        targets = array('l', bytes(offsets.itemsize * len(self.targets)))
+        weights = array('d', bytes(8 * len(self.targets)))
+        position = counts[:size]
+        for source in range(size):
+            for k in range(self.offsets[source], self.offsets[source + 1]):
+                target = self.targets[k]
+                targets[position[target]] = source
+                weights[position[target]] = self.weights[k]
+                position[target] += 1
+        return offsets, targets, weights
+
+    def add_node(self, name):
+        """
+        Добавляет локацию без перестройки массивов и возвращает ее номер.
+        """
+        node = len(self.names)
+        self.names.append(name)
+        self.index[name] = node
+        self.offsets.append(self.offsets[-1])
+        self.reverse_offsets.append(self.reverse_offsets[-1])
+        # Пока у локации нет связей, от хабов до нее не добраться
+        for table in self.hub_from + self.hub_to:
+            table.append(math.inf)
+        for source, cost in self.dangling.pop(name, ()):
+            self.set_edge(source, node, cost)
+        return node
+
+    @staticmethod
+    def _patch(offsets, targets, weights, extra, source, target, cost):
+        # Возвращает прежнюю длину связи (None, если связи не было)
+        for k in range(offsets[source], offsets[source + 1]):
+            if targets[k] == target:
+                old, weights[k] = weights[k], cost
+                return old
+        edges = extra.setdefault(source, [])
+        for edge in edges:
+            if edge[0] == target:
+                old, edge[1] = edge[1], cost
+                return old
+        edges.append([target, cost])
+        return None
+
+    def set_edge(self, source, target, cost):
+        """
+        Задает длину связи source -> target (индексы), добавляя связь при необходимости.
+        """
+        old = self._patch(self.offsets, self.targets, self.weights, self.extra, source, target, cost)
+        self._patch(self.reverse_offsets, self.reverse_targets, self.reverse_weights,
+                    self.reverse_extra, target, source, cost)
+        # Удлинение связи оставляет расстояния до хабов нижней оценкой, остальное - нет
+        if self.hubs and (old is None or cost < old):
+            self.hubs_stale = True
+
+    def distances_from(self, source, reverse=False):
+        """
+        Считает кратчайшие расстояния от source до всех локаций (Дейкстра).
+        """
+        if reverse:
+            offsets, targets, weights = self.reverse_offsets, self.reverse_targets, self.reverse_weights
+            extra = self.reverse_extra
+        else:
+            offsets, targets, weights = self.offsets, self.targets, self.weights
+            extra = self.extra
+        dist = array('d', [math.inf]) * len(self.names)
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            for k in range(offsets[node], offsets[node + 1]):
+                target = targets[k]
+                candidate = d + weights[k]
+                if candidate < dist[target]:
+                    dist[target] = candidate
+                    heapq.heappush(heap, (candidate, target))
+            for target, cost in extra.get(node, ()):
+                candidate = d + cost
+                if candidate < dist[target]:
+                    dist[target] = candidate
+                    heapq.heappush(heap, (candidate, target))
+        return dist
+
+    def precompute_hubs(self, count=8):
+        """
+        Выбирает хабы (самые удаленные друг от друга локации) и считает расстояния от них и до них.
+        """
+        self.hubs, self.hub_from, self.hub_to = [], [], []
+        self.hubs_stale = False
+        if not self.names or count <= 0:
+            return
+        # Первый хаб - локация с наибольшим числом связей
+        hub = max(range(len(self.names)), key=lambda i: self.offsets[i + 1] - self.offsets[i])
+        nearest = array('d', [math.inf]) * len(self.names)
+        while len(self.hubs) < count:
+            self.hubs.append(hub)
+            self.hub_from.append(self.distances_from(hub))
+            self.hub_to.append(self.distances_from(hub, reverse=True))
+            for v, d in enumerate(self.hub_from[-1]):
+                if d < nearest[v]:
+                    nearest[v] = d
+            # Следующий хаб - достижимая локация, дальше всех от уже выбранных
+            candidates = [v for v, d in enumerate(nearest) if 0 < d < math.inf]
+            if not candidates:
+                break
+            hub = max(candidates, key=nearest.__getitem__)
+
+    def _heuristic(self, goal):
+        # ALT: по неравенству треугольника d(v, goal) >= d(hub, goal) - d(hub, v)
+        # и d(v, goal) >= d(v, hub) - d(goal, hub)
+        terms = [(hub_from, hub_from[goal], hub_to, hub_to[goal])
+                 for hub_from, hub_to in zip(self.hub_from, self.hub_to)]
+        inf = math.inf
+
+        def estimate(node):
+            best = 0.0
+            for hub_from, from_goal, hub_to, to_goal in terms:
+                from_node = hub_from[node]
+                if from_node != inf and from_goal - from_node > best:
+                    best = from_goal - from_node
+                if to_goal != inf and hub_to[node] - to_goal > best:
+                    best = hub_to[node] - to_goal
+            return best
+
+        return estimate
+
+    def shortest_path(self, source, goal, algorithm="astar"):
+        """
+        Ищет кратчайший путь от source до goal (индексы локаций).
+
+        Возвращает (список индексов, длина) или ([], inf), если пути нет.
+        """
+        use_hubs = algorithm == "astar" and self.hubs and not self.hubs_stale
+        estimate = self._heuristic(goal) if use_hubs else None
+        offsets, targets, weights, extra = self.offsets, self.targets, self.weights, self.extra
+        dist = {source: 0.0}
+        parent = {source: -1}
+        heap = [(0.0, 0.0, source)]
+        while heap:
+            _, d, node = heapq.heappop(heap)
+            if node == goal:
+                break
+            if d > dist[node]:
+                continue
+            start, end = offsets[node], offsets[node + 1]
+            edges = zip(targets[start:end], weights[start:end])
+            if node in extra:
+                edges = itertools.chain(edges, extra[node])
+            for target, cost in edges:
+                candidate = d + cost
+                if candidate < dist.get(target, math.inf):
+                    priority = candidate
+                    if estimate is not None:
+                        h = estimate(target)
+                        if h == math.inf:
+                            continue  # Из этой локации до цели не добраться
+                        priority += h
+                    dist[target] = candidate
+                    parent[target] = node
+                    heapq.heappush(heap, (priority, candidate, target))
+        else:
+            return [], math.inf
+
+        path = []
+        node = goal
+        while node != -1:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return path, dist[goal]
+
+
 class WorldMap:
     """
     Класс для представления всей игровой карты.
+
+    Для маршрутов карта лениво строит WorldGraph и расстояния до хабов,
+    а найденные пути хранит в ограниченном кэше. Изменение локаций или
+    связей сбрасывает кэш путей и правит граф на месте. Если после этого
+    хабы устарели, поиск идет без них до вызова refresh_hubs() - его стоит
+    делать вне игрового цикла (например, при загрузке уровня).
     """
-    def __init__(self):
+    def __init__(self, hub_count=8, path_cache_size=4096, cell_size=10.0):
         self.locations = {}
         self.start_location = None
+        self.hub_count = hub_count
+        self.path_cache_size = path_cache_size
+        self.cell_size = cell_size
+        self.version = 0  # Растет при каждом изменении карты
+        self._graph = None
+        self._path_cache = OrderedDict()
+        self._grid = None
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def add_location(self, location):
         """
         Добавляет локацию на карту.
         """
+        replaced = location.name in self.locations
         self.locations[location.name] = location
+        location.world = self
         if self.start_location is None:
             self.start_location = location
+        self._grid = None
+        if replaced:
+            self.invalidate_routes()  # Другая локация с тем же именем - граф строим заново
+            return
+        if self._graph is not None:
+            source = self._graph.add_node(location.name)
+            for other in location.connections:
+                self._set_graph_edge(source, other.name, location.connection_costs.get(other.name, 1.0))
+        self._routes_changed()
+
+    def _set_graph_edge(self, source, target_name, cost):
+        target = self._graph.index.get(target_name)
+        if target is None:
+            self._graph.dangling.setdefault(target_name, []).append((source, cost))
+        else:
+            self._graph.set_edge(source, target, cost)
+
+    def _routes_changed(self):
+        self.version += 1
+        self._path_cache.clear()
+
+    def connection_changed(self, location, other, distance):
+        """
+        Учитывает новую или измененную связь: кэш путей сбрасывается,
+        а граф правится на месте, без перестройки.
+        """
+        if self._graph is not None:
+            source = self._graph.index.get(location.name)
+            if source is not None:
+                self._set_graph_edge(source, other.name, distance)
+        self._routes_changed()
+
+    def invalidate_routes(self):
+        """
+        Полностью сбрасывает граф, хабы и кэш путей (граф построится заново при следующем поиске).
+        """
+        self._graph = None
+        self._grid = None
+        self._routes_changed()
+
+    def refresh_hubs(self):
+        """
+        Пересчитывает расстояния до хабов, если изменения связей их устарили.
+        """
+        graph = self.get_graph()
+        if graph.hubs_stale:
+            graph.precompute_hubs(self.hub_count)
+        return graph
+
+    def get_graph(self):
+        """
+        Возвращает граф карты (строит его при первом обращении).
+        """
+        if self._graph is None:
+            self._graph = WorldGraph(self.locations)
+            self._graph.precompute_hubs(self.hub_count)
+        return self._graph
+
+    def find_path(self, start, goal, algorithm="astar"):
+        """
+        Ищет кратчайший маршрут между локациями (A* или Дейкстра).
+
+        Принимает локации или их имена. Возвращает (список локаций, длина);
+        если маршрута нет - ([], inf).
+        """
+        start_name = getattr(start, 'name', start)
+        goal_name = getattr(goal, 'name', goal)
+        graph = self.get_graph()
+        if start_name not in graph.index or goal_name not in graph.index:
+            return [], math.inf
+
+        key = (start_name, goal_name)
+        cached = self._path_cache.get(key)
+        if cached is not None:
+            self._path_cache.move_to_end(key)
+            self.cache_hits += 1
+            path, cost = cached
+        else:
+            self.cache_misses += 1
+            path, cost = graph.shortest_path(graph.index[start_name], graph.index[goal_name], algorithm)
+            self._path_cache[key] = (path, cost)
+            if len(self._path_cache) > self.path_cache_size:
+                self._path_cache.popitem(last=False)
+        return [self.locations[graph.names[i]] for i in path], cost
+
+    def find_locations_near(self, position, radius):
+        """
+        Возвращает локации с координатами не дальше radius от position.
+        """
+        if self._grid is None:
+            self._grid = {}
+            for location in self.locations.values():
+                if location.position is not None:
+                    cell = (int(location.position[0] // self.cell_size), int(location.position[1] // self.cell_size))
+                    self._grid.setdefault(cell, []).append(location)
+
+        x, y = position
+        reach = int(radius // self.cell_size) + 1
+        cell_x, cell_y = int(x // self.cell_size), int(y // self.cell_size)
+        found = []
+        for gx in range(cell_x - reach, cell_x + reach + 1):
+            for gy in range(cell_y - reach, cell_y + reach + 1):
+                for location in self._grid.get((gx, gy), ()):
+                    if math.dist(position, location.position) <= radius:
+                        found.append(location)
+        return found
 
     def get_location(self, name):
         """
@@ -484,6 +845,8 @@ if __name__ == "__main__":
     forest.add_connection(village)
     print(f"Количество локаций на карте: {len(world.locations)}")
     print(str(world))
+    path, distance = world.find_path("Деревня", "Лес")
+    print(f"Маршрут: {' -> '.join(location.name for location in path)} (длина {distance})")
     print()
     
     # Пример использования системы квестов
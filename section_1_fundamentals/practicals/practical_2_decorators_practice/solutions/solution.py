@@ -2,24 +2,261 @@
 
 # Ниже приведены полные реализации игровых декораторов согласно заданию
 
+import functools
+import random
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Пакетный расчет боев работает и без NumPy, но медленнее
+
+
+class ActionSite:
+    """
+    Инструментируемое игровое действие: исходная реализация и ее версия
+    с логированием и замером времени.
+    
+    Если действие объявлено прямо в теле класса или на уровне модуля,
+    реестр подставляет в класс (модуль) нужную реализацию, и при выключенной
+    инструментации вызов идет в исходную функцию без лишних кадров.
+    Иначе (локальная функция или поверх стоит другой декоратор) объект
+    остается в цепочке и выбирает реализацию при каждом вызове.
+    """
+    def __init__(self, registry, plain, instrumented):
+        self.registry = registry
+        self.plain = plain
+        self.instrumented = instrumented
+        self.owner = None  # Класс или модуль, в котором подменяется реализация
+        self.attr = None
+        functools.update_wrapper(self, plain)
+    
+    def current(self):
+        """Возвращает реализацию для текущего режима реестра"""
+        return self.instrumented if self.registry.enabled else self.plain
+    
+    def __call__(self, *args, **kwargs):
+        return self.current()(*args, **kwargs)
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return self.current().__get__(obj, objtype)
+    
+    def __set_name__(self, owner, name):
+        # Вызывается при создании класса - сразу подставляем саму реализацию
+        self.owner, self.attr = owner, name
+        setattr(owner, name, self.current())
+    
+    def rebind(self):
+        """
+        Подставляет в класс или модуль реализацию для текущего режима
+        
+        Returns:
+            bool: Удалось ли убрать объект ActionSite из цепочки вызова
+        """
+        if self.owner is None:
+            qualname = self.plain.__qualname__
+            module = sys.modules.get(self.plain.__module__)
+            if '.' in qualname or module is None or vars(module).get(qualname) is not self:
+                return False
+            self.owner, self.attr = module, qualname
+        
+        if vars(self.owner).get(self.attr) not in (self, self.plain, self.instrumented):
+            return False  # Атрибут переназначен извне - не трогаем его
+        setattr(self.owner, self.attr, self.current())
+        return True
+
+
+class InstrumentationRegistry:
+    """
+    Реестр инструментации игровых действий.
+    
+    Инструментацию можно включать и выключать во время работы. Во включенном
+    режиме задержка каждого вызова попадает в гистограмму действия:
+    все гистограммы хранятся в одном общем буфере array('Q') с корзинами
+    по степеням двойки наносекунд. Запись идет без блокировок, поэтому при
+    одновременных вызовах из нескольких потоков отдельные отсчеты могут теряться.
+    """
+    BUCKETS = 64
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.sites = []
+        self.actions = {}  # имя действия -> номер строки в буфере
+        self.buffer = array('Q')
+    
+    def _slot(self, name):
+        """Возвращает смещение гистограммы действия в общем буфере"""
+        if name not in self.actions:
+            self.actions[name] = len(self.actions)
+            self.buffer.extend([0] * self.BUCKETS)
+        return self.actions[name] * self.BUCKETS
+    
+    def timed(self, name, func):
+        """
+        Оборачивает функцию замером задержки с записью в гистограмму
+        
+        Args:
+            name (str): Имя действия
+            func (callable): Функция для замера
+        """
+        base = self._slot(name)
+        buffer = self.buffer
+        clock = time.perf_counter_ns
+        
+        @functools.wraps(func)
+        def timed_wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                buffer[base + min((clock() - start).bit_length(), 63)] += 1
+        return timed_wrapper
+    
+    def action(self, name, plain, instrumented):
+        """
+        Регистрирует действие с исходной и инструментированной реализацией
+        
+        Args:
+            name (str): Имя действия для гистограммы
+            plain (callable): Реализация без инструментации
+            instrumented (callable): Реализация с логированием (без замера времени)
+            
+        Returns:
+            ActionSite: Объект действия, который возвращает декоратор
+        """
+        site = ActionSite(self, plain, self.timed(name, instrumented))
+        self.sites.append(site)
+        return site
+    
+    def set_enabled(self, enabled):
+        """
+        Включает или выключает инструментацию всех зарегистрированных действий
+        
+        Args:
+            enabled (bool): Новый режим
+        """
+        self.enabled = enabled
+        for site in self.sites:
+            site.rebind()
+    
+    def enable(self):
+        """Включает инструментацию"""
+        self.set_enabled(True)
+    
+    def disable(self):
+        """Выключает инструментацию: действия вызываются без оберток"""
+        self.set_enabled(False)
+    
+    def histogram(self, name):
+        """
+        Возвращает гистограмму задержек действия
+        
+        Args:
+            name (str): Имя действия
+            
+        Returns:
+            dict: {верхняя граница корзины в наносекундах: количество вызовов}
+        """
+        if name not in self.actions:
+            return {}
+        base = self.actions[name] * self.BUCKETS
+        return {1 << bucket: self.buffer[base + bucket]
+                for bucket in range(self.BUCKETS) if self.buffer[base + bucket]}
+    
+    def stats(self):
+        """
+        Возвращает сводку по всем действиям
+        
+        Returns:
+            dict: {имя действия: {'calls', 'p50_ns', 'p99_ns'}} (перцентили - верхние границы корзин)
+        """
+        summary = {}
+        for name in self.actions:
+            histogram = self.histogram(name)
+            calls = sum(histogram.values())
+            if not calls:
+                continue
+            percentiles = {}
+            seen = 0
+            for bound, count in histogram.items():
+                seen += count
+                for label, share in (('p50_ns', 0.5), ('p99_ns', 0.99)):
+                    if label not in percentiles and seen >= calls * share:
+                        percentiles[label] = bound
+            summary[name] = {'calls': calls, **percentiles}
+        return summary
+    
+    def reset(self):
+        """Обнуляет все гистограммы"""
+        for i in range(len(self.buffer)):
+            self.buffer[i] = 0
+
+
+instrumentation = InstrumentationRegistry()
+
+
+def benchmark_instrumentation(iterations=200000):
+    """
+    Измеряет накладные расходы инструментации на один вызов метода
+    
+    Args:
+        iterations (int): Количество вызовов в каждом режиме
+        
+    Returns:
+        dict: Среднее время вызова в наносекундах: без реестра, с выключенной и включенной инструментацией
+    """
+    def strike(self, damage):
+        return damage
+    
+    site = instrumentation.action("benchmark:strike", strike, strike)
+    
+    class BenchmarkCharacter:
+        raw_strike = strike
+        instrumented_strike = site
+    
+    character = BenchmarkCharacter()
+    was_enabled = instrumentation.enabled
+    results = {}
+    try:
+        for label, enabled, method in (('raw_ns', was_enabled, character.raw_strike),
+                                       ('disabled_ns', False, None),
+                                       ('enabled_ns', True, None)):
+            instrumentation.set_enabled(enabled)
+            call = method or character.instrumented_strike
+            start = time.perf_counter()
+            for _ in range(iterations):
+                call(10)
+            results[label] = round((time.perf_counter() - start) / iterations * 1e9, 1)
+    finally:
+        instrumentation.sites.remove(site)
+        instrumentation.set_enabled(was_enabled)
+    return results
+
 
 def log_game_action(func):
     """
-    Декоратор, который логирует вызовы игровых действий
+    Декоратор, который логирует вызовы игровых действий.
+    При выключенной инструментации действие вызывается напрямую.
     """
     def wrapper(*args, **kwargs):
         print(f"Выполняется действие: {func.__name__}")
         result = func(*args, **kwargs)
         print(f"Действие {func.__name__} завершено")
         return result
-    return wrapper
+    return instrumentation.action(f"log_game_action:{func.__qualname__}", func, wrapper)
 
 
 def timing_game_action(func):
     """
-    Декоратор, который измеряет время выполнения игрового действия
+    Декоратор, который измеряет время выполнения игрового действия.
+    При выключенной инструментации действие вызывается напрямую.
     """
-    import time
     def wrapper(*args, **kwargs):
         start_time = time.time()
         result = func(*args, **kwargs)
@@ -27,7 +264,7 @@ def timing_game_action(func):
         execution_time = end_time - start_time
         print(f"Время выполнения {func.__name__}: {execution_time:.4f} секунд")
         return result
-    return wrapper
+    return instrumentation.action(f"timing_game_action:{func.__qualname__}", func, wrapper)
 
 
 def check_alive(func):
@@ -76,7 +313,8 @@ def requires_mana(mana_cost):
             else:
                 print(f"{caster.name} не хватает {mana_cost - caster.mana} маны для заклинания")
                 return None
-        return wrapper
+        # Проверка маны - игровое правило, поэтому остается и без инструментации
+        return instrumentation.action(f"requires_mana:{func.__qualname__}", wrapper, wrapper)
     return decorator
 
 
@@ -108,9 +346,233 @@ def cached_property(func):
         if not hasattr(self, attr_name):
             setattr(self, attr_name, func(self))
         return getattr(self, attr_name)
+    return property(wrapper)
+
+MemoCacheInfo = namedtuple('MemoCacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'evictions', 'expirations', 'hit_ratio'])
+
+_KWARGS_MARK = object()  # Разделитель позиционных и именованных аргументов в ключе
+_NOT_COMPUTED = object()
+
+
+def _make_memo_key(args, kwargs, typed):
+    """
+    Строит хешируемый ключ кэша из аргументов вызова
+    
+    Args:
+        args (tuple): Позиционные аргументы
+        kwargs (dict): Именованные аргументы
+        typed (bool): Различать ли аргументы разных типов (1 и 1.0)
+    """
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(kwargs.items())
+    if typed:
+        key += tuple(type(value) for value in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return key
+
+
+def _memoize_lru(func, maxsize, typed):
+    """
+    Кэш без срока жизни: попадания обслуживает functools.lru_cache (реализован на C),
+    а промахи с одинаковым ключом вычисляются под общей блокировкой один раз
+    """
+    in_flight = {}  # ключ -> [блокировка, число ожидающих, значение]
+    lock = threading.Lock()
+    computed = shared = 0  # вычислено значений / получено готовыми от другого потока
+    
+    def load(*args, **kwargs):
+        nonlocal computed, shared
+        key = _make_memo_key(args, kwargs, typed)
+        with lock:
+            call = in_flight.get(key)
+            if call is None:
+                call = in_flight[key] = [threading.Lock(), 0, _NOT_COMPUTED]
+            call[1] += 1
+        try:
+            with call[0]:
+                if call[2] is _NOT_COMPUTED:
+                    value = func(*args, **kwargs)
+                    with lock:
+                        computed += 1
+                    call[2] = value
+                else:
+                    with lock:
+                        shared += 1
+                return call[2]
+        finally:
+            with lock:
+                call[1] -= 1
+                if call[1] == 0:
+                    del in_flight[key]
+    
+    cached = functools.lru_cache(maxsize=maxsize, typed=typed)(load)
+    lru_cache_info = cached.cache_info
+    lru_cache_clear = cached.cache_clear
+    
+    def cache_info():
+        """Возвращает статистику кэша"""
+        info = lru_cache_info()
+        hits = info.hits + shared
+        calls = hits + computed
+        # Каждое вычисленное значение попадает в кэш один раз, поэтому вытеснено все, чего в нем нет
+        return MemoCacheInfo(hits, computed, maxsize, info.currsize, computed - info.currsize, 0,
+                             hits / calls if calls else 0.0)
+    
+    def cache_clear():
+        """Очищает кэш и статистику"""
+        nonlocal computed, shared
+        with lock:
+            lru_cache_clear()
+            computed = shared = 0
+    
+    functools.update_wrapper(cached, func)
+    cached.cache_info = cache_info
+    cached.cache_clear = cache_clear
+    return cached
+
+
+def _memoize_ttl(func, maxsize, ttl, typed):
+    """
+    Кэш со сроком жизни значений на OrderedDict с вытеснением LRU
+    """
+    cache = OrderedDict()  # ключ -> (значение, момент истечения)
+    in_flight = {}  # ключ -> блокировка вычисления
+    lock = threading.Lock()
+    hits = misses = evictions = expirations = 0
+    
+    def lookup(key):
+        # Вызывается под lock; возвращает запись (значение, момент истечения) или None
+        nonlocal hits, expirations
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del cache[key]
+            expirations += 1
+            return None
+        cache.move_to_end(key)
+        hits += 1
+        return entry
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal misses, evictions
+        key = _make_memo_key(args, kwargs, typed)
+        with lock:
+            entry = lookup(key)
+            if entry is not None:
+                return entry[0]
+            key_lock = in_flight.get(key)
+            if key_lock is None:
+                key_lock = in_flight[key] = threading.Lock()
+        
+        with key_lock:
+            # Пока мы ждали, значение мог вычислить другой поток
+            with lock:
+                entry = lookup(key)
+                if entry is not None:
+                    return entry[0]
+                misses += 1
+            
+            try:
+                value = func(*args, **kwargs)
+            finally:
+                with lock:
+                    if in_flight.get(key) is key_lock:
+                        del in_flight[key]
+            
+            with lock:
+                cache[key] = (value, time.monotonic() + ttl)
+                cache.move_to_end(key)
+                if maxsize is not None and len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    evictions += 1
+            return value
+    
+    def cache_info():
+        """Возвращает статистику кэша"""
+        with lock:
+            calls = hits + misses
+            return MemoCacheInfo(hits, misses, maxsize, len(cache), evictions, expirations,
+                                 hits / calls if calls else 0.0)
+    
+    def cache_clear():
+        """Очищает кэш и статистику"""
+        nonlocal hits, misses, evictions, expirations
+        with lock:
+            cache.clear()
+            hits = misses = evictions = expirations = 0
+    
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
     return wrapper
 
 
+def memoize(maxsize=128, ttl=None, typed=False):
+    """
+    Декоратор, который кэширует результаты чистых функций (например, расчета урона)
+    с вытеснением давно не использованных значений (LRU) и сроком жизни (TTL).
+    Безопасен для потоков: одновременные вызовы с одинаковыми аргументами
+    вычисляют значение только один раз.
+    
+    Args:
+        maxsize (int): Максимальное количество значений в кэше (None - без ограничения)
+        ttl (float): Время жизни значения в секундах (None - бессрочно)
+        typed (bool): Кэшировать ли отдельно аргументы разных типов (1 и 1.0)
+    """
+    if callable(maxsize):
+        # Использование без скобок: @memoize
+        return memoize()(maxsize)
+    
+    def decorator(func):
+        if ttl is None:
+            return _memoize_lru(func, maxsize, typed)
+        return _memoize_ttl(func, maxsize, ttl, typed)
+    return decorator
+
+
+def lru_memoize(maxsize=128, typed=False):
+    """
+    Декоратор memoize только с вытеснением LRU
+    
+    Args:
+        maxsize (int): Максимальное количество значений в кэше
+        typed (bool): Кэшировать ли отдельно аргументы разных типов
+    """
+    return memoize(maxsize=maxsize, typed=typed)
+
+
+def ttl_memoize(ttl, maxsize=128, typed=False):
+    """
+    Декоратор memoize со сроком жизни значений
+    
+    Args:
+        ttl (float): Время жизни значения в секундах
+        maxsize (int): Максимальное количество значений в кэше
+        typed (bool): Кэшировать ли отдельно аргументы разных типов
+    """
+    return memoize(maxsize=maxsize, ttl=ttl, typed=typed)
+
+
+@memoize(maxsize=4096)
+def calculate_damage(base_damage, armor=0, multiplier=1.0):
+    """
+    Рассчитывает итоговый урон с учетом брони цели и множителя атаки.
+    Функция чистая, поэтому ее результаты кэшируются.
+    
+    Args:
+        base_damage (int): Базовый урон
+        armor (int): Броня цели (каждые 100 единиц вдвое снижают урон)
+        multiplier (float): Множитель урона
+        
+    Returns:
+        int: Итоговый урон
+    """
+    return max(0, round(base_damage * multiplier * 100 / (100 + armor)))
+
+
 def requires_conditions(**conditions):
     """
     Декоратор, который проверяет несколько условий перед выполнением действия
@@ -224,8 +686,6 @@ def add_effect_on_success(effect_name, duration=1):
     return decorator
 
 
-import random
-
 def critical_hit(chance=0.1, multiplier=2.0, condition=None):
     """
     Декоратор, который реализует механику критических ударов
@@ -249,7 +709,9 @@ def critical_hit(chance=0.1, multiplier=2.0, condition=None):
                     return critical_damage
             
             return damage
-        return wrapper
+        # Параметры удара нужны пакетному расчету resolve_attacks_batch
+        wrapper.critical_hit = {'chance': chance, 'multiplier': multiplier, 'condition': condition}
+        return instrumentation.action(f"critical_hit:{func.__qualname__}", wrapper, wrapper)
     return decorator
 
 
@@ -334,9 +796,10 @@ def game_mechanic(**rules):
 # Примеры классов для тестирования декораторов
 
 class Character:
-    def __init__(self, name, health=100):
+    def __init__(self, name, health=100, armor=0):
         self.name = name
         self.health = health
+        self.armor = armor
     
     @check_alive
     def attack(self, target, damage):
@@ -433,10 +896,12 @@ class AdvancedCharacter:
     def add_buff(self, stat, value):
         """Добавить бафф к характеристике"""
         self.buffs.append((stat, value))
+        self.__dict__.pop('_' + stat, None)  # Сбрасываем кэшированное значение характеристики
 
     def add_debuff(self, stat, value):
         """Добавить дебафф к характеристике"""
         self.debuffs.append((stat, value))
+        self.__dict__.pop('_' + stat, None)
 
     @cached_property
     def strength(self):
@@ -575,7 +1040,7 @@ class CombatCharacter:
     def basic_attack(self, target, base_damage):
         """Базовая атака"""
         print(f"{self.name} атакует {target.name}")
-        return base_damage
+        return calculate_damage(base_damage, getattr(target, 'armor', 0))
 
     @critical_hit(
         chance=0.2, 
@@ -585,12 +1050,159 @@ class CombatCharacter:
     def special_attack(self, target, base_damage):
         """Специальная атака с условием"""
         print(f"{self.name} выполняет специальную атаку по {target.name}")
-        return base_damage
+        return calculate_damage(base_damage, getattr(target, 'armor', 0))
 
     def __str__(self):
         return f"CombatCharacter(name='{self.name}', crit_bonus={self.crit_chance_bonus})"
 
 
+def resolve_combat_batch(base_damage, armor, crit_chance, crit_multiplier, health, rounds=1, seed=None, backend=None):
+    """
+    Рассчитывает N боев по rounds раундов за один вызов.
+    В каждом раунде атакующий i наносит защитнику i урон calculate_damage(base_damage, armor),
+    который с вероятностью crit_chance умножается на crit_multiplier - так же,
+    как при поочередных вызовах атак с декоратором critical_hit.
+    
+    Args:
+        base_damage (list): Базовый урон атакующих
+        armor (list): Броня защитников
+        crit_chance (list): Шанс критического удара для каждой пары
+        crit_multiplier (list): Множитель критического удара для каждой пары
+        health (list): Здоровье защитников перед боем
+        rounds (int): Количество раундов в каждом бою
+        seed (int): Зерно генератора для воспроизводимости (при одном и том же backend)
+        backend (str): 'numpy' или 'python' (по умолчанию NumPy, если он установлен)
+        
+    Returns:
+        dict: {'damage': суммарный урон, 'crits': число критов, 'health': оставшееся здоровье,
+               'defeated': повержен ли защитник} - по одному значению на бой
+    """
+    if backend is None:
+        backend = 'numpy' if np is not None else 'python'
+    
+    if backend == 'numpy':
+        if np is None:
+            raise ImportError("Для backend='numpy' требуется установить NumPy")
+        base_damage = np.asarray(base_damage, dtype=float)
+        armor = np.asarray(armor, dtype=float)
+        crit_chance = np.asarray(crit_chance, dtype=float)
+        crit_multiplier = np.asarray(crit_multiplier, dtype=float)
+        health = np.asarray(health, dtype=float)
+        
+        # Урон без крита одинаков во всех раундах; np.rint округляет так же, как round()
+        hit = np.maximum(0, np.rint(base_damage * 100 / (100 + armor)))
+        rolls = np.random.default_rng(seed).random((rounds, len(hit)))
+        crit_mask = rolls < crit_chance
+        damage = np.where(crit_mask, hit * crit_multiplier, hit).sum(axis=0)
+        remaining = np.maximum(0, health - damage)
+        return {
+            'damage': damage,
+            'crits': crit_mask.sum(axis=0),
+            'health': remaining,
+            'defeated': remaining <= 0
+        }
+    
+    rng = random.Random(seed)
+    results = {'damage': [], 'crits': [], 'health': [], 'defeated': []}
+    hits = [calculate_damage(base, armor_value) for base, armor_value in zip(base_damage, armor)]
+    totals = [0] * len(hits)
+    crits = [0] * len(hits)
+    # Порядок бросков (раунд за раундом) совпадает с порядком в варианте NumPy
+    for _ in range(rounds):
+        for i, hit in enumerate(hits):
+            if rng.random() < crit_chance[i]:
+                totals[i] += hit * crit_multiplier[i]
+                crits[i] += 1
+            else:
+                totals[i] += hit
+    for total, crit_count, start_health in zip(totals, crits, health):
+        remaining = max(0, start_health - total)
+        results['damage'].append(total)
+        results['crits'].append(crit_count)
+        results['health'].append(remaining)
+        results['defeated'].append(remaining <= 0)
+    return results
+
+
+def resolve_attacks_batch(attackers, defenders, base_damage, attack="basic_attack", rounds=1, seed=None,
+                          apply=False, backend=None):
+    """
+    Пакетный аналог attacker.<attack>(defender, base_damage) для пар персонажей
+    
+    Args:
+        attackers (list): Атакующие (например, CombatCharacter)
+        defenders (list): Защитники с атрибутами health и armor
+        base_damage (int): Базовый урон атаки
+        attack (str): Имя метода атаки с декоратором critical_hit
+        rounds (int): Количество раундов в каждом бою
+        seed (int): Зерно генератора
+        apply (bool): Записать ли оставшееся здоровье в защитников
+        backend (str): 'numpy' или 'python'
+        
+    Returns:
+        dict: Результат resolve_combat_batch
+    """
+    chances, multipliers = [], []
+    for attacker, defender in zip(attackers, defenders):
+        params = getattr(type(attacker), attack).critical_hit
+        condition = params['condition']
+        # Условие крита зависит только от персонажей, поэтому проверяется один раз на пару
+        eligible = condition is None or condition(attacker, defender)
+        chances.append(params['chance'] if eligible else 0.0)
+        multipliers.append(params['multiplier'])
+    
+    results = resolve_combat_batch(
+        [base_damage] * len(chances),
+        [getattr(defender, 'armor', 0) for defender in defenders],
+        chances, multipliers,
+        [defender.health for defender in defenders],
+        rounds=rounds, seed=seed, backend=backend
+    )
+    if apply:
+        for defender, remaining in zip(defenders, results['health']):
+            defender.health = remaining
+    return results
+
+
+def benchmark_combat_batch(fights=10000, rounds=10, backend=None):
+    """
+    Сравнивает пропускную способность поочередного и пакетного расчета боев
+    
+    Args:
+        fights (int): Количество боев
+        rounds (int): Раундов в бою
+        backend (str): Backend пакетного расчета
+        
+    Returns:
+        dict: Количество раундов в секунду для каждого способа
+    """
+    base_damage = [20 + i % 30 for i in range(fights)]
+    armor = [i % 100 for i in range(fights)]
+    chance = [0.15] * fights
+    multiplier = [2.5] * fights
+    health = [500] * fights
+    
+    # Поочередный путь повторяет логику critical_hit без вывода сообщений
+    start = time.perf_counter()
+    for i in range(fights):
+        for _ in range(rounds):
+            damage = calculate_damage(base_damage[i], armor[i])
+            if random.random() < chance[i]:
+                damage = damage * multiplier[i]
+    scalar_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    resolve_combat_batch(base_damage, armor, chance, multiplier, health, rounds=rounds, seed=1, backend=backend)
+    batch_time = time.perf_counter() - start
+    
+    total_rounds = fights * rounds
+    return {
+        'backend': backend or ('numpy' if np is not None else 'python'),
+        'scalar_rounds_per_sec': round(total_rounds / scalar_time),
+        'batch_rounds_per_sec': round(total_rounds / batch_time)
+    }
+
+
 class GameEntity:
     def __init__(self, name, health=100, mana=50, stamina=100):
         self.name = name
@@ -703,6 +1315,36 @@ if __name__ == "__main__":
     print(f"Сила после баффа: {advanced_char.strength}")  # Должно вычислиться снова
     print()
     
+    # Пример использования декоратора memoize
+    print("--- Декоратор memoize ---")
+    @ttl_memoize(ttl=60, maxsize=2)
+    def spell_power(level, intelligence):
+        """Расчет силы заклинания"""
+        print(f"Вычисляется сила заклинания для уровня {level}")
+        return level * 10 + intelligence * 2
+    
+    print(f"Сила: {spell_power(5, 12)}")
+    print(f"Сила (второй вызов): {spell_power(5, 12)}")  # Берется из кэша
+    spell_power(6, 12)
+    spell_power(7, 12)  # Вытесняет самое старое значение
+    print(f"Статистика кэша: {spell_power.cache_info()}")
+    
+    armored_enemy = Character("Голем", 200, armor=50)
+    for _ in range(100000):
+        calculate_damage(30, armored_enemy.armor)
+    print(f"Урон по броне 50: {calculate_damage(30, armored_enemy.armor)}")
+    print(f"Статистика calculate_damage: {calculate_damage.cache_info()}")
+    print()
+    
+    # Пример переключения инструментации
+    print("--- Реестр инструментации ---")
+    instrumentation.disable()
+    print(f"Без инструментации: {cast_spell('Герой', 'Исцеление', 10)}")  # Без логов
+    instrumentation.enable()
+    print(f"Сводка задержек: {instrumentation.stats()}")
+    print(f"Накладные расходы на вызов: {benchmark_instrumentation()}")
+    print()
+    
     # Пример использования декоратора limited_uses
     print("--- Декоратор limited_uses ---")
     paladin = Paladin("Святой")
@@ -721,6 +1363,15 @@ if __name__ == "__main__":
         print(f"Атака {i+1}: {result}")
     print()
     
+    # Пример пакетного расчета боев
+    print("--- Пакетный расчет боев ---")
+    fighters = [CombatCharacter(f"Боец {i}", i % 2) for i in range(4)]
+    dummies = [Character(f"Манекен {i}", 300, armor=25) for i in range(4)]
+    batch = resolve_attacks_batch(fighters, dummies, 20, attack="special_attack", rounds=10, seed=42, apply=True)
+    print(f"Критов по боям: {list(batch['crits'])}, здоровье манекенов: {[d.health for d in dummies]}")
+    print(f"Пропускная способность: {benchmark_combat_batch()}")
+    print()
+    
     # Пример использования декоратора game_mechanic
     print("--- Декоратор game_mechanic ---")
     entity = GameEntity("Тестовая сущность", 100, 50, 100)
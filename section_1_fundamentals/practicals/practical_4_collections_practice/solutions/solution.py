@@ -4,7 +4,19 @@
 
 
 from collections import namedtuple, deque, Counter, defaultdict, OrderedDict
+from array import array
+from operator import itemgetter
+import bisect
 import datetime
+import gc
+import hashlib
+import heapq
+import itertools
+import math
+import random
+import sys
+import time
+import weakref
 
 
 # Задание 1.1: Создание namedtuple для различных игровых сущностей
@@ -61,15 +73,269 @@ add_action(actions, "использовал зелье")
 recent_actions = get_last_actions(actions)
 
 
+# Приближенные счетчики для режима потоковой аналитики
+def _sketch_key_bytes(key):
+    """
+    Переводит ключ в байты. Встроенный hash() для строк зависит от процесса,
+    поэтому для слияния скетчей с разных серверов нужен стабильный хеш
+    """
+    if isinstance(key, bytes):
+        return key
+    return str(key).encode('utf-8')
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: оценка частоты любого ключа в постоянной памяти.
+
+    Оценка никогда не меньше истинного значения и с вероятностью не ниже
+    1 - delta превышает его не более чем на epsilon * total.
+    """
+    def __init__(self, epsilon=0.001, delta=0.01, seed=0):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon и delta должны быть в интервале (0, 1)")
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+        self._hash_key = str(seed).encode('utf-8')
+
+    def _columns(self, key):
+        # Двойное хеширование: depth индексов из двух половин одного 64-битного хеша
+        digest = hashlib.blake2b(_sketch_key_bytes(key), digest_size=8, key=self._hash_key).digest()
+        first = int.from_bytes(digest[:4], 'little')
+        second = int.from_bytes(digest[4:], 'little')
+        width = self.width
+        return [(first + row * second) % width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        """
+        Увеличивает счетчик ключа
+
+        Args:
+            key: Ключ (название заклинания, предмета и т.п.)
+            count (int): Величина увеличения
+        """
+        for row, column in zip(self.rows, self._columns(key)):
+            row[column] += count
+        self.total += count
+
+    def estimate(self, key):
+        """
+        Возвращает оценку частоты ключа (не меньше истинной)
+        """
+        return min(row[column] for row, column in zip(self.rows, self._columns(key)))
+
+    __getitem__ = estimate
+
+    def error_bound(self):
+        """
+        Возвращает максимальную ожидаемую ошибку оценки: epsilon * total
+        """
+        return self.epsilon * self.total
+
+    def merge(self, other):
+        """
+        Добавляет к скетчу другой скетч с теми же параметрами (например, с другого шарда)
+
+        Args:
+            other (CountMinSketch): Скетч для слияния
+        """
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Можно сливать только скетчи с одинаковыми параметрами")
+        for row, other_row in zip(self.rows, other.rows):
+            for column, value in enumerate(other_row):
+                if value:
+                    row[column] += value
+        self.total += other.total
+
+    def memory_bytes(self):
+        """
+        Возвращает объем памяти под счетчики
+        """
+        return sum(row.itemsize * len(row) for row in self.rows)
+
+
+class SpaceSavingTopK:
+    """
+    Алгоритм Space-Saving: топ-K частых ключей в памяти O(capacity).
+
+    Отслеживаемые счетчики завышены не более чем на total / capacity, и
+    любой ключ с частотой выше этой величины гарантированно отслеживается.
+    Минимальный счетчик ищется через кучу с ленивым обновлением: запись в
+    куче может отставать от счетчика и исправляется, только оказавшись на вершине.
+    """
+    def __init__(self, capacity=100):
+        if capacity < 1:
+            raise ValueError("capacity должна быть положительной")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+
+    def _settle_min(self):
+        # Обновляет устаревшие записи на вершине кучи, пока она не станет точной
+        heap = self._heap
+        counts = self.counts
+        while True:
+            count, key = heap[0]
+            current = counts[key]
+            if count == current:
+                return current, key
+            heapq.heapreplace(heap, (current, key))
+
+    def add(self, key, count=1):
+        """
+        Учитывает count появлений ключа
+        """
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+            return
+        if len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+            heapq.heappush(self._heap, (count, key))
+            return
+        # Вытесняем ключ с минимальным счетчиком, новый ключ наследует его значение
+        min_count, min_key = self._settle_min()
+        del counts[min_key]
+        del self.errors[min_key]
+        counts[key] = min_count + count
+        self.errors[key] = min_count
+        heapq.heapreplace(self._heap, (min_count + count, key))
+
+    def min_count(self):
+        """
+        Возвращает минимальный счетчик (0, если таблица не заполнена)
+        """
+        if len(self.counts) < self.capacity:
+            return 0
+        return self._settle_min()[0]
+
+    def most_common(self, n=None):
+        """
+        Возвращает ключи с наибольшими счетчиками в виде (ключ, счетчик)
+        """
+        if n is None:
+            return sorted(self.counts.items(), key=itemgetter(1), reverse=True)
+        return heapq.nlargest(n, self.counts.items(), key=itemgetter(1))
+
+    def merge(self, other):
+        """
+        Сливает сводку другого шарда. Ключ, которого нет в одной из сводок,
+        получает оттуда ее минимальный счетчик - верхнюю оценку пропущенной частоты
+
+        Args:
+            other (SpaceSavingTopK): Сводка для слияния
+        """
+        self_min = self.min_count()
+        other_min = other.min_count()
+        merged = []
+        for key in set(self.counts) | set(other.counts):
+            count = self.counts.get(key, self_min) + other.counts.get(key, other_min)
+            error = self.errors.get(key, self_min) + other.errors.get(key, other_min)
+            merged.append((count, error, key))
+        merged = heapq.nlargest(self.capacity, merged, key=itemgetter(0))
+        self.counts = {key: count for count, error, key in merged}
+        self.errors = {key: error for count, error, key in merged}
+        self._heap = [(count, key) for count, error, key in merged]
+        heapq.heapify(self._heap)
+
+    def memory_bytes(self):
+        """
+        Возвращает примерный объем памяти сводки (без учета самих ключей)
+        """
+        return (sys.getsizeof(self.counts) + sys.getsizeof(self.errors) + sys.getsizeof(self._heap)
+                + len(self._heap) * sys.getsizeof((0, None)))
+
+
+class ApproximateCounter:
+    """
+    Приближенная замена Counter в постоянной памяти.
+
+    Count-Min Sketch отвечает на запрос частоты любого ключа, а Space-Saving
+    хранит кандидатов в топ-K. Для кандидатов берется меньшая из двух оценок,
+    так как обе завышены. Счетчики разных шардов сливаются через merge.
+    """
+    def __init__(self, epsilon=0.001, delta=0.01, top_k=100, seed=0):
+        self.sketch = CountMinSketch(epsilon, delta, seed)
+        self.top = SpaceSavingTopK(top_k)
+
+    def add(self, key, count=1):
+        """
+        Учитывает count появлений ключа
+        """
+        self.sketch.add(key, count)
+        self.top.add(key, count)
+
+    def __getitem__(self, key):
+        estimate = self.sketch.estimate(key)
+        tracked = self.top.counts.get(key)
+        if tracked is not None and tracked < estimate:
+            return tracked
+        return estimate
+
+    def __iter__(self):
+        # Перебираются только отслеживаемые кандидаты в топ
+        return iter(list(self.top.counts))
+
+    def __len__(self):
+        return len(self.top.counts)
+
+    @property
+    def total(self):
+        return self.sketch.total
+
+    def most_common(self, n=None):
+        """
+        Возвращает топ ключей в формате Counter.most_common
+        """
+        ranked = sorted(((key, self[key]) for key in self.top.counts), key=itemgetter(1), reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def error_bound(self):
+        """
+        Возвращает границу ошибки оценки частоты
+        """
+        return self.sketch.error_bound()
+
+    def merge(self, other):
+        """
+        Сливает счетчик другого шарда с теми же параметрами
+        """
+        self.sketch.merge(other.sketch)
+        self.top.merge(other.top)
+
+    def memory_bytes(self):
+        """
+        Возвращает примерный объем памяти счетчика
+        """
+        return self.sketch.memory_bytes() + self.top.memory_bytes()
+
+
 # Задание 2.1: Использование Counter для анализа игровой статистики
 class GameStatistics:
     """
-    Класс для анализа игровой статистики
+    Класс для анализа игровой статистики.
+
+    В приближенном режиме (approximate=True) вместо Counter используются
+    ApproximateCounter: память постоянна, ошибка частоты не превышает
+    epsilon * (число событий) с вероятностью 1 - delta, а топ ограничен top_k.
     """
-    def __init__(self):
-        self.spell_usage = Counter()  # Счетчик использования заклинаний
-        self.item_usage = Counter()  # Счетчик использования предметов
-        self.monster_encounters = Counter()  # Счетчик встреч с монстрами
+    def __init__(self, approximate=False, epsilon=0.001, delta=0.01, top_k=100, seed=0):
+        self.approximate = approximate
+        if approximate:
+            self.spell_usage = ApproximateCounter(epsilon, delta, top_k, seed)
+            self.item_usage = ApproximateCounter(epsilon, delta, top_k, seed)
+            self.monster_encounters = ApproximateCounter(epsilon, delta, top_k, seed)
+        else:
+            self.spell_usage = Counter()  # Счетчик использования заклинаний
+            self.item_usage = Counter()  # Счетчик использования предметов
+            self.monster_encounters = Counter()  # Счетчик встреч с монстрами
     
     def record_spell_cast(self, spell_name):
         """
@@ -78,7 +344,10 @@ class GameStatistics:
         Args:
             spell_name (str): Название заклинания
         """
-        self.spell_usage[spell_name] += 1
+        if self.approximate:
+            self.spell_usage.add(spell_name)
+        else:
+            self.spell_usage[spell_name] += 1
     
     def record_item_use(self, item_name):
         """
@@ -87,7 +356,10 @@ class GameStatistics:
         Args:
             item_name (str): Название предмета
         """
-        self.item_usage[item_name] += 1
+        if self.approximate:
+            self.item_usage.add(item_name)
+        else:
+            self.item_usage[item_name] += 1
     
     def record_monster_encounter(self, monster_name):
         """
@@ -96,7 +368,10 @@ class GameStatistics:
         Args:
             monster_name (str): Название монстра
         """
-        self.monster_encounters[monster_name] += 1
+        if self.approximate:
+            self.monster_encounters.add(monster_name)
+        else:
+            self.monster_encounters[monster_name] += 1
     
     def get_top_spells(self, n=5):
         """
@@ -122,6 +397,21 @@ class GameStatistics:
         """
         return self.item_usage.most_common(n)
 
+    def merge(self, other):
+        """
+        Добавляет статистику другого шарда (режимы должны совпадать)
+
+        Args:
+            other (GameStatistics): Статистика для слияния
+        """
+        if self.approximate != other.approximate:
+            raise ValueError("Нельзя сливать точную и приближенную статистику")
+        for attr in ('spell_usage', 'item_usage', 'monster_encounters'):
+            if self.approximate:
+                getattr(self, attr).merge(getattr(other, attr))
+            else:
+                getattr(self, attr).update(getattr(other, attr))
+
 # Пример использования
 stats = GameStatistics()
 stats.record_spell_cast("Огненный шар")
@@ -493,13 +783,27 @@ recent_msgs = get_recent_messages(chat, 5)
 # Задание 2.3: Использование defaultdict для системы крафта
 class CraftingSystem:
     """
-    Система крафта с группировкой рецептов
+    Система крафта с группировкой рецептов.
+
+    Помимо группировки по категориям ведется обратный индекс
+    "ингредиент -> рецепты, где он нужен". Через него CraftingInventory
+    пересчитывает доступность только тех рецептов, которых касается
+    изменившийся предмет.
     """
     def __init__(self):
         # Группировка рецептов по категориям
         self.recipes_by_category = defaultdict(list)
         # Хранение всех рецептов
         self.all_recipes = {}
+        # Обратный индекс: ингредиент -> {рецепт: нужное количество}
+        # (ингредиенты с нулевым количеством в индекс не попадают)
+        self.recipes_by_ingredient = defaultdict(dict)
+        # Рецепт -> сколько ингредиентов из индекса нужно для крафта
+        self.required_counts = {}
+        # Рецепты без ингредиентов (или только с нулевыми количествами) доступны всегда
+        self.free_recipes = set()
+        # Отслеживаемые инвентари, которые нужно известить о новых рецептах
+        self._inventories = weakref.WeakSet()
     
     def add_recipe(self, name, category, ingredients, result):
         """
@@ -511,6 +815,13 @@ class CraftingSystem:
             ingredients (dict): Ингредиенты {название: количество}
             result (str): Результат крафта
         """
+        old_recipe = self.all_recipes.get(name)
+        if old_recipe is not None:
+            # Рецепт с тем же названием заменяет старый
+            self.recipes_by_category[old_recipe['category']].remove(old_recipe)
+            for ingredient in old_recipe['ingredients']:
+                self.recipes_by_ingredient[ingredient].pop(name, None)
+            self.free_recipes.discard(name)
         recipe = {
             'name': name,
             'category': category,
@@ -519,6 +830,16 @@ class CraftingSystem:
         }
         self.recipes_by_category[category].append(recipe)
         self.all_recipes[name] = recipe
+        required_count = 0
+        for ingredient, required_amount in ingredients.items():
+            if required_amount > 0:
+                self.recipes_by_ingredient[ingredient][name] = required_amount
+                required_count += 1
+        self.required_counts[name] = required_count
+        if not required_count:
+            self.free_recipes.add(name)
+        for inventory in self._inventories:
+            inventory._track_recipe(recipe)
     
     def get_recipes_by_category(self, category):
         """
@@ -538,13 +859,16 @@ class CraftingSystem:
         
         Args:
             recipe_name (str): Название рецепта
-            inventory (dict): Инвентарь игрока {предмет: количество}
+            inventory (dict | CraftingInventory): Инвентарь игрока {предмет: количество}
         
         Returns:
             bool: Можно ли создать предмет
         """
         if recipe_name not in self.all_recipes:
             return False
+
+        if isinstance(inventory, CraftingInventory):
+            return recipe_name in inventory.craftable
         
         recipe = self.all_recipes[recipe_name]
         ingredients = recipe['ingredients']
@@ -555,6 +879,195 @@ class CraftingSystem:
         
         return True
 
+    def get_craftable_recipes(self, inventory):
+        """
+        Возвращает все рецепты, которые можно создать из инвентаря.
+
+        Для CraftingInventory ответ уже готов. Для обычного словаря
+        просматриваются только рецепты, использующие имеющиеся предметы,
+        а не весь список рецептов
+
+        Args:
+            inventory (dict | CraftingInventory): Инвентарь игрока
+
+        Returns:
+            list: Отсортированные названия рецептов
+        """
+        if isinstance(inventory, CraftingInventory):
+            return sorted(inventory.craftable)
+
+        satisfied = Counter()
+        for item, amount in inventory.items():
+            for recipe_name, required_amount in self.recipes_by_ingredient.get(item, {}).items():
+                if amount >= required_amount:
+                    satisfied[recipe_name] += 1
+        craftable = [name for name, count in satisfied.items()
+                     if count == self.required_counts[name]]
+        craftable.extend(self.free_recipes)
+        return sorted(craftable)
+
+    def track_inventory(self, items=None):
+        """
+        Создает инвентарь, для которого доступность рецептов
+        поддерживается инкрементально
+
+        Args:
+            items (dict): Начальное содержимое {предмет: количество}
+
+        Returns:
+            CraftingInventory: Отслеживаемый инвентарь
+        """
+        return CraftingInventory(self, items)
+
+
+class CraftingInventory:
+    """
+    Инвентарь со счетчиками недостающих ингредиентов.
+
+    Для каждого рецепта хранится, сколько его ингредиентов пока не хватает;
+    рецепты со счетчиком 0 лежат в множестве craftable. Изменение количества
+    предмета затрагивает только рецепты из обратного индекса этого предмета.
+    """
+    def __init__(self, crafting_system, items=None):
+        self.crafting_system = crafting_system
+        self.items = {}
+        self.missing = {}
+        self.craftable = set()
+        for recipe in crafting_system.all_recipes.values():
+            self._track_recipe(recipe)
+        crafting_system._inventories.add(self)
+        for item, amount in (items or {}).items():
+            self.set_item(item, amount)
+
+    def _track_recipe(self, recipe):
+        self.craftable.discard(recipe['name'])
+        missing = 0
+        for ingredient, required_amount in recipe['ingredients'].items():
+            if self.items.get(ingredient, 0) < required_amount:
+                missing += 1
+        self.missing[recipe['name']] = missing
+        if missing == 0:
+            self.craftable.add(recipe['name'])
+
+    def get(self, item, default=0):
+        return self.items.get(item, default)
+
+    def set_item(self, item, amount):
+        """
+        Устанавливает количество предмета и обновляет доступные рецепты
+
+        Args:
+            item (str): Название предмета
+            amount (int): Новое количество
+        """
+        old_amount = self.items.get(item, 0)
+        if amount > 0:
+            self.items[item] = amount
+        else:
+            self.items.pop(item, None)
+            amount = 0
+        if amount == old_amount:
+            return
+
+        missing = self.missing
+        craftable = self.craftable
+        for recipe_name, required_amount in self.crafting_system.recipes_by_ingredient.get(item, {}).items():
+            was_enough = old_amount >= required_amount
+            is_enough = amount >= required_amount
+            if was_enough == is_enough:
+                continue
+            if is_enough:
+                missing[recipe_name] -= 1
+                if missing[recipe_name] == 0:
+                    craftable.add(recipe_name)
+            else:
+                if missing[recipe_name] == 0:
+                    craftable.discard(recipe_name)
+                missing[recipe_name] += 1
+
+    def add_item(self, item, amount=1):
+        """
+        Добавляет предметы в инвентарь
+        """
+        self.set_item(item, self.items.get(item, 0) + amount)
+
+    def remove_item(self, item, amount=1):
+        """
+        Убирает предметы из инвентаря
+
+        Returns:
+            bool: True, если предметов хватило
+        """
+        current = self.items.get(item, 0)
+        if current < amount:
+            return False
+        self.set_item(item, current - amount)
+        return True
+
+    def craft(self, recipe_name):
+        """
+        Создает предмет: списывает ингредиенты и добавляет результат
+
+        Args:
+            recipe_name (str): Название рецепта
+
+        Returns:
+            bool: True, если предмет создан
+        """
+        if recipe_name not in self.craftable:
+            print(f"Недостаточно ингредиентов для '{recipe_name}'")
+            return False
+        recipe = self.crafting_system.all_recipes[recipe_name]
+        for ingredient, required_amount in recipe['ingredients'].items():
+            self.remove_item(ingredient, required_amount)
+        self.add_item(recipe['result'])
+        return True
+
+
+def benchmark_crafting(recipe_count=50000, ingredient_count=2000, updates=10000, seed=42):
+    """
+    Сравнивает полный перебор рецептов с обратным индексом
+
+    Args:
+        recipe_count (int): Количество рецептов
+        ingredient_count (int): Количество видов ингредиентов
+        updates (int): Количество изменений инвентаря
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        dict: Время полного перебора, обновления и запроса по индексу
+    """
+    rng = random.Random(seed)
+    ingredients = [f"ingredient_{index}" for index in range(ingredient_count)]
+    crafting = CraftingSystem()
+    for index in range(recipe_count):
+        needed = rng.sample(ingredients, rng.randint(2, 5))
+        crafting.add_recipe(f"recipe_{index}", "misc", {item: rng.randint(1, 3) for item in needed}, "item")
+    items = {item: rng.randint(0, 3) for item in ingredients}
+    inventory = crafting.track_inventory(items)
+
+    start = time.perf_counter()
+    full_scan = [name for name in crafting.all_recipes if crafting.can_craft(name, items)]
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        inventory.set_item(rng.choice(ingredients), rng.randint(0, 3))
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    craftable = crafting.get_craftable_recipes(inventory)
+    query_time = time.perf_counter() - start
+
+    return {
+        'recipes': recipe_count,
+        'full_scan_ms': round(scan_time * 1000, 2),
+        'update_us': round(update_time / updates * 1e6, 2),
+        'indexed_query_ms': round(query_time * 1000, 2),
+        'craftable_before': len(full_scan),
+        'craftable_after': len(craftable),
+    }
+
 # Пример использования
 crafting = CraftingSystem()
 crafting.add_recipe("Деревянный меч", "оружие", {"дерево": 3}, "меч")
@@ -564,15 +1077,24 @@ weapons = crafting.get_recipes_by_category("оружие")
 # Задание 2.4: Использование Counter для анализа эффективности заклинаний
 class SpellEffectivenessAnalyzer:
     """
-    Анализатор эффективности заклинаний
+    Анализатор эффективности заклинаний.
+
+    В приближенном режиме общее число использований ведет ApproximateCounter
+    (он же дает кандидатов в топ), а успехи и неудачи - CountMinSketch.
     """
-    def __init__(self):
-        # Счетчик успешных использований заклинаний
-        self.successful_casts = Counter()
-        # Счетчик неудачных использований заклинаний
-        self.failed_casts = Counter()
-        # Общее количество использований
-        self.total_casts = Counter()
+    def __init__(self, approximate=False, epsilon=0.001, delta=0.01, top_k=100, seed=0):
+        self.approximate = approximate
+        if approximate:
+            self.successful_casts = CountMinSketch(epsilon, delta, seed)
+            self.failed_casts = CountMinSketch(epsilon, delta, seed)
+            self.total_casts = ApproximateCounter(epsilon, delta, top_k, seed)
+        else:
+            # Счетчик успешных использований заклинаний
+            self.successful_casts = Counter()
+            # Счетчик неудачных использований заклинаний
+            self.failed_casts = Counter()
+            # Общее количество использований
+            self.total_casts = Counter()
     
     def record_cast(self, spell_name, success=True):
         """
@@ -582,6 +1104,10 @@ class SpellEffectivenessAnalyzer:
             spell_name (str): Название заклинания
             success (bool): Успешно ли было использование
         """
+        if self.approximate:
+            self.total_casts.add(spell_name)
+            (self.successful_casts if success else self.failed_casts).add(spell_name)
+            return
         self.total_casts[spell_name] += 1
         if success:
             self.successful_casts[spell_name] += 1
@@ -601,8 +1127,24 @@ class SpellEffectivenessAnalyzer:
         total = self.total_casts[spell_name]
         if total == 0:
             return 0.0
-        successful = self.successful_casts[spell_name]
+        # Приближенные оценки завышены независимо, поэтому успехов не может быть больше общего числа
+        successful = min(self.successful_casts[spell_name], total)
         return (successful / total) * 100
+
+    def merge(self, other):
+        """
+        Добавляет статистику другого шарда (режимы должны совпадать)
+
+        Args:
+            other (SpellEffectivenessAnalyzer): Анализатор для слияния
+        """
+        if self.approximate != other.approximate:
+            raise ValueError("Нельзя сливать точную и приближенную статистику")
+        for attr in ('successful_casts', 'failed_casts', 'total_casts'):
+            if self.approximate:
+                getattr(self, attr).merge(getattr(other, attr))
+            else:
+                getattr(self, attr).update(getattr(other, attr))
     
     def get_top_effective_spells(self, n=5):
         """
@@ -633,16 +1175,274 @@ analyzer.record_cast("Огненный шар", False)
 effectiveness = analyzer.get_effectiveness("Огненный шар")
 
 
+def benchmark_approximate_counters(events=200000, distinct=50000, skew=1.1,
+                                   configs=((0.01, 50), (0.001, 100), (0.0001, 500)),
+                                   top_n=10, seed=42):
+    """
+    Сравнивает точность и память приближенного счетчика с точным Counter
+
+    События генерируются по закону Ципфа: немного популярных заклинаний
+    и длинный хвост редких.
+
+    Args:
+        events (int): Количество событий
+        distinct (int): Количество различных ключей
+        skew (float): Показатель распределения Ципфа
+        configs (tuple): Пары (epsilon, top_k) для проверки
+        top_n (int): Размер проверяемого топа
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        list: Словари с памятью, полнотой топа и ошибками оценок
+    """
+    rng = random.Random(seed)
+    keys = [f"spell_{index}" for index in range(distinct)]
+    weights = list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, distinct + 1)))
+    stream = rng.choices(keys, cum_weights=weights, k=events)
+
+    exact = Counter(stream)
+    exact_memory = sys.getsizeof(exact) + sum(sys.getsizeof(key) for key in exact)
+    exact_top = {key for key, count in exact.most_common(top_n)}
+
+    results = [{'mode': 'exact', 'memory_bytes': exact_memory, 'top_recall': 1.0,
+                'max_error': 0, 'error_bound': 0}]
+    for epsilon, top_k in configs:
+        counter = ApproximateCounter(epsilon=epsilon, top_k=top_k, seed=seed)
+        start = time.perf_counter()
+        for key in stream:
+            counter.add(key)
+        elapsed = time.perf_counter() - start
+        approx_top = {key for key, count in counter.most_common(top_n)}
+        sample = [key for key, count in exact.most_common(1000)]
+        max_error = max(counter[key] - exact[key] for key in sample)
+        results.append({
+            'mode': f'epsilon={epsilon}, top_k={top_k}',
+            'memory_bytes': counter.memory_bytes(),
+            'top_recall': len(approx_top & exact_top) / len(exact_top),
+            'max_error': max_error,
+            'error_bound': round(counter.error_bound()),
+            'adds_per_second': round(events / elapsed),
+        })
+    return results
+
+
 # Задание 3.3: Система рангов игроков с использованием OrderedDict
+class _RankNode:
+    """
+    Узел индексируемого skip list: ключ сортировки, имя игрока,
+    ссылки вперед и ширины ссылок (сколько позиций перепрыгивает ссылка)
+    """
+    __slots__ = ('key', 'name', 'next', 'width')
+
+    def __init__(self, key, name, level):
+        self.key = key
+        self.name = name
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class RankSkipList:
+    """
+    Индексируемый skip list для таблицы рангов.
+
+    Ключ узла - кортеж (-очки, порядковый номер), поэтому игроки идут по
+    убыванию очков, а при равенстве - в порядке достижения счета. Каждая
+    ссылка хранит свою ширину, благодаря чему вставка, удаление, поиск ранга
+    по ключу и поиск игрока по рангу выполняются за ожидаемое O(log n).
+    """
+    MAX_LEVEL = 24  # Достаточно для ~16 млн игроков
+
+    def __init__(self, seed=None):
+        self._random = random.Random(seed)
+        self._nil = _RankNode((float('inf'),), None, self.MAX_LEVEL)
+        self._head = _RankNode(None, None, self.MAX_LEVEL)
+        self._head.next = [self._nil] * self.MAX_LEVEL
+        self._nil.next = [self._nil] * self.MAX_LEVEL
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _random_level(self):
+        """
+        Возвращает высоту нового узла (геометрическое распределение, p = 1/2)
+        """
+        return self.MAX_LEVEL - self._random.getrandbits(self.MAX_LEVEL - 1).bit_length()
+
+    def insert(self, key, name):
+        """
+        Вставляет игрока с заданным ключом
+
+        Args:
+            key (tuple): Ключ сортировки (-очки, порядковый номер)
+            name (str): Имя игрока
+        """
+        chain = [None] * self.MAX_LEVEL
+        steps_at_level = [0] * self.MAX_LEVEL
+        node = self._head
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        level_count = self._random_level()
+        new_node = _RankNode(key, name, level_count)
+        steps = 0
+        for level in range(level_count):
+            prev_node = chain[level]
+            new_node.next[level] = prev_node.next[level]
+            prev_node.next[level] = new_node
+            new_node.width[level] = prev_node.width[level] - steps
+            prev_node.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(level_count, self.MAX_LEVEL):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        """
+        Удаляет узел с заданным ключом
+
+        Args:
+            key (tuple): Ключ сортировки
+
+        Returns:
+            bool: True, если узел был найден и удален
+        """
+        chain = [None] * self.MAX_LEVEL
+        node = self._head
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target.key != key:
+            return False
+        level_count = len(target.next)
+        for level in range(level_count):
+            prev_node = chain[level]
+            prev_node.width[level] += target.width[level] - 1
+            prev_node.next[level] = target.next[level]
+        for level in range(level_count, self.MAX_LEVEL):
+            chain[level].width[level] -= 1
+        self._size -= 1
+        return True
+
+    def bulk_load(self, items):
+        """
+        Строит список за O(n log n) из готовых ключей (только для пустого списка)
+
+        Args:
+            items (iterable): Пары (ключ, имя игрока)
+        """
+        if self._size:
+            raise ValueError("bulk_load можно вызвать только для пустого списка")
+        # Миллион новых узлов заставляет сборщик мусора многократно обходить
+        # их без пользы - на время построения он отключается
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = [_RankNode(key, name, self._random_level()) for key, name in sorted(items)]
+            last = [self._head] * self.MAX_LEVEL
+            last_position = [0] * self.MAX_LEVEL
+            for position, node in enumerate(nodes, 1):
+                for level in range(len(node.next)):
+                    last[level].next[level] = node
+                    last[level].width[level] = position - last_position[level]
+                    last[level] = node
+                    last_position[level] = position
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        end = len(nodes) + 1
+        for level in range(self.MAX_LEVEL):
+            last[level].next[level] = self._nil
+            last[level].width[level] = end - last_position[level]
+        self._size = len(nodes)
+
+    def rank_of(self, key):
+        """
+        Возвращает позицию ключа (1 - лучший) или -1, если ключа нет
+        """
+        position = 0
+        node = self._head
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        if node.next[0].key != key:
+            return -1
+        return position + 1
+
+    def node_at(self, rank):
+        """
+        Возвращает узел на позиции rank (1 - лучший)
+        """
+        if rank < 1 or rank > self._size:
+            raise IndexError("Ранг вне диапазона")
+        node = self._head
+        for level in range(self.MAX_LEVEL - 1, -1, -1):
+            while node.width[level] <= rank:
+                rank -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def iter_from(self, rank):
+        """
+        Перебирает узлы начиная с позиции rank по возрастанию ранга
+        """
+        if rank > self._size:
+            return
+        node = self.node_at(max(rank, 1))
+        while node is not self._nil:
+            yield node
+            node = node.next[0]
+
+
 class RankingSystem:
     """
-    Система рангов игроков с сохранением порядка
+    Система рангов игроков с сохранением порядка.
+
+    Игроки хранятся в индексируемом skip list: изменение счета, поиск ранга,
+    таблица лидеров и выборка "игроки рядом со мной" не пересортировывают
+    всю таблицу, а работают за O(log n) (+ размер ответа).
     """
-    def __init__(self):
-        # Хранит игроков в порядке их достижения ранга
-        self.player_rankings = OrderedDict()
+    def __init__(self, seed=None):
+        # Очки игроков и их ключи в skip list
+        self.scores = {}
+        self._keys = {}
+        self._ranks = RankSkipList(seed)
+        # Порядковый номер изменения счета - разрешает равенство очков
+        self._sequence = itertools.count(1)
         self.next_rank = 1
-    
+
+    @property
+    def player_rankings(self):
+        """
+        Игроки в порядке рангов (строится за O(n), для совместимости)
+        """
+        return OrderedDict((node.name, self.scores[node.name]) for node in self._ranks.iter_from(1))
+
+    def _set_score(self, player_name, score):
+        old_key = self._keys.get(player_name)
+        tie = next(self._sequence)
+        if old_key is not None:
+            old_score = self.scores[player_name]
+            if old_score == score:
+                return
+            self._ranks.remove(old_key)
+            if old_score > score:
+                # Как при устойчивой пересортировке: опустившийся игрок стоял
+                # выше всех, у кого теперь столько же очков, и остается впереди них
+                tie = -tie
+        key = (-score, tie)
+        self._ranks.insert(key, player_name)
+        self._keys[player_name] = key
+        self.scores[player_name] = score
+        self.next_rank = len(self._ranks) + 1
+
     def add_player(self, player_name, score):
         """
         Добавляет игрока в систему рангов
@@ -651,32 +1451,85 @@ class RankingSystem:
             player_name (str): Имя игрока
             score (int): Очки игрока
         """
-        self.player_rankings[player_name] = score
-        # Пересчитываем рейтинги
-        self._recalculate_rankings()
-    
+        self._set_score(player_name, score)
+
+    def add_players(self, players):
+        """
+        Добавляет много игроков сразу. Для пустой таблицы она строится
+        за один проход, без поочередных вставок
+
+        Args:
+            players (iterable): Пары (имя игрока, очки)
+        """
+        players = list(players)
+        latest = dict(players)
+        if self.scores or len(latest) != len(players):
+            # Повторы имен меняют порядок равных очков - вставляем по одному
+            for player_name, score in players:
+                self._set_score(player_name, score)
+            return
+
+        items = []
+        for player_name, score in latest.items():
+            key = (-score, next(self._sequence))
+            self._keys[player_name] = key
+            items.append((key, player_name))
+        self.scores = latest
+        self._ranks.bulk_load(items)
+        self.next_rank = len(self._ranks) + 1
+
     def update_score(self, player_name, new_score):
         """
-        Обновляет счет игрока и пересчитывает рейтинги
+        Обновляет счет игрока и его позицию в рейтинге
         
         Args:
             player_name (str): Имя игрока
             new_score (int): Новый счет
         """
-        if player_name in self.player_rankings:
-            self.player_rankings[player_name] = new_score
-            # Пересчитываем рейтинги
-            self._recalculate_rankings()
-    
-    def _recalculate_rankings(self):
+        if player_name in self.scores:
+            self._set_score(player_name, new_score)
+
+    def remove_player(self, player_name):
+        """
+        Удаляет игрока из рейтинга
+
+        Args:
+            player_name (str): Имя игрока
+
+        Returns:
+            bool: True, если игрок был удален
+        """
+        key = self._keys.pop(player_name, None)
+        if key is None:
+            return False
+        self._ranks.remove(key)
+        del self.scores[player_name]
+        self.next_rank = len(self._ranks) + 1
+        return True
+
+    def get_range(self, start_rank, end_rank):
         """
-        Пересчитывает рейтинги на основе очков
+        Возвращает игроков с рангами от start_rank до end_rank включительно
+
+        Args:
+            start_rank (int): Первый ранг (1 - лучший)
+            end_rank (int): Последний ранг
+
+        Returns:
+            list: Кортежи (ранг, имя, очки)
         """
-        # Сортируем игроков по очкам в убывающем порядке
-        sorted_players = sorted(self.player_rankings.items(), key=lambda x: x[1], reverse=True)
-        # Обновляем OrderedDict с правильным порядком
-        self.player_rankings = OrderedDict(sorted_players)
-    
+        start_rank = max(start_rank, 1)
+        result = []
+        if end_rank < start_rank:
+            return result
+        rank = start_rank
+        for node in self._ranks.iter_from(start_rank):
+            if rank > end_rank:
+                break
+            result.append((rank, node.name, -node.key[0]))
+            rank += 1
+        return result
+
     def get_leaderboard(self, top_n=10):
         """
         Возвращает таблицу лидеров
@@ -687,15 +1540,8 @@ class RankingSystem:
         Returns:
             list: Таблица лидеров
         """
-        leaderboard = []
-        rank = 1
-        for player_name, score in self.player_rankings.items():
-            if rank > top_n:
-                break
-            leaderboard.append((rank, player_name, score))
-            rank += 1
-        return leaderboard
-    
+        return self.get_range(1, top_n)
+
     def get_player_rank(self, player_name):
         """
         Возвращает ранг игрока
@@ -706,15 +1552,70 @@ class RankingSystem:
         Returns:
             int: Ранг игрока (1 - лучший)
         """
-        if player_name not in self.player_rankings:
+        key = self._keys.get(player_name)
+        if key is None:
             return -1  # Игрок не найден
-        
-        rank = 1
-        for name in self.player_rankings.keys():
-            if name == player_name:
-                return rank
-            rank += 1
-        return -1  # Игрок не найден
+        return self._ranks.rank_of(key)
+
+    def get_players_around(self, player_name, radius=5):
+        """
+        Возвращает игроков вокруг заданного ("игроки рядом со мной")
+
+        Args:
+            player_name (str): Имя игрока
+            radius (int): Сколько соседей брать выше и ниже
+
+        Returns:
+            list: Кортежи (ранг, имя, очки); пустой список, если игрока нет
+        """
+        rank = self.get_player_rank(player_name)
+        if rank == -1:
+            return []
+        return self.get_range(rank - radius, rank + radius)
+
+
+def benchmark_ranking_system(player_count=1000000, updates=100000, seed=42):
+    """
+    Измеряет скорость рейтинга на большом числе игроков
+
+    Args:
+        player_count (int): Количество игроков
+        updates (int): Количество изменений счета
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        dict: Время загрузки и число операций в секунду
+    """
+    rng = random.Random(seed)
+    ranking = RankingSystem(seed)
+    names = [f"player_{index}" for index in range(player_count)]
+
+    start = time.perf_counter()
+    ranking.add_players((name, rng.randint(0, 1000000)) for name in names)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        ranking.update_score(rng.choice(names), rng.randint(0, 1000000))
+    update_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        ranking.get_player_rank(rng.choice(names))
+    rank_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        ranking.get_players_around(rng.choice(names), 5)
+    around_time = time.perf_counter() - start
+
+    return {
+        'players': player_count,
+        'load_seconds': round(load_time, 3),
+        'updates_per_second': round(updates / update_time),
+        'rank_lookups_per_second': round(updates / rank_time),
+        'around_queries_per_second': round(updates / around_time),
+    }
 
 # Пример использования
 ranking = RankingSystem()
@@ -727,23 +1628,211 @@ leaderboard = ranking.get_leaderboard(5)
 # Определите namedtuple для игрового события
 GameEvent = namedtuple('GameEvent', ['timestamp', 'event_type', 'player', 'details'])
 
+
+class EventRingBuffer:
+    """
+    Кольцевой буфер событий фиксированного размера с колоночным хранением.
+
+    Время, тип и игрок хранятся в массивах array (тип и игрок - как номера
+    в таблицах интернирования), детали - в списке. Каждое событие получает
+    порядковый номер seq; его ячейка - seq % capacity. Вторичные индексы
+    по игроку и по типу хранят номера живых событий и сокращаются при
+    перезаписи ячейки, так что их размер никогда не превышает capacity.
+    Для каждой ячейки хранится максимум времени по всем событиям до нее
+    включительно - по нему работает бинарный поиск. События, пришедшие с
+    опозданием, дополнительно лежат в маленьком отсортированном списке late.
+    """
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity должна быть положительной")
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.type_ids = array('I', bytes(array('I').itemsize * capacity))
+        self.player_ids = array('I', bytes(array('I').itemsize * capacity))
+        self.details = [None] * capacity
+        self.next_seq = 0
+        # Максимум времени среди событий с номерами до seq включительно (не убывает)
+        self.order_keys = array('d', bytes(8 * capacity))
+        # Опоздавшие события: отсортированный список (время, seq)
+        self.late = []
+        # Таблицы интернирования: имя <-> номер
+        self.type_names = []
+        self.player_names = []
+        self._type_ids = {}
+        self._player_ids = {}
+        # Вторичные индексы: номер игрока/типа -> deque номеров событий
+        self.by_player = {}
+        self.by_type = {}
+
+    def __len__(self):
+        return min(self.next_seq, self.capacity)
+
+    @property
+    def first_seq(self):
+        """
+        Номер самого старого события, которое еще хранится в буфере
+        """
+        return max(0, self.next_seq - self.capacity)
+
+    def intern_type(self, event_type):
+        type_id = self._type_ids.get(event_type)
+        if type_id is None:
+            type_id = self._type_ids[event_type] = len(self.type_names)
+            self.type_names.append(event_type)
+        return type_id
+
+    def intern_player(self, player):
+        player_id = self._player_ids.get(player)
+        if player_id is None:
+            player_id = self._player_ids[player] = len(self.player_names)
+            self.player_names.append(player)
+        return player_id
+
+    def type_id(self, event_type):
+        return self._type_ids.get(event_type)
+
+    def player_id(self, player):
+        return self._player_ids.get(player)
+
+    @staticmethod
+    def _unindex(index, key):
+        # Вытесняемое событие всегда самое старое в своем индексе
+        entries = index[key]
+        entries.popleft()
+        if not entries:
+            del index[key]
+
+    def append(self, timestamp, type_id, player_id, details):
+        """
+        Записывает событие, вытесняя самое старое при заполнении буфера
+
+        Args:
+            timestamp (float): Время события (секунды эпохи)
+            type_id (int): Номер типа события
+            player_id (int): Номер игрока
+            details (str): Детали события
+
+        Returns:
+            int: Порядковый номер события
+        """
+        seq = self.next_seq
+        slot = seq % self.capacity
+        order_key = timestamp
+        if seq:
+            previous_key = self.order_keys[(seq - 1) % self.capacity]
+            if timestamp < previous_key:
+                order_key = previous_key
+        if seq >= self.capacity:
+            self._unindex(self.by_player, self.player_ids[slot])
+            self._unindex(self.by_type, self.type_ids[slot])
+            old_timestamp = self.timestamps[slot]
+            if old_timestamp < self.order_keys[slot]:
+                # Вытесняется опоздавшее событие - убираем его из списка late
+                old_entry = (old_timestamp, seq - self.capacity)
+                del self.late[bisect.bisect_left(self.late, old_entry)]
+        if order_key > timestamp:
+            # Событие пришло с опозданием - бинарный поиск его не найдет
+            bisect.insort(self.late, (timestamp, seq))
+        self.order_keys[slot] = order_key
+        self.timestamps[slot] = timestamp
+        self.type_ids[slot] = type_id
+        self.player_ids[slot] = player_id
+        self.details[slot] = details
+        index = self.by_player.get(player_id)
+        if index is None:
+            index = self.by_player[player_id] = deque()
+        index.append(seq)
+        index = self.by_type.get(type_id)
+        if index is None:
+            index = self.by_type[type_id] = deque()
+        index.append(seq)
+        self.next_seq = seq + 1
+        return seq
+
+    def event(self, seq):
+        """
+        Собирает GameEvent по порядковому номеру живого события
+        """
+        slot = seq % self.capacity
+        return GameEvent(datetime.datetime.fromtimestamp(self.timestamps[slot]),
+                         self.type_names[self.type_ids[slot]],
+                         self.player_names[self.player_ids[slot]],
+                         self.details[slot])
+
+    def seq_at_or_after(self, timestamp):
+        """
+        Бинарный поиск первого живого события, у которого максимум времени
+        (с учетом всех предыдущих событий) не раньше timestamp
+        """
+        low, high = self.first_seq, self.next_seq
+        order_keys, capacity = self.order_keys, self.capacity
+        while low < high:
+            middle = (low + high) // 2
+            if order_keys[middle % capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def seqs_in_window(self, start, end=None):
+        """
+        Номера живых событий со временем из интервала [start, end)
+
+        События, пришедшие по порядку, находятся бинарным поиском по order_keys,
+        опоздавшие - бинарным поиском в списке late.
+
+        Args:
+            start (float): Начало интервала (секунды эпохи)
+            end (float): Конец интервала (по умолчанию - без ограничения)
+
+        Returns:
+            list: Номера событий в порядке времени
+        """
+        first = self.seq_at_or_after(start)
+        last = self.next_seq if end is None else self.seq_at_or_after(end)
+        if not self.late:
+            return list(range(first, last))
+        timestamps, order_keys, capacity = self.timestamps, self.order_keys, self.capacity
+        # Опоздавшие события из диапазона берутся из late, а не отсюда
+        seqs = [seq for seq in range(first, last)
+                if timestamps[seq % capacity] == order_keys[seq % capacity]]
+        late = self.late
+        low = bisect.bisect_left(late, (start, -1))
+        high = len(late) if end is None else bisect.bisect_left(late, (end, -1))
+        if low < high:
+            seqs.extend(seq for _, seq in late[low:high])
+            seqs.sort(key=lambda seq: (timestamps[seq % capacity], seq))
+        return seqs
+
+
 class ComprehensiveGameStats:
     """
-    Комплексная система игровой статистики
+    Комплексная система игровой статистики.
+
+    Последние события лежат в EventRingBuffer постоянного размера, поэтому
+    память не растет при потоке событий. Итоги по игрокам и типам
+    накапливаются при записи, а временные окна считаются по сводкам за
+    интервалы bucket_seconds (хранится не больше max_buckets интервалов).
+    Запросы по игроку, типу и окну времени работают за O(размер ответа).
     """
-    def __init__(self):
-        # Хранение всех событий с сохранением порядка
-        self.events = deque(maxlen=1000)
+    def __init__(self, capacity=1000, bucket_seconds=60, max_buckets=1440):
+        # Хранение последних событий с сохранением порядка
+        self.events = EventRingBuffer(capacity)
         # Счетчик типов событий
         self.event_counts = Counter()
-        # Группировка событий по игрокам
-        self.events_by_player = defaultdict(list)
+        # Количество событий каждого игрока и их разбивка по типам
+        self.player_activity = Counter()
+        self.player_event_types = defaultdict(Counter)
+        # Время первого и последнего события игрока
+        self.player_first_event = {}
+        self.player_last_event = {}
         # Статистика по типам событий
         self.stats_by_event_type = defaultdict(Counter)
-        # Хронология событий конкретного игрока
-        self.player_timeline = OrderedDict()
+        # Сводки по интервалам времени: [начало интервала, Counter типов, Counter игроков]
+        self.bucket_seconds = bucket_seconds
+        self.time_buckets = deque(maxlen=max_buckets)
     
-    def log_event(self, event_type, player, details=""):
+    def log_event(self, event_type, player, details="", timestamp=None):
         """
         Логирует игровое событие
         
@@ -751,19 +1840,62 @@ class ComprehensiveGameStats:
             event_type (str): Тип события
             player (str): Имя игрока
             details (str): Детали события
+            timestamp (datetime): Время события (по умолчанию - текущее)
         """
-        event = GameEvent(datetime.datetime.now(), event_type, player, details)
-        self.events.append(event)
+        timestamp = timestamp or datetime.datetime.now()
+        seconds = timestamp.timestamp()
+        type_id = self.events.intern_type(event_type)
+        player_id = self.events.intern_player(player)
+        self.events.append(seconds, type_id, player_id, details)
+
         self.event_counts[event_type] += 1
-        self.events_by_player[player].append(event)
-        
+        self.player_activity[player] += 1
+        self.player_event_types[player][event_type] += 1
         # Обновляем статистику по типам событий для игрока
         self.stats_by_event_type[event_type][player] += 1
-        
-        # Обновляем временную шкалу игрока
-        if player not in self.player_timeline:
-            self.player_timeline[player] = OrderedDict()
-        self.player_timeline[player][event.timestamp] = event
+        # События могут приходить не по порядку времени
+        first_event = self.player_first_event.get(player)
+        if first_event is None or timestamp < first_event:
+            self.player_first_event[player] = timestamp
+        last_event = self.player_last_event.get(player)
+        if last_event is None or timestamp > last_event:
+            self.player_last_event[player] = timestamp
+
+        bucket = self._bucket_for(seconds - seconds % self.bucket_seconds)
+        if bucket is not None:
+            bucket[1][type_id] += 1
+            bucket[2][player_id] += 1
+
+    def _bucket_for(self, bucket_start):
+        """
+        Находит или создает сводку интервала, сохраняя сводки упорядоченными
+        по времени. Возвращает None для интервала старше всех хранимых,
+        когда хранилище сводок заполнено
+        """
+        buckets = self.time_buckets
+        if not buckets or buckets[-1][0] < bucket_start:
+            buckets.append([bucket_start, Counter(), Counter()])
+            return buckets[-1]
+        if buckets[-1][0] == bucket_start:
+            return buckets[-1]
+        # Опоздавшее событие - ищем место интервала бинарным поиском
+        low, high = 0, len(buckets)
+        while low < high:
+            middle = (low + high) // 2
+            if buckets[middle][0] < bucket_start:
+                low = middle + 1
+            else:
+                high = middle
+        if buckets[low][0] == bucket_start:
+            return buckets[low]
+        if len(buckets) == buckets.maxlen:
+            if low == 0:
+                return None  # Интервал вышел за глубину хранения сводок
+            buckets.popleft()
+            low -= 1
+        bucket = [bucket_start, Counter(), Counter()]
+        buckets.insert(low, bucket)
+        return bucket
     
     def get_player_stats(self, player):
         """
@@ -775,31 +1907,32 @@ class ComprehensiveGameStats:
         Returns:
             dict: Статистика игрока
         """
-        if player not in self.events_by_player:
+        if player not in self.player_activity:
             return {}
         
-        player_events = self.events_by_player[player]
-        event_types = Counter([event.event_type for event in player_events])
-        
         return {
-            'total_events': len(player_events),
-            'event_types': dict(event_types),
-            'first_event': min(player_events, key=lambda x: x.timestamp).timestamp if player_events else None,
-            'last_event': max(player_events, key=lambda x: x.timestamp).timestamp if player_events else None
+            'total_events': self.player_activity[player],
+            'event_types': dict(self.player_event_types[player]),
+            'first_event': self.player_first_event[player],
+            'last_event': self.player_last_event[player]
         }
     
-    def get_top_players_by_activity(self, n=5):
+    def get_top_players_by_activity(self, n=5, since=None):
         """
         Возвращает топ-N самых активных игроков
         
         Args:
             n (int): Количество игроков для возврата
+            since (datetime): Учитывать только события не раньше этого времени
+                (с точностью до интервала сводки)
         
         Returns:
             list: Список самых активных игроков
         """
-        player_activity = Counter({player: len(events) for player, events in self.events_by_player.items()})
-        return player_activity.most_common(n)
+        if since is None:
+            return self.player_activity.most_common(n)
+        activity = self.get_activity_in_window(since)['players']
+        return activity.most_common(n)
     
     def get_recent_events(self, n=10):
         """
@@ -811,7 +1944,140 @@ class ComprehensiveGameStats:
         Returns:
             list: Список последних событий
         """
-        return list(self.events)[-n:]
+        events = self.events
+        start = max(events.first_seq, events.next_seq - n)
+        return [events.event(seq) for seq in range(start, events.next_seq)]
+
+    def _indexed_events(self, entries, n):
+        if entries is None:
+            return []
+        if n is None or n >= len(entries):
+            seqs = list(entries)
+        else:
+            # Из deque берем только хвост, не копируя весь индекс
+            seqs = [entries[index] for index in range(len(entries) - n, len(entries))]
+        return [self.events.event(seq) for seq in seqs]
+
+    def get_player_events(self, player, n=None):
+        """
+        Возвращает хранящиеся в буфере события игрока
+
+        Args:
+            player (str): Имя игрока
+            n (int): Сколько последних событий вернуть (по умолчанию - все)
+
+        Returns:
+            list: События игрока в порядке записи
+        """
+        player_id = self.events.player_id(player)
+        return self._indexed_events(self.events.by_player.get(player_id), n)
+
+    def get_events_by_type(self, event_type, n=None):
+        """
+        Возвращает хранящиеся в буфере события заданного типа
+
+        Args:
+            event_type (str): Тип события
+            n (int): Сколько последних событий вернуть (по умолчанию - все)
+
+        Returns:
+            list: События в порядке записи
+        """
+        type_id = self.events.type_id(event_type)
+        return self._indexed_events(self.events.by_type.get(type_id), n)
+
+    def get_events_in_window(self, start, end=None):
+        """
+        Возвращает хранящиеся в буфере события из интервала [start, end)
+
+        Args:
+            start (datetime): Начало интервала
+            end (datetime): Конец интервала (по умолчанию - без ограничения)
+
+        Returns:
+            list: События в хронологическом порядке
+        """
+        events = self.events
+        end_seconds = None if end is None else end.timestamp()
+        return [events.event(seq) for seq in events.seqs_in_window(start.timestamp(), end_seconds)]
+
+    def get_activity_in_window(self, start, end=None):
+        """
+        Суммирует сводки по интервалам времени. Окно охватывает интервалы
+        целиком и доступно на глубину max_buckets * bucket_seconds
+
+        Args:
+            start (datetime): Начало окна
+            end (datetime): Конец окна (по умолчанию - без ограничения)
+
+        Returns:
+            dict: Counter типов событий и Counter игроков за окно
+        """
+        start_seconds = start.timestamp()
+        start_seconds -= start_seconds % self.bucket_seconds
+        end_seconds = float('inf') if end is None else end.timestamp()
+        type_counts = Counter()
+        player_counts = Counter()
+        # Сводки упорядочены по времени - просматриваем только нужный хвост
+        for bucket_start, types, players in reversed(self.time_buckets):
+            if bucket_start < start_seconds:
+                break
+            if bucket_start < end_seconds:
+                type_counts.update(types)
+                player_counts.update(players)
+        type_names = self.events.type_names
+        player_names = self.events.player_names
+        return {
+            'event_types': Counter({type_names[key]: count for key, count in type_counts.items()}),
+            'players': Counter({player_names[key]: count for key, count in player_counts.items()}),
+        }
+
+
+def benchmark_game_stats(events=200000, players=5000, capacity=10000, seed=42):
+    """
+    Измеряет запись потока событий и запросы к ComprehensiveGameStats
+
+    Args:
+        events (int): Количество событий
+        players (int): Количество игроков
+        capacity (int): Размер кольцевого буфера
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        dict: Скорость записи, время запросов и размер индексов
+    """
+    rng = random.Random(seed)
+    event_types = ["battle_won", "battle_lost", "item_found", "quest_done", "level_up"]
+    names = [f"player_{index}" for index in range(players)]
+    stats = ComprehensiveGameStats(capacity=capacity)
+    base = datetime.datetime.now()
+    step = datetime.timedelta(milliseconds=10)
+
+    start = time.perf_counter()
+    for index in range(events):
+        stats.log_event(rng.choice(event_types), rng.choice(names), "", base + step * index)
+    log_time = time.perf_counter() - start
+
+    queries = 1000
+    start = time.perf_counter()
+    for _ in range(queries):
+        stats.get_player_stats(rng.choice(names))
+        stats.get_player_events(rng.choice(names))
+    player_query_time = time.perf_counter() - start
+
+    window_start = base + step * (events - 100)
+    start = time.perf_counter()
+    for _ in range(queries):
+        stats.get_events_in_window(window_start)
+    window_query_time = time.perf_counter() - start
+
+    return {
+        'events_per_second': round(events / log_time),
+        'player_query_us': round(player_query_time / queries * 1e6, 1),
+        'window_query_us': round(window_query_time / queries * 1e6, 1),
+        'indexed_events': sum(len(entries) for entries in stats.events.by_player.values()),
+        'buffered_events': len(stats.events),
+    }
 
 # Пример использования
 stats = ComprehensiveGameStats()
@@ -839,7 +2105,13 @@ if __name__ == "__main__":
     # Пример использования Counter
     print("--- Counter ---")
     print(f"Топ заклинаний: {top_spells}")
-    print(f"Статистика битв: {stats.get_most_used_items(3)}")
+    sharded_stats = [GameStatistics(approximate=True, top_k=10) for _ in range(2)]
+    for index, spell in enumerate(["Огненный шар"] * 5 + ["Лечение"] * 3 + ["Молния"] * 2):
+        sharded_stats[index % 2].record_spell_cast(spell)
+    sharded_stats[0].merge(sharded_stats[1])
+    print(f"Топ заклинаний (приближенно, 2 шарда): {sharded_stats[0].get_top_spells(3)}")
+    for row in benchmark_approximate_counters(events=50000, distinct=10000):
+        print(f"Точность и память: {row}")
     print()
     
     # Пример использования defaultdict
@@ -873,6 +2145,14 @@ if __name__ == "__main__":
     # Пример системы крафта
     print("--- Crafting System ---")
     print(f"Рецепты оружия: {[r['name'] for r in weapons]}")
+    crafting.add_recipe("Факел", "инструменты", {"дерево": 1, "уголь": 1}, "факел")
+    backpack = crafting.track_inventory({"дерево": 2})
+    backpack.add_item("уголь")
+    print(f"Можно создать сейчас: {crafting.get_craftable_recipes(backpack)}")
+    backpack.add_item("дерево", 2)
+    backpack.craft("Деревянный меч")
+    print(f"После крафта меча: {crafting.get_craftable_recipes(backpack)}, инвентарь: {backpack.items}")
+    print(f"Производительность крафта: {benchmark_crafting()}")
     print()
     
     # Пример анализа эффективности заклинаний
@@ -883,6 +2163,11 @@ if __name__ == "__main__":
     # Пример системы рангов
     print("--- Ranking System ---")
     print(f"Таблица лидеров: {leaderboard}")
+    ranking.add_players((f"Игрок{index}", index * 100) for index in range(3, 30))
+    ranking.update_score("Игрок1", 2650)
+    print(f"Ранг Игрок1: {ranking.get_player_rank('Игрок1')}")
+    print(f"Игроки рядом с Игрок1: {ranking.get_players_around('Игрок1', 2)}")
+    print(f"Производительность рейтинга: {benchmark_ranking_system(100000, 20000)}")
     print()
     
     # Пример комплексной статистики
@@ -890,6 +2175,9 @@ if __name__ == "__main__":
     print(f"Статистика игрока: {player_stats}")
     print(f"Топ активных игроков: {stats.get_top_players_by_activity(3)}")
     print(f"Последние события: {stats.get_recent_events(5)}")
+    print(f"События Игрок1: {[event.details for event in stats.get_player_events('Игрок1')]}")
+    print(f"Активность за последний час: {stats.get_activity_in_window(datetime.datetime.now() - datetime.timedelta(hours=1))}")
+    print(f"Производительность статистики: {benchmark_game_stats(events=50000)}")
     print()
     
     print("Все структуры данных из модуля collections успешно реализованы и готовы к использованию!")
\ No newline at end of file
@@ -4,6 +4,8 @@
 
 
 from datetime import datetime, timedelta, date
+import math
+import time
 import pytz
 from collections import deque, defaultdict
 import random
@@ -101,13 +103,217 @@ class EventLogger:
         ]
 
 
+# Иерархическое колесо таймеров для кулдаунов и ежедневных сбросов
+class WheelTimer:
+    """
+    Таймер в колесе: срок по монотонным часам, тик срабатывания и данные
+    """
+    __slots__ = ('deadline', 'tick', 'payload', 'callback', 'bucket')
+
+    def __init__(self, deadline, tick, payload, callback):
+        self.deadline = deadline
+        self.tick = tick
+        self.payload = payload
+        self.callback = callback
+        self.bucket = None
+
+    @property
+    def active(self):
+        return self.bucket is not None
+
+
+class TimingWheel:
+    """
+    Иерархическое колесо таймеров на монотонных часах.
+
+    Уровень 0 делится на slots ячеек по tick секунд, каждый следующий
+    уровень в slots раз грубее. Таймер кладется в ячейку по своему тику
+    срабатывания, поэтому добавление и отмена выполняются за O(1); при
+    обороте младшего уровня таймеры из ячейки старшего уровня спускаются
+    ниже. Сработавшие за вызов advance таймеры отдаются одной пачкой,
+    а пустые тики между событиями advance перепрыгивает.
+    """
+    def __init__(self, tick=0.05, slots=256, levels=4, clock=time.monotonic, on_expire=None):
+        if slots & (slots - 1):
+            raise ValueError("slots должно быть степенью двойки")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.on_expire = on_expire
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._max_delay_ticks = slots ** levels - 1
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._origin = clock()
+        self.current_tick = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _tick_for(self, moment):
+        return math.ceil((moment - self._origin) / self.tick)
+
+    def _place(self, timer):
+        # Уровень выбирается по расстоянию до срабатывания, ячейка - по абсолютному тику
+        delay = min(timer.tick - self.current_tick, self._max_delay_ticks)
+        target = self.current_tick + delay
+        level = 0
+        while delay >= 1 << (self._bits * (level + 1)):
+            level += 1
+        bucket = self._wheels[level][(target >> (self._bits * level)) & self._mask]
+        bucket.add(timer)
+        timer.bucket = bucket
+
+    def schedule(self, delay, payload=None, callback=None):
+        """
+        Ставит таймер
+
+        Args:
+            delay (float): Задержка в секундах
+            payload: Данные, которые получит обработчик
+            callback (callable): Обработчик этого таймера (вызывается с payload)
+
+        Returns:
+            WheelTimer: Таймер, который можно отменить
+        """
+        deadline = self.clock() + delay
+        tick = max(self._tick_for(deadline), self.current_tick + 1)
+        timer = WheelTimer(deadline, tick, payload, callback)
+        self._place(timer)
+        self.count += 1
+        return timer
+
+    def cancel(self, timer):
+        """
+        Отменяет таймер
+
+        Returns:
+            bool: True, если таймер еще ждал срабатывания
+        """
+        if timer.bucket is None:
+            return False
+        timer.bucket.discard(timer)
+        timer.bucket = None
+        self.count -= 1
+        return True
+
+    def _cascade(self):
+        # Спускаем таймеры из старших уровней, у которых начался новый оборот
+        for level in range(1, self.levels):
+            index = (self.current_tick >> (self._bits * level)) & self._mask
+            bucket = self._wheels[level][index]
+            if bucket:
+                self._wheels[level][index] = set()
+                for timer in bucket:
+                    self._place(timer)
+            if index:
+                break
+
+    def _next_due_tick(self):
+        # Ближайший тик, на котором что-то происходит: срабатывает ячейка уровня 0
+        # или со старшего уровня спускается непустая ячейка (None - таймеров нет)
+        current = self.current_tick
+        mask = self._mask
+        best = None
+        wheel = self._wheels[0]
+        for offset in range(1, self.slots + 1):
+            if wheel[(current + offset) & mask]:
+                best = current + offset
+                break
+        for level in range(1, self.levels):
+            shift = self._bits * level
+            span = 1 << shift
+            # Уровень level спускается на тиках, кратных span
+            boundary = (current // span + 1) * span
+            wheel = self._wheels[level]
+            for _ in range(self.slots):
+                if best is not None and boundary >= best:
+                    break
+                if wheel[(boundary >> shift) & mask]:
+                    best = boundary
+                    break
+                boundary += span
+        return best
+
+    def advance(self, now=None):
+        """
+        Продвигает колесо до текущего момента и обрабатывает сработавшие таймеры
+
+        Args:
+            now (float): Момент по часам колеса (по умолчанию - clock())
+
+        Returns:
+            list: Сработавшие таймеры
+        """
+        target = self._tick_for(self.clock() if now is None else now)
+        if target - 1 <= self.current_tick:
+            return []
+        # Тик target еще не закончился - обрабатываем только завершенные
+        target -= 1
+        if not self.count:
+            self.current_tick = target
+            return []
+
+        expired = []
+        wheel = self._wheels[0]
+        mask = self._mask
+        while self.current_tick < target and self.count:
+            due = self._next_due_tick()
+            if due is None or due > target:
+                break
+            # Пустые тики до ближайшего события пропускаем целиком
+            self.current_tick = due
+            index = self.current_tick & mask
+            if not index:
+                self._cascade()
+            bucket = wheel[index]
+            if bucket:
+                wheel[index] = set()
+                for timer in bucket:
+                    timer.bucket = None
+                expired.extend(bucket)
+                self.count -= len(bucket)
+        if self.current_tick < target:
+            self.current_tick = target
+
+        if expired:
+            for timer in expired:
+                if timer.callback is not None:
+                    timer.callback(timer.payload)
+            if self.on_expire is not None:
+                self.on_expire(expired)
+        return expired
+
+
 # Задание 2.1: Система кулдаунов для способностей
 class CooldownManager:
     """
-    Система управления кулдаунами способностей
+    Система управления кулдаунами способностей.
+
+    Время готовности хранится числом по монотонным часам, поэтому is_ready -
+    это одно сравнение без арифметики datetime. Истекшие кулдауны удаляются
+    пачками через TimingWheel, и словарь не растет бесконечно.
     """
-    def __init__(self):
-        self.cooldowns = {}  # Словарь для хранения времени последнего использования способности
+    def __init__(self, wheel=None, on_ready=None):
+        self.wheel = wheel if wheel is not None else TimingWheel()
+        self.clock = self.wheel.clock
+        self.on_ready = on_ready  # Вызывается с (player_id, ability_name), когда кулдаун истек
+        self.cooldowns = {}  # (игрок, способность) -> таймер с моментом готовности
+
+    def _expire(self, key):
+        if self.cooldowns.pop(key, None) is not None and self.on_ready is not None:
+            self.on_ready(*key)
+
+    def process_expired(self):
+        """
+        Удаляет истекшие кулдауны (и вызывает on_ready)
+
+        Returns:
+            int: Количество истекших кулдаунов
+        """
+        return len(self.wheel.advance())
     
     def use_ability(self, player_id, ability_name, cooldown_seconds):
         """
@@ -121,23 +327,29 @@ class CooldownManager:
         Returns:
             tuple: (успешно ли использовано, время до готовности)
         """
+        self.wheel.advance()
         key = (player_id, ability_name)
-        current_time = datetime.now()
-        
-        if key in self.cooldowns:
-            last_used = self.cooldowns[key]
-            time_passed = current_time - last_used
-            cooldown_period = timedelta(seconds=cooldown_seconds)
-            
-            if time_passed < cooldown_period:
-                remaining = cooldown_period - time_passed
-                return False, remaining
-            else:
-                self.cooldowns[key] = current_time
-                return True, timedelta(0)
-        else:
-            self.cooldowns[key] = current_time
-            return True, timedelta(0)
+        timer = self.cooldowns.get(key)
+        if timer is not None:
+            remaining = timer.deadline - self.clock()
+            if remaining > 0:
+                return False, timedelta(seconds=remaining)
+            self.wheel.cancel(timer)
+        self.cooldowns[key] = self.wheel.schedule(cooldown_seconds, key, self._expire)
+        return True, timedelta(0)
+
+    def reset_cooldown(self, player_id, ability_name):
+        """
+        Сбрасывает кулдаун способности
+
+        Returns:
+            bool: True, если кулдаун был активен
+        """
+        timer = self.cooldowns.pop((player_id, ability_name), None)
+        if timer is None:
+            return False
+        self.wheel.cancel(timer)
+        return True
     
     def get_remaining_cooldown(self, player_id, ability_name):
         """
@@ -150,18 +362,11 @@ class CooldownManager:
         Returns:
             timedelta: Оставшееся время до готовности
         """
-        key = (player_id, ability_name)
-        if key not in self.cooldowns:
-            return timedelta(0)
-        
-        last_used = self.cooldowns[key]
-        cooldown_period = timedelta(seconds=30)  # Временно фиксированное значение
-        time_passed = datetime.now() - last_used
-        
-        if time_passed < cooldown_period:
-            return cooldown_period - time_passed
-        else:
+        timer = self.cooldowns.get((player_id, ability_name))
+        if timer is None:
             return timedelta(0)
+        remaining = timer.deadline - self.clock()
+        return timedelta(seconds=remaining) if remaining > 0 else timedelta(0)
     
     def is_ready(self, player_id, ability_name):
         """
@@ -174,8 +379,55 @@ class CooldownManager:
         Returns:
             bool: Готова ли способность
         """
-        remaining = self.get_remaining_cooldown(player_id, ability_name)
-        return remaining == timedelta(0)
+        timer = self.cooldowns.get((player_id, ability_name))
+        return timer is None or self.clock() >= timer.deadline
+
+
+def benchmark_cooldowns(count=1000000, seed=42):
+    """
+    Измеряет кулдауны на большом числе одновременных таймеров.
+    Часы колеса подменяются ручными, чтобы прогнать истечение без ожидания
+
+    Args:
+        count (int): Количество одновременных кулдаунов
+        seed (int): Зерно генератора случайных чисел
+
+    Returns:
+        dict: Время операций в микросекундах и скорость истечения
+    """
+    rng = random.Random(seed)
+    now = [0.0]
+    manager = CooldownManager(TimingWheel(clock=lambda: now[0]))
+
+    start = time.perf_counter()
+    for index in range(count):
+        manager.use_ability(index, "fireball", rng.uniform(1, 600))
+    use_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(count):
+        manager.is_ready(index, "fireball")
+    ready_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index in range(0, count, 10):
+        manager.reset_cooldown(index, "fireball")
+    cancel_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expired = 0
+    while manager.cooldowns:
+        now[0] += 1.0
+        expired += manager.process_expired()
+    expire_time = time.perf_counter() - start
+
+    return {
+        'cooldowns': count,
+        'use_us': round(use_time / count * 1e6, 2),
+        'is_ready_us': round(ready_time / count * 1e6, 3),
+        'cancel_us': round(cancel_time / (count // 10) * 1e6, 2),
+        'expired_per_second': round(expired / expire_time),
+    }
 
 
 # Задание 2.2: Игровой календарь с напоминаниями
@@ -275,12 +527,19 @@ class GameCalendar:
 # Задание 3.1: Система ежедневных заданий
 class DailyQuestSystem:
     """
-    Система ежедневных заданий
+    Система ежедневных заданий.
+
+    Сброс определяется сравнением календарных дат, поэтому он не сдвигается
+    при переводе часов и после сна компьютера. Прогресс игроков сбрасывается
+    лениво: у каждого игрока запоминается поколение заданий, и устаревший
+    прогресс обнуляется при следующем обращении, а не в цикле по всем игрокам.
     """
     def __init__(self):
         self.daily_quests = {}
         self.player_progress = {}
         self.last_refresh_date = date.today()
+        self.generation = 0
+        self._player_generation = {}
         # Возможные задания
         self.quest_templates = [
             {"id": "kill_5_monsters", "name": "Победить 5 монстров", "target": 5, "reward": 100},
@@ -290,9 +549,20 @@ class DailyQuestSystem:
             {"id": "win_3_battles", "name": "Выиграть 3 битвы", "target": 3, "reward": 180}
         ]
     
+    def _sync_player(self, player_id):
+        # Обнуляет прогресс игрока, если он остался от прошлого поколения заданий
+        if self._player_generation.get(player_id) == self.generation:
+            return
+        self._player_generation[player_id] = self.generation
+        if player_id in self.player_progress:
+            self.player_progress[player_id] = {
+                quest_id: {"completed": False, "progress": 0, "claimed": False}
+                for quest_id in self.daily_quests
+            }
+
     def refresh_daily_quests(self):
         """
-        Обновляет список ежедневных заданий
+        Обновляет список ежедневных заданий, если наступил новый день
         """
         current_date = date.today()
         if current_date > self.last_refresh_date:
@@ -301,12 +571,8 @@ class DailyQuestSystem:
             self.daily_quests = {quest['id']: quest for quest in selected_quests}
             self.last_refresh_date = current_date
             
-            # Сбрасываем прогресс для всех игроков
-            for player_id in self.player_progress:
-                self.player_progress[player_id] = {
-                    quest_id: {"completed": False, "progress": 0, "claimed": False} 
-                    for quest_id in self.daily_quests
-                }
+            # Прогресс игроков сбросится при следующем обращении к ним
+            self.generation += 1
     
     def assign_daily_quests(self, player_id):
         """
@@ -316,6 +582,7 @@ class DailyQuestSystem:
             player_id (str): ID игрока
         """
         self.refresh_daily_quests()
+        self._sync_player(player_id)
         
         if player_id not in self.player_progress:
             self.player_progress[player_id] = {}
@@ -336,6 +603,7 @@ class DailyQuestSystem:
             player_id (str): ID игрока
             quest_id (str): ID задания
         """
+        self._sync_player(player_id)
         if player_id in self.player_progress and quest_id in self.player_progress[player_id]:
             quest_info = self.player_progress[player_id][quest_id]
             template = self.daily_quests[quest_id]
@@ -360,6 +628,7 @@ class DailyQuestSystem:
         
         if player_id not in self.player_progress:
             self.assign_daily_quests(player_id)
+        self._sync_player(player_id)
         
         quests_with_status = []
         for quest_id, progress in self.player_progress[player_id].items():
@@ -1067,6 +1336,7 @@ if __name__ == "__main__":
     print(f"Использование способности: {success}, осталось: {remaining}")
     ready = cooldown_mgr.is_ready("player1", "fireball")
     print(f"Способность готова: {ready}")
+    print(f"Кулдауны на колесе таймеров: {benchmark_cooldowns(100000)}")
     print()
     
     # Пример использования GameCalendar
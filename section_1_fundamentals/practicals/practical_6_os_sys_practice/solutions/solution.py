@@ -5,25 +5,227 @@
 
 import os
 import sys
+import atexit
+import gzip
 from pathlib import Path
 import shutil
 from datetime import datetime, timedelta, date
 import json
 import hashlib
+import math
+import mmap
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 import pytz
 import psutil
 from collections import deque
 import random
 
 
+# Параллельный инкрементальный обход дерева каталогов
+class DirectoryScanner:
+    """
+    Параллельный инкрементальный сканер дерева каталогов.
+
+    Каталоги читаются через os.scandir, размер и время изменения файлов
+    берутся из DirEntry.stat(). Подкаталоги раздаются пулу потоков. Результат
+    хранится в манифесте {каталог: mtime, файлы, подкаталоги}, который можно
+    сохранить на диск. При повторном сканировании каталог перечитывается,
+    только если изменилось его mtime, иначе проверяются лишь его подкаталоги.
+
+    mtime каталога меняется при создании, удалении и переименовании файлов,
+    но не при перезаписи существующего файла - такие изменения находит
+    scan(full=True).
+    """
+    MANIFEST_VERSION = 1
+
+    def __init__(self, root, manifest_path=None, max_workers=None):
+        self.root = os.path.abspath(root)
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.manifest = {}
+        self.lock = threading.Lock()
+        if manifest_path:
+            self.load_manifest()
+
+    def load_manifest(self):
+        """
+        Загружает манифест с диска (манифест другого корня игнорируется)
+        
+        Returns:
+            bool: Удалось ли загрузить манифест
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != self.MANIFEST_VERSION or data.get('root') != self.root:
+            return False
+        self.manifest = data['directories']
+        return True
+
+    def save_manifest(self):
+        """
+        Атомарно сохраняет манифест на диск
+        
+        Returns:
+            bool: Успешно ли сохранение
+        """
+        if not self.manifest_path:
+            return False
+        data = {'version': self.MANIFEST_VERSION, 'root': self.root, 'directories': self.manifest}
+        temp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.manifest_path)
+            return True
+        except OSError as e:
+            print(f"Ошибка при сохранении манифеста: {e}")
+            return False
+
+    def _scan_directory(self, rel_path, full):
+        path = self.root if rel_path == '.' else os.path.join(self.root, rel_path)
+        try:
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return rel_path, None, False
+
+        previous = self.manifest.get(rel_path)
+        if not full and previous is not None and previous['mtime'] == dir_mtime:
+            return rel_path, previous, False
+
+        files = {}
+        dirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Битая ссылка или файл удален во время обхода
+                    files[entry.name] = [stat.st_size, stat.st_mtime_ns]
+        except OSError as e:
+            print(f"Ошибка доступа к директории: {e}")
+        size = sum(meta[0] for meta in files.values())
+        return rel_path, {'mtime': dir_mtime, 'size': size, 'files': files, 'dirs': dirs}, True
+
+    @staticmethod
+    def _diff_files(rel_path, old_files, new_files, changes):
+        prefix = '' if rel_path == '.' else rel_path + os.sep
+        for name, meta in new_files.items():
+            old_meta = old_files.get(name)
+            if old_meta is None:
+                changes['added'].append(prefix + name)
+            elif old_meta != meta:
+                changes['modified'].append(prefix + name)
+        for name in old_files.keys() - new_files.keys():
+            changes['removed'].append(prefix + name)
+
+    def scan(self, full=False):
+        """
+        Сканирует дерево каталогов
+        
+        Args:
+            full (bool): Перечитать все каталоги, даже если их mtime не изменилось
+            
+        Returns:
+            dict: Итоги сканирования и списки добавленных, удаленных и измененных файлов
+        """
+        with self.lock:
+            start_time = time.perf_counter()
+            old_manifest = self.manifest
+            new_manifest = {}
+            changes = {'added': [], 'removed': [], 'modified': []}
+            scanned_dirs = skipped_dirs = 0
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pending = {pool.submit(self._scan_directory, '.', full)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rel_path, record, scanned = future.result()
+                        if record is None:
+                            continue
+                        new_manifest[rel_path] = record
+                        if scanned:
+                            scanned_dirs += 1
+                            previous = old_manifest.get(rel_path)
+                            self._diff_files(rel_path, previous['files'] if previous else {}, record['files'], changes)
+                        else:
+                            skipped_dirs += 1
+                        for name in record['dirs']:
+                            child = name if rel_path == '.' else os.path.join(rel_path, name)
+                            pending.add(pool.submit(self._scan_directory, child, full))
+
+            # Файлы из исчезнувших каталогов
+            removed_dirs = old_manifest.keys() - new_manifest.keys()
+            for rel_path in removed_dirs:
+                self._diff_files(rel_path, old_manifest[rel_path]['files'], {}, changes)
+
+            self.manifest = new_manifest
+            if self.manifest_path and (scanned_dirs or removed_dirs):
+                self.save_manifest()
+
+            return {
+                'root': self.root,
+                'directories': len(new_manifest),
+                'files': sum(len(record['files']) for record in new_manifest.values()),
+                'total_size': self.total_size(),
+                'scanned_dirs': scanned_dirs,
+                'skipped_dirs': skipped_dirs,
+                'added': changes['added'],
+                'removed': changes['removed'],
+                'modified': changes['modified'],
+                'elapsed': time.perf_counter() - start_time
+            }
+
+    def total_size(self):
+        """
+        Возвращает суммарный размер файлов по манифесту
+        
+        Returns:
+            int: Размер в байтах
+        """
+        return sum(record['size'] for record in self.manifest.values())
+
+    def files_count(self):
+        """
+        Возвращает количество файлов в каждом каталоге по манифесту
+        
+        Returns:
+            dict: Относительный путь каталога -> количество файлов
+        """
+        return {rel_path: len(record['files']) for rel_path, record in self.manifest.items()}
+
+    def iter_files(self):
+        """
+        Перебирает все файлы из манифеста
+        
+        Yields:
+            tuple: (относительный путь, размер, mtime_ns)
+        """
+        for rel_path, record in self.manifest.items():
+            prefix = '' if rel_path == '.' else rel_path + os.sep
+            for name, (size, mtime_ns) in record['files'].items():
+                yield prefix + name, size, mtime_ns
+
+
 # Задание 1.1: Создание менеджера игровых файлов
 class GameFileManager:
     """
     Класс для управления игровыми файлами и каталогами
     """
-    def __init__(self, game_root="game_data"):
+    def __init__(self, game_root="game_data", manifest_path=None):
         self.game_root = Path(game_root)
         self.create_standard_directories()
+        # Манифест сканера переживает вызовы get_game_info (и перезапуски, если задан manifest_path)
+        self.scanner = DirectoryScanner(self.game_root, manifest_path)
     
     def create_standard_directories(self):
         """
@@ -59,19 +261,30 @@ class GameFileManager:
             'total_size': 0
         }
         
-        for root, dirs, files in os.walk(self.game_root):
-            rel_path = os.path.relpath(root, self.game_root)
-            info['directories'].append(rel_path)
-            
-            file_count = len(files)
-            info['files_count'][rel_path] = file_count
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                info['total_size'] += os.path.getsize(file_path)
+        # Сохранения перезаписываются на месте, а это не меняет mtime каталога,
+        # поэтому здесь каждый каталог перечитывается заново (scandir дает размеры без лишних stat)
+        self.scanner.scan(full=True)
+        info['files_count'] = self.scanner.files_count()
+        info['directories'] = sorted(info['files_count'])
+        info['total_size'] = self.scanner.total_size()
         
         return info
     
+    def scan_changes(self, full=False):
+        """
+        Возвращает изменения в игровых файлах с прошлого сканирования.
+        
+        Без full перечитываются только каталоги с новым mtime: так находятся
+        созданные, удаленные и переименованные файлы, но не перезаписанные на месте.
+        
+        Args:
+            full (bool): Перечитать все каталоги, а не только измененные
+            
+        Returns:
+            dict: Итоги сканирования со списками added, removed и modified
+        """
+        return self.scanner.scan(full=full)
+    
     def backup_save_files(self, backup_dir="backups"):
         """
         Создает резервную копию файлов сохранений
@@ -302,16 +515,255 @@ class ModManager:
         return []
 
 
+# Буферизованная асинхронная запись логов с ротацией
+class AsyncLogWriter:
+    """
+    Буферизованная запись лога в файл с фоновым сбросом и ротацией.
+
+    Вызывающий поток только копирует закодированную строку в заранее
+    выделенный bytearray. Заполненные буферы, а также все накопленное за
+    flush_interval, записывает в файл фоновый поток. Когда файл дорастает до
+    max_bytes, он переименовывается и запись продолжается в новый файл,
+    а сжатие в .gz идет в отдельном потоке, не задерживая запись;
+    хранится не больше backup_count сжатых файлов. Если фоновый поток не
+    успевает и свободных буферов нет, запись ждет освобождения буфера.
+
+    Ошибка ввода-вывода (диск заполнен, нет прав) не останавливает фоновый
+    поток: пачка, которую не удалось записать, отбрасывается, ошибка
+    сохраняется в last_error, а число потерянных пачек - в dropped.
+    """
+    def __init__(self, path_factory, max_bytes, backup_count=5, buffer_size=64 * 1024,
+                 buffer_count=4, flush_interval=0.5):
+        self.path_factory = path_factory  # Возвращает путь для нового файла лога
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.backups = deque()  # Сжатые файлы, от старых к новым
+
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)  # Есть что записывать
+        self._space = threading.Condition(self._lock)  # Освободился буфер
+        self._done = threading.Condition(self._lock)  # Пачка записана
+        self._free = [bytearray(buffer_size) for _ in range(buffer_count)]
+        self._full = []  # (буфер, длина) в порядке записи
+        self._buffer = None
+        self._pos = 0
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+        self._compressor = None  # Пул из одного потока для сжатия ротированных файлов
+        self.last_error = None
+        self.dropped = 0  # Пачки и записи, потерянные из-за ошибок
+
+        self.current_path = Path(path_factory())
+        self._file = open(self.current_path, 'ab')
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+
+    def _submit_locked(self):
+        # Отдает текущий буфер фоновому потоку
+        if self._buffer is not None and self._pos:
+            self._full.append((self._buffer, self._pos))
+            self._submitted += 1
+            self._buffer = None
+            self._ready.notify()
+
+    def write(self, data):
+        """
+        Копирует данные в буфер (в файл их запишет фоновый поток)
+        
+        Args:
+            data (bytes): Закодированная запись лога
+        """
+        size = len(data)
+        with self._lock:
+            if self._closed:
+                raise ValueError("Запись в закрытый лог")
+            if self._buffer is None or self._pos + size > self.buffer_size:
+                self._submit_locked()
+                if size > self.buffer_size:
+                    # Слишком длинная запись идет в файл мимо буферов
+                    self._full.append((bytes(data), size))
+                    self._submitted += 1
+                    self._ready.notify()
+                    return
+                if self._buffer is None:
+                    while not self._free:
+                        if self._closed:
+                            raise ValueError("Запись в закрытый лог")
+                        if not self._thread.is_alive():
+                            # Фоновый поток остановлен - ждать буфер бессмысленно
+                            self.dropped += 1
+                            return
+                        self._space.wait(self.flush_interval)
+                    self._buffer = self._free.pop()
+                    self._pos = 0
+            self._buffer[self._pos:self._pos + size] = data
+            self._pos += size
+
+    def flush(self, timeout=None):
+        """
+        Ждет, пока все записанное до вызова попадет в файл
+        
+        Args:
+            timeout (float): Максимальное время ожидания в секундах
+            
+        Returns:
+            bool: True, если все данные записаны без потерь
+        """
+        with self._lock:
+            self._submit_locked()
+            target = self._submitted
+            dropped = self.dropped
+            self._ready.notify()
+            return self._done.wait_for(
+                lambda: self._written >= target or not self._thread.is_alive(), timeout
+            ) and self._written >= target and self.dropped == dropped
+
+    def close(self):
+        """
+        Сбрасывает оставшиеся данные и останавливает фоновый поток
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._submit_locked()
+            self._ready.notify()
+        self._thread.join()
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+
+    def _record_error(self, error, dropped):
+        # Вызывается из потока записи и из потока сжатия
+        with self._lock:
+            first = self.last_error is None
+            self.last_error = error
+            self.dropped += dropped
+        if first:
+            print(f"Ошибка записи лога: {error}")
+
+    def _write_batch(self, batch):
+        for chunk, length in batch:
+            try:
+                self._write_chunk(chunk, length)
+            except Exception as error:
+                self._record_error(error, 1)
+        if batch:
+            try:
+                self._file.flush()
+            except Exception as error:
+                self._record_error(error, 0)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._full and not self._closed:
+                    self._ready.wait(self.flush_interval)
+                # Сброс по времени забирает и частично заполненный буфер
+                self._submit_locked()
+                batch, self._full = self._full, []
+                closed = self._closed
+
+            self._write_batch(batch)
+
+            with self._lock:
+                for chunk, _ in batch:
+                    if isinstance(chunk, bytearray):
+                        self._free.append(chunk)
+                self._written += len(batch)
+                self._space.notify_all()
+                self._done.notify_all()
+                if closed and not self._full:
+                    break
+        try:
+            self._file.close()
+        except OSError as error:
+            self._record_error(error, 0)
+
+    def _write_chunk(self, chunk, length):
+        if self._file.closed:
+            # Прошлая ротация не смогла открыть новый файл - пробуем снова
+            self._file = open(self.current_path, 'ab')
+            self._size = self._file.tell()
+        if self._size and self._size + length > self.max_bytes:
+            self._rotate()
+        with memoryview(chunk) as view:
+            self._file.write(view[:length])
+        self._size += length
+
+    def _rotate(self):
+        self._file.close()
+        old_path = self.current_path
+        try:
+            # Файл только переименовывается, а сжимает его отдельный поток:
+            # фоновый поток записи не задерживается и буферы освобождаются
+            pending = old_path.with_name(old_path.name + ".rotated")
+            index = 1
+            while pending.exists():
+                pending = old_path.with_name(f"{old_path.name}.{index}.rotated")
+                index += 1
+            old_path.rename(pending)
+            if self._compressor is None:
+                self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncLogCompressor")
+            self._compressor.submit(self._compress, pending, old_path)
+        finally:
+            # Новый файл открываем, даже если переименовать старый не удалось
+            self.current_path = Path(self.path_factory())
+            self._file = open(self.current_path, 'ab')
+            self._size = self._file.tell()
+
+    def _compress(self, pending, original):
+        """
+        Сжимает файл лога, отложенный ротацией, в .gz (выполняется в потоке сжатия)
+        """
+        archive = original.with_name(original.name + ".gz")
+        index = 1
+        while archive.exists():
+            archive = original.with_name(f"{original.name}.{index}.gz")
+            index += 1
+        try:
+            with open(pending, 'rb') as src, gzip.open(archive, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            pending.unlink()
+        except Exception as error:
+            archive.unlink(missing_ok=True)  # Несжатый файл остается на месте
+            self._record_error(error, 0)
+            return
+        # Поток сжатия один, поэтому backups меняется только здесь
+        self.backups.append(archive)
+        while len(self.backups) > self.backup_count:
+            self.backups.popleft().unlink(missing_ok=True)
+
+
 # Задание 2.2: Система логирования с файловым выводом
 class GameLogger:
     """
-    Система логирования игровых событий
+    Система логирования игровых событий.
+
+    log только форматирует строку и копирует ее в буфер AsyncLogWriter:
+    запись в файл, ротация и сжатие выполняются фоновым потоком. Для
+    get_recent_logs в памяти хранится ограниченный хвост записей, а также
+    отдельный хвост для каждого уровня.
     """
-    def __init__(self, log_directory="logs", max_file_size_mb=10):
+    def __init__(self, log_directory="logs", max_file_size_mb=10, backup_count=5,
+                 tail_size=10000, flush_interval=0.5):
         self.log_directory = Path(log_directory)
         self.log_directory.mkdir(exist_ok=True)
         self.max_file_size = max_file_size_mb * 1024 * 1024  # в байтах
-        self.current_log_file = self._get_new_log_file()
+        self.tail_size = tail_size
+        self.tail = deque(maxlen=tail_size)  # (время, уровень, модуль, сообщение)
+        self.tail_by_level = {}  # уровень -> deque записей этого уровня
+        self._stamp = (None, "")  # (секунда, отформатированная дата и время)
+        self.writer = AsyncLogWriter(self._get_new_log_file, self.max_file_size, backup_count,
+                                     flush_interval=flush_interval)
+        atexit.register(self.close)
+    
+    @property
+    def current_log_file(self):
+        return self.writer.current_path
     
     def _get_new_log_file(self):
         """
@@ -322,14 +774,21 @@ class GameLogger:
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = self.log_directory / f"game_log_{timestamp}.txt"
+        index = 1
+        # При ротации чаще раза в секунду имя с меткой времени уже занято
+        while log_file.exists() or log_file.with_name(log_file.name + ".gz").exists():
+            log_file = self.log_directory / f"game_log_{timestamp}_{index}.txt"
+            index += 1
         return log_file
     
-    def _rotate_log_if_needed(self):
-        """
-        Проверяет, нужно ли создать новый файл лога из-за размера
-        """
-        if self.current_log_file.exists() and self.current_log_file.stat().st_size > self.max_file_size:
-            self.current_log_file = self._get_new_log_file()
+    def _format_time(self, now):
+        # strftime вызывается не чаще раза в секунду
+        second = int(now)
+        stamp_second, stamp = self._stamp
+        if second != stamp_second:
+            stamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+            self._stamp = (second, stamp)
+        return f"{stamp}.{int((now - second) * 1000):03d}"
     
     def log(self, level, message, module="general"):
         """
@@ -340,17 +799,21 @@ class GameLogger:
             message (str): Текст сообщения
             module (str): Модуль, от которого пришло сообщение
         """
-        self._rotate_log_if_needed()
-        
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        log_entry = f"[{timestamp}] [{level.upper()}] [{module}] {message}\n"
-        
-        with open(self.current_log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        now = time.time()
+        level = level.upper()
+        log_entry = f"[{self._format_time(now)}] [{level}] [{module}] {message}\n"
+        self.writer.write(log_entry.encode('utf-8'))
+        
+        record = (now, level, module, message)
+        self.tail.append(record)
+        level_tail = self.tail_by_level.get(level)
+        if level_tail is None:
+            level_tail = self.tail_by_level.setdefault(level, deque(maxlen=self.tail_size))
+        level_tail.append(record)
     
     def get_recent_logs(self, hours=1, level_filter=None):
         """
-        Возвращает недавние сообщения из лога
+        Возвращает недавние сообщения из хвоста лога в памяти
         
         Args:
             hours (int): Количество часов назад
@@ -359,49 +822,250 @@ class GameLogger:
         Returns:
             list: Список недавних сообщений
         """
-        time_threshold = datetime.now() - timedelta(hours=hours)
+        if level_filter is None:
+            records = self.tail
+        else:
+            records = self.tail_by_level.get(level_filter.upper(), ())
+        threshold = time.time() - hours * 3600
         
         recent_logs = []
-        try:
-            with open(self.current_log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    # Парсим строку лога
-                    if "] [" in line and "] [" in line.split("] [", 2)[2]:
-                        try:
-                            parts = line.strip().split("] [", 3)
-                            if len(parts) >= 3:
-                                timestamp_str = parts[0].strip('[')
-                                level = parts[1]
-                                module_msg = parts[2]
-                                
-                                # Извлекаем время из строки
-                                log_time = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S.%f")
-                                
-                                # Проверяем, подходит ли по времени
-                                if log_time >= time_threshold:
-                                    # Проверяем фильтр по уровню
-                                    if level_filter is None or level.upper() == level_filter.upper():
-                                        recent_logs.append({
-                                            'timestamp': log_time,
-                                            'level': level,
-                                            'module': module_msg.split('] ')[0],
-                                            'message': '] '.join(module_msg.split('] ')[1:])
-                                        })
-                        except ValueError:
-                            continue  # Пропускаем неправильно отформатированные строки
-        except FileNotFoundError:
-            print(f"Файл лога не найден: {self.current_log_file}")
-        
+        # Записи идут по времени, поэтому идем с конца до первой слишком старой
+        for logged_at, level, module, message in reversed(records):
+            if logged_at < threshold:
+                break
+            recent_logs.append({
+                'timestamp': datetime.fromtimestamp(logged_at),
+                'level': level,
+                'module': module,
+                'message': message
+            })
+        recent_logs.reverse()
         return recent_logs
+    
+    def flush(self):
+        """
+        Дожидается записи всех сообщений в файл
+        """
+        self.writer.flush()
+    
+    def close(self):
+        """
+        Сбрасывает буферы и закрывает файл лога
+        """
+        self.writer.close()
+
+
+# Иерархическое колесо таймеров для кулдаунов и ежедневных сбросов
+class WheelTimer:
+    """
+    Таймер в колесе: срок по монотонным часам, тик срабатывания и данные
+    """
+    __slots__ = ('deadline', 'tick', 'payload', 'callback', 'bucket')
+
+    def __init__(self, deadline, tick, payload, callback):
+        self.deadline = deadline
+        self.tick = tick
+        self.payload = payload
+        self.callback = callback
+        self.bucket = None
+
+    @property
+    def active(self):
+        return self.bucket is not None
+
+
+class TimingWheel:
+    """
+    Иерархическое колесо таймеров на монотонных часах.
+
+    Уровень 0 делится на slots ячеек по tick секунд, каждый следующий
+    уровень в slots раз грубее. Таймер кладется в ячейку по своему тику
+    срабатывания, поэтому добавление и отмена выполняются за O(1); при
+    обороте младшего уровня таймеры из ячейки старшего уровня спускаются
+    ниже. Сработавшие за вызов advance таймеры отдаются одной пачкой,
+    а пустые тики между событиями advance перепрыгивает.
+    """
+    def __init__(self, tick=0.05, slots=256, levels=4, clock=time.monotonic, on_expire=None):
+        if slots & (slots - 1):
+            raise ValueError("slots должно быть степенью двойки")
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.clock = clock
+        self.on_expire = on_expire
+        self._bits = slots.bit_length() - 1
+        self._mask = slots - 1
+        self._max_delay_ticks = slots ** levels - 1
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._origin = clock()
+        self.current_tick = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _tick_for(self, moment):
+        return math.ceil((moment - self._origin) / self.tick)
+
+    def _place(self, timer):
+        # Уровень выбирается по расстоянию до срабатывания, ячейка - по абсолютному тику
+        delay = min(timer.tick - self.current_tick, self._max_delay_ticks)
+        target = self.current_tick + delay
+        level = 0
+        while delay >= 1 << (self._bits * (level + 1)):
+            level += 1
+        bucket = self._wheels[level][(target >> (self._bits * level)) & self._mask]
+        bucket.add(timer)
+        timer.bucket = bucket
+
+    def schedule(self, delay, payload=None, callback=None):
+        """
+        Ставит таймер
+
+        Args:
+            delay (float): Задержка в секундах
+            payload: Данные, которые получит обработчик
+            callback (callable): Обработчик этого таймера (вызывается с payload)
+
+        Returns:
+            WheelTimer: Таймер, который можно отменить
+        """
+        deadline = self.clock() + delay
+        tick = max(self._tick_for(deadline), self.current_tick + 1)
+        timer = WheelTimer(deadline, tick, payload, callback)
+        self._place(timer)
+        self.count += 1
+        return timer
+
+    def cancel(self, timer):
+        """
+        Отменяет таймер
+
+        Returns:
+            bool: True, если таймер еще ждал срабатывания
+        """
+        if timer.bucket is None:
+            return False
+        timer.bucket.discard(timer)
+        timer.bucket = None
+        self.count -= 1
+        return True
+
+    def _cascade(self):
+        # Спускаем таймеры из старших уровней, у которых начался новый оборот
+        for level in range(1, self.levels):
+            index = (self.current_tick >> (self._bits * level)) & self._mask
+            bucket = self._wheels[level][index]
+            if bucket:
+                self._wheels[level][index] = set()
+                for timer in bucket:
+                    self._place(timer)
+            if index:
+                break
+
+    def _next_due_tick(self):
+        # Ближайший тик, на котором что-то происходит: срабатывает ячейка уровня 0
+        # или со старшего уровня спускается непустая ячейка (None - таймеров нет)
+        current = self.current_tick
+        mask = self._mask
+        best = None
+        wheel = self._wheels[0]
+        for offset in range(1, self.slots + 1):
+            if wheel[(current + offset) & mask]:
+                best = current + offset
+                break
+        for level in range(1, self.levels):
+            shift = self._bits * level
+            span = 1 << shift
+            # Уровень level спускается на тиках, кратных span
+            boundary = (current // span + 1) * span
+            wheel = self._wheels[level]
+            for _ in range(self.slots):
+                if best is not None and boundary >= best:
+                    break
+                if wheel[(boundary >> shift) & mask]:
+                    best = boundary
+                    break
+                boundary += span
+        return best
+
+    def advance(self, now=None):
+        """
+        Продвигает колесо до текущего момента и обрабатывает сработавшие таймеры
+
+        Args:
+            now (float): Момент по часам колеса (по умолчанию - clock())
+
+        Returns:
+            list: Сработавшие таймеры
+        """
+        target = self._tick_for(self.clock() if now is None else now)
+        if target - 1 <= self.current_tick:
+            return []
+        # Тик target еще не закончился - обрабатываем только завершенные
+        target -= 1
+        if not self.count:
+            self.current_tick = target
+            return []
+
+        expired = []
+        wheel = self._wheels[0]
+        mask = self._mask
+        while self.current_tick < target and self.count:
+            due = self._next_due_tick()
+            if due is None or due > target:
+                break
+            # Пустые тики до ближайшего события пропускаем целиком
+            self.current_tick = due
+            index = self.current_tick & mask
+            if not index:
+                self._cascade()
+            bucket = wheel[index]
+            if bucket:
+                wheel[index] = set()
+                for timer in bucket:
+                    timer.bucket = None
+                expired.extend(bucket)
+                self.count -= len(bucket)
+        if self.current_tick < target:
+            self.current_tick = target
+
+        if expired:
+            for timer in expired:
+                if timer.callback is not None:
+                    timer.callback(timer.payload)
+            if self.on_expire is not None:
+                self.on_expire(expired)
+        return expired
 
 
 # Задание 2.3: Система кулдаунов для способностей
 class CooldownManager:
     """
-    Система управления кулдаунами способностей
+    Система управления кулдаунами способностей.
+
+    Время готовности хранится числом по монотонным часам, поэтому is_ready -
+    это одно сравнение без арифметики datetime. Истекшие кулдауны удаляются
+    пачками через TimingWheel, и словарь не растет бесконечно.
     """
-    def __init__(self):
-        self.cooldowns = {}  # Словарь для хранения времени последнего использования способности
+    def __init__(self, wheel=None, on_ready=None):
+        self.wheel = wheel if wheel is not None else TimingWheel()
+        self.clock = self.wheel.clock
+        self.on_ready = on_ready  # Вызывается с (player_id, ability_name), когда кулдаун истек
+        self.cooldowns = {}  # (игрок, способность) -> таймер с моментом готовности
+
+    def _expire(self, key):
+        if self.cooldowns.pop(key, None) is not None and self.on_ready is not None:
+            self.on_ready(*key)
+
+    def process_expired(self):
+        """
+        Удаляет истекшие кулдауны (и вызывает on_ready)
+
+        Returns:
+            int: Количество истекших кулдаунов
+        """
+        return len(self.wheel.advance())
     
     def use_ability(self, player_id, ability_name, cooldown_seconds):
         """
@@ -415,23 +1079,29 @@ class CooldownManager:
         Returns:
             tuple: (успешно ли использовано, время до готовности)
         """
+        self.wheel.advance()
         key = (player_id, ability_name)
-        current_time = datetime.now()
-        
-        if key in self.cooldowns:
-            last_used = self.cooldowns[key]
-            time_passed = current_time - last_used
-            cooldown_period = timedelta(seconds=cooldown_seconds)
-            
-            if time_passed < cooldown_period:
-                remaining = cooldown_period - time_passed
-                return False, remaining
-            else:
-                self.cooldowns[key] = current_time
-                return True, timedelta(0)
-        else:
-            self.cooldowns[key] = current_time
-            return True, timedelta(0)
+        timer = self.cooldowns.get(key)
+        if timer is not None:
+            remaining = timer.deadline - self.clock()
+            if remaining > 0:
+                return False, timedelta(seconds=remaining)
+            self.wheel.cancel(timer)
+        self.cooldowns[key] = self.wheel.schedule(cooldown_seconds, key, self._expire)
+        return True, timedelta(0)
+
+    def reset_cooldown(self, player_id, ability_name):
+        """
+        Сбрасывает кулдаун способности
+
+        Returns:
+            bool: True, если кулдаун был активен
+        """
+        timer = self.cooldowns.pop((player_id, ability_name), None)
+        if timer is None:
+            return False
+        self.wheel.cancel(timer)
+        return True
     
     def get_remaining_cooldown(self, player_id, ability_name):
         """
@@ -444,18 +1114,11 @@ class CooldownManager:
         Returns:
             timedelta: Оставшееся время до готовности
         """
-        key = (player_id, ability_name)
-        if key not in self.cooldowns:
-            return timedelta(0)
-        
-        last_used = self.cooldowns[key]
-        cooldown_period = timedelta(seconds=30)  # Временно фиксированное значение
-        time_passed = datetime.now() - last_used
-        
-        if time_passed < cooldown_period:
-            return cooldown_period - time_passed
-        else:
+        timer = self.cooldowns.get((player_id, ability_name))
+        if timer is None:
             return timedelta(0)
+        remaining = timer.deadline - self.clock()
+        return timedelta(seconds=remaining) if remaining > 0 else timedelta(0)
     
     def is_ready(self, player_id, ability_name):
         """
@@ -468,19 +1131,27 @@ class CooldownManager:
         Returns:
             bool: Готова ли способность
         """
-        remaining = self.get_remaining_cooldown(player_id, ability_name)
-        return remaining == timedelta(0)
+        timer = self.cooldowns.get((player_id, ability_name))
+        return timer is None or self.clock() >= timer.deadline
+
 
 
 # Задание 3.1: Система ежедневных заданий
 class DailyQuestSystem:
     """
-    Система ежедневных заданий
+    Система ежедневных заданий.
+
+    Сброс определяется сравнением календарных дат, поэтому он не сдвигается
+    при переводе часов и после сна компьютера. Прогресс игроков сбрасывается
+    лениво: у каждого игрока запоминается поколение заданий, и устаревший
+    прогресс обнуляется при следующем обращении, а не в цикле по всем игрокам.
     """
     def __init__(self):
         self.daily_quests = {}
         self.player_progress = {}
         self.last_refresh_date = date.today()
+        self.generation = 0
+        self._player_generation = {}
         # Возможные задания
         self.quest_templates = [
             {"id": "kill_5_monsters", "name": "Победить 5 монстров", "target": 5, "reward": 100},
@@ -490,9 +1161,20 @@ class DailyQuestSystem:
             {"id": "win_3_battles", "name": "Выиграть 3 битвы", "target": 3, "reward": 180}
         ]
     
+    def _sync_player(self, player_id):
+        # Обнуляет прогресс игрока, если он остался от прошлого поколения заданий
+        if self._player_generation.get(player_id) == self.generation:
+            return
+        self._player_generation[player_id] = self.generation
+        if player_id in self.player_progress:
+            self.player_progress[player_id] = {
+                quest_id: {"completed": False, "progress": 0, "claimed": False}
+                for quest_id in self.daily_quests
+            }
+
     def refresh_daily_quests(self):
         """
-        Обновляет список ежедневных заданий
+        Обновляет список ежедневных заданий, если наступил новый день
         """
         current_date = date.today()
         if current_date > self.last_refresh_date:
@@ -501,12 +1183,8 @@ class DailyQuestSystem:
             self.daily_quests = {quest['id']: quest for quest in selected_quests}
             self.last_refresh_date = current_date
             
-            # Сбрасываем прогресс для всех игроков
-            for player_id in self.player_progress:
-                self.player_progress[player_id] = {
-                    quest_id: {"completed": False, "progress": 0, "claimed": False} 
-                    for quest_id in self.daily_quests
-                }
+            # Прогресс игроков сбросится при следующем обращении к ним
+            self.generation += 1
     
     def assign_daily_quests(self, player_id):
         """
@@ -516,6 +1194,7 @@ class DailyQuestSystem:
             player_id (str): ID игрока
         """
         self.refresh_daily_quests()
+        self._sync_player(player_id)
         
         if player_id not in self.player_progress:
             self.player_progress[player_id] = {}
@@ -536,6 +1215,7 @@ class DailyQuestSystem:
             player_id (str): ID игрока
             quest_id (str): ID задания
         """
+        self._sync_player(player_id)
         if player_id in self.player_progress and quest_id in self.player_progress[player_id]:
             quest_info = self.player_progress[player_id][quest_id]
             template = self.daily_quests[quest_id]
@@ -560,6 +1240,7 @@ class DailyQuestSystem:
         
         if player_id not in self.player_progress:
             self.assign_daily_quests(player_id)
+        self._sync_player(player_id)
         
         quests_with_status = []
         for quest_id, progress in self.player_progress[player_id].items():
@@ -679,17 +1360,219 @@ class MultiTimeZoneEventManager:
         return relevant_events
 
 
+# Хранилище ресурсов с адресацией по содержимому
+class SharedBuffer:
+    """
+    Отображенный в память файл, общий для всех ресурсов с одинаковым содержимым
+    """
+    __slots__ = ('digest', 'size', 'mapping', 'refs')
+
+    def __init__(self, digest, size, mapping):
+        self.digest = digest
+        self.size = size
+        self.mapping = mapping  # None для пустого файла
+        self.refs = 0
+
+    def view(self):
+        return memoryview(self.mapping) if self.mapping is not None else memoryview(b'')
+
+
+class ContentStore:
+    """
+    Хранилище ресурсов с адресацией по содержимому.
+
+    Файл отображается в память только для чтения (mmap) и хэшируется blake2b
+    прямо по отображению, без копирования в bytes. Файлы с одинаковым
+    содержимым получают одно общее отображение; каждый acquire выдает на него
+    отдельный memoryview. Отображение закрывается, когда счетчик ссылок падает
+    до нуля; если снаружи еще живут memoryview на него, буфер остается в
+    buffers (с нулем ссылок и в mapped_bytes), закрытие повторяется при
+    следующих acquire/release/collect, а повторный acquire берет этот же буфер.
+    """
+    def __init__(self, digest_size=16):
+        self.digest_size = digest_size
+        self.buffers = {}  # хэш -> SharedBuffer
+        self.mapped_bytes = 0
+        self.lock = threading.Lock()
+        self._path_digests = {}  # путь -> (размер, mtime_ns, хэш)
+        self._closing = set()  # Хэши буферов без ссылок, которые еще нельзя закрыть
+
+    def _digest(self, mapping):
+        data = mapping if mapping is not None else b''
+        return hashlib.blake2b(data, digest_size=self.digest_size).hexdigest()
+
+    def _map_file(self, path, size):
+        if size == 0:
+            return None  # mmap не умеет отображать пустые файлы
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close_mapping(self, mapping):
+        # Только что созданное отображение: memoryview на него наружу не выдавались
+        if mapping is not None:
+            mapping.close()
+
+    def _try_close(self, buffer):
+        # Буфер убирается из хранилища только после успешного закрытия отображения
+        if buffer.mapping is not None:
+            try:
+                buffer.mapping.close()
+            except BufferError:
+                self._closing.add(buffer.digest)  # Снаружи еще живут срезы буфера
+                return False
+        self._closing.discard(buffer.digest)
+        del self.buffers[buffer.digest]
+        self.mapped_bytes -= buffer.size
+        return True
+
+    def _retry_closing(self):
+        closed = 0
+        for digest in list(self._closing):
+            buffer = self.buffers[digest]
+            if buffer.refs > 0:
+                self._closing.discard(digest)  # Буфер снова используется
+            elif self._try_close(buffer):
+                closed += 1
+        return closed
+
+    def collect(self):
+        """
+        Повторяет закрытие буферов без ссылок, на которые еще были memoryview
+
+        Returns:
+            int: Количество закрытых буферов
+        """
+        with self.lock:
+            return self._retry_closing()
+
+    def file_digest(self, path):
+        """
+        Возвращает хэш содержимого файла (повторно не хэширует неизмененный файл)
+        
+        Args:
+            path (str): Путь к файлу
+            
+        Returns:
+            str: Хэш содержимого
+        """
+        path = os.fspath(path)
+        stat = os.stat(path)
+        cached = self._path_digests.get(path)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        mapping = self._map_file(path, stat.st_size)
+        try:
+            digest = self._digest(mapping)
+        finally:
+            self._close_mapping(mapping)
+        self._path_digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def acquire(self, path):
+        """
+        Открывает файл через общий буфер и увеличивает счетчик ссылок
+        
+        Args:
+            path (str): Путь к файлу
+            
+        Returns:
+            tuple: (хэш содержимого, memoryview только для чтения)
+        """
+        path = os.fspath(path)
+        with self.lock:
+            if self._closing:
+                self._retry_closing()
+            stat = os.stat(path)
+            cached = self._path_digests.get(path)
+            if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                buffer = self.buffers.get(cached[2])
+                if buffer is not None:
+                    buffer.refs += 1
+                    self._closing.discard(buffer.digest)
+                    return buffer.digest, buffer.view()
+
+            mapping = self._map_file(path, stat.st_size)
+            digest = self._digest(mapping)
+            self._path_digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+            buffer = self.buffers.get(digest)
+            if buffer is None:
+                buffer = SharedBuffer(digest, stat.st_size, mapping)
+                self.buffers[digest] = buffer
+                self.mapped_bytes += buffer.size
+            else:
+                # Такое содержимое уже отображено - новое отображение не нужно
+                self._close_mapping(mapping)
+                self._closing.discard(digest)
+            buffer.refs += 1
+            return digest, buffer.view()
+
+    def view(self, digest):
+        """
+        Возвращает новый memoryview на уже загруженный буфер (счетчик ссылок не меняется)
+        
+        Args:
+            digest (str): Хэш содержимого
+            
+        Returns:
+            memoryview: Данные только для чтения
+        """
+        with self.lock:
+            return self.buffers[digest].view()
+
+    def release(self, digest):
+        """
+        Уменьшает счетчик ссылок и закрывает буфер, когда он больше не нужен
+        
+        Args:
+            digest (str): Хэш содержимого
+            
+        Returns:
+            bool: True, если буфер был закрыт
+        """
+        with self.lock:
+            buffer = self.buffers.get(digest)
+            if buffer is None or buffer.refs == 0:
+                return False
+            buffer.refs -= 1
+            if self._closing:
+                self._retry_closing()
+            if buffer.refs > 0:
+                return False
+            return self._try_close(buffer)
+
+    def get_stats(self):
+        """
+        Возвращает статистику хранилища
+        
+        Returns:
+            dict: Количество буферов, ссылок и отображенных байт
+        """
+        with self.lock:
+            return {
+                'buffers': len(self.buffers),
+                'references': sum(buffer.refs for buffer in self.buffers.values()),
+                'mapped_bytes': self.mapped_bytes,
+                'pending_close': len(self._closing)
+            }
+
+
 # Задание 3.4: Комплексная система управления игровыми ресурсами
 class ResourceManager:
     """
-    Комплексная система управления игровыми ресурсами
+    Комплексная система управления игровыми ресурсами.
+
+    Загруженные ресурсы хранятся в ContentStore: одинаковые текстуры и звуки
+    из разных модов отображаются в память один раз, а кэш выдает memoryview
+    без копирования данных.
     """
     def __init__(self, game_directory=".", config_file="config.json"):
         self.game_directory = Path(game_directory)
         self.config_file = Path(config_file)
-        self.resource_cache = {}  # Кэш ресурсов в памяти
+        self.store = ContentStore()
+        self.resource_cache = {}  # Путь ресурса -> memoryview на общий буфер
+        self.resource_digests = {}  # Путь ресурса -> хэш содержимого
         self.resource_manifest = {}  # Манифест всех ресурсов
-        self.cache_size = 0  # Текущий размер кэша в байтах
+        self.cache_size = 0  # Байт, отображенных в память (без учета дубликатов)
         self.max_cache_size = 100 * 1024 * 1024  # 100 МБ по умолчанию
         
         # Загружаем конфигурацию
@@ -749,9 +1632,8 @@ class ResourceManager:
                         file_path = Path(root) / file
                         relative_path = file_path.relative_to(self.game_directory)
                         
-                        # Вычисляем хэш файла
-                        with open(file_path, 'rb') as f:
-                            file_hash = hashlib.sha256(f.read()).hexdigest()
+                        # Хэш содержимого считается по mmap без чтения файла в bytes
+                        file_hash = self.store.file_digest(file_path)
                         
                         # Получаем информацию о файле
                         stat = file_path.stat()
@@ -775,14 +1657,14 @@ class ResourceManager:
             resource_path (str): Путь к ресурсу
             
         Returns:
-            bytes: Данные ресурса
+            memoryview: Данные ресурса (только для чтения)
         """
         resource_path = Path(resource_path)
         full_path = self.game_directory / resource_path
         
         if str(resource_path) in self.resource_cache:
-            # Ресурс уже в кэше
-            return self.resource_cache[str(resource_path)]
+            # Ресурс уже в кэше - выдаем новый memoryview на тот же буфер
+            return self.store.view(self.resource_digests[str(resource_path)])
         
         if not full_path.exists():
             raise FileNotFoundError(f"Ресурс не найден: {full_path}")
@@ -793,14 +1675,47 @@ class ResourceManager:
             # Очищаем кэш, если он слишком большой
             self.cleanup_cache()
         
-        with open(full_path, 'rb') as f:
-            data = f.read()
+        digest, data = self.store.acquire(full_path)
         
-        # Добавляем в кэш
+        # Добавляем в кэш. Собственный memoryview кэша наружу не отдается:
+        # вызывающий код получает отдельный, и освобождение кэша его не трогает
         self.resource_cache[str(resource_path)] = data
-        self.cache_size += len(data)
+        self.resource_digests[str(resource_path)] = digest
+        self.cache_size = self.store.mapped_bytes
+        
+        return self.store.view(digest)
+    
+    def release_resource(self, resource_path):
+        """
+        Убирает ресурс из кэша и освобождает ссылку на его буфер
+        
+        Args:
+            resource_path (str): Путь к ресурсу
+            
+        Returns:
+            bool: True, если ресурс был в кэше
+        """
+        key = str(Path(resource_path))
+        data = self.resource_cache.pop(key, None)
+        if data is None:
+            return False
+        data.release()  # memoryview принадлежит только кэшу
+        # Если снаружи еще держат memoryview на буфер, хранилище отложит его закрытие
+        self.store.release(self.resource_digests.pop(key))
+        self.cache_size = self.store.mapped_bytes
+        return True
+    
+    def get_duplicate_resources(self):
+        """
+        Находит ресурсы с одинаковым содержимым по манифесту
         
-        return data
+        Returns:
+            dict: Хэш -> список путей, у которых больше одного файла
+        """
+        by_hash = {}
+        for path, info in self.resource_manifest.items():
+            by_hash.setdefault(info['hash'], []).append(path)
+        return {digest: paths for digest, paths in by_hash.items() if len(paths) > 1}
     
     def get_resource_path(self, resource_type, resource_name):
         """
@@ -843,6 +1758,9 @@ class ResourceManager:
             max_size_mb (int): Максимальный размер кэша в МБ
         """
         max_size = max_size_mb * 1024 * 1024
+        # Сначала закрываем буферы, которые освободились после прошлых попыток
+        self.store.collect()
+        self.cache_size = self.store.mapped_bytes
         
         # Простая стратегия очистки: удаляем половину самых старых элементов
         if self.cache_size > max_size:
@@ -850,9 +1768,7 @@ class ResourceManager:
             keys_to_remove = list(self.resource_cache.keys())[:items_to_remove]
             
             for key in keys_to_remove:
-                data = self.resource_cache.pop(key, None)
-                if data:
-                    self.cache_size -= len(data)
+                self.release_resource(key)
             
             print(f"Кэш очищен: удалено {len(keys_to_remove)} элементов")
 
@@ -937,6 +1853,8 @@ if __name__ == "__main__":
     manifest = resource_manager.build_resource_manifest()
     print(f"Ресурсов в манифесте: {len(manifest)}")
     resource_manager.preload_resources([("textures", "background.png"), ("sounds", "battle.mp3")])
+    print(f"Дубликатов ресурсов: {len(resource_manager.get_duplicate_resources())}")
+    print(f"Хранилище ресурсов: {resource_manager.store.get_stats()}")
     print()
     
     print("Все игровые системы с использованием модулей os и sys успешно реализованы!")
\ No newline at end of file
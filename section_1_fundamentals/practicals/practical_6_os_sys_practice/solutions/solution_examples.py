@@ -10,6 +10,174 @@ from typing import Dict, Any, List
 import json
 import threading
 import time
+import csv
+import gc
+from array import array
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Модуль есть только в Unix
+
+# Параллельный инкрементальный обход дерева каталогов
+class DirectoryScanner:
+    """Параллельный инкрементальный сканер дерева каталогов.
+
+    Каталоги читаются через os.scandir, размер и время изменения файлов
+    берутся из DirEntry.stat(). Подкаталоги раздаются пулу потоков. Результат
+    хранится в манифесте {каталог: mtime, файлы, подкаталоги}, который можно
+    сохранить на диск. При повторном сканировании каталог перечитывается,
+    только если изменилось его mtime, иначе проверяются лишь его подкаталоги.
+
+    mtime каталога меняется при создании, удалении и переименовании файлов,
+    но не при перезаписи существующего файла - такие изменения находит
+    scan(full=True).
+    """
+    MANIFEST_VERSION = 1
+
+    def __init__(self, root: str, manifest_path: str = None, max_workers: int = None):
+        self.root = os.path.abspath(root)
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        if manifest_path:
+            self.load_manifest()
+
+    def load_manifest(self) -> bool:
+        """Загружает манифест с диска (манифест другого корня игнорируется)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != self.MANIFEST_VERSION or data.get('root') != self.root:
+            return False
+        self.manifest = data['directories']
+        return True
+
+    def save_manifest(self) -> bool:
+        """Атомарно сохраняет манифест на диск"""
+        if not self.manifest_path:
+            return False
+        data = {'version': self.MANIFEST_VERSION, 'root': self.root, 'directories': self.manifest}
+        temp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, self.manifest_path)
+            return True
+        except OSError as e:
+            print(f"Ошибка при сохранении манифеста: {e}")
+            return False
+
+    def _scan_directory(self, rel_path: str, full: bool):
+        path = self.root if rel_path == '.' else os.path.join(self.root, rel_path)
+        try:
+            dir_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return rel_path, None, False
+
+        previous = self.manifest.get(rel_path)
+        if not full and previous is not None and previous['mtime'] == dir_mtime:
+            return rel_path, previous, False
+
+        files = {}
+        dirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs.append(entry.name)
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # Битая ссылка или файл удален во время обхода
+                    files[entry.name] = [stat.st_size, stat.st_mtime_ns]
+        except OSError as e:
+            print(f"Ошибка доступа к директории: {e}")
+        size = sum(meta[0] for meta in files.values())
+        return rel_path, {'mtime': dir_mtime, 'size': size, 'files': files, 'dirs': dirs}, True
+
+    @staticmethod
+    def _diff_files(rel_path: str, old_files: Dict[str, list], new_files: Dict[str, list], changes: Dict[str, List[str]]):
+        prefix = '' if rel_path == '.' else rel_path + os.sep
+        for name, meta in new_files.items():
+            old_meta = old_files.get(name)
+            if old_meta is None:
+                changes['added'].append(prefix + name)
+            elif old_meta != meta:
+                changes['modified'].append(prefix + name)
+        for name in old_files.keys() - new_files.keys():
+            changes['removed'].append(prefix + name)
+
+    def scan(self, full: bool = False) -> Dict[str, Any]:
+        """Сканирует дерево и возвращает итоги и изменения с прошлого сканирования"""
+        with self.lock:
+            start_time = time.perf_counter()
+            old_manifest = self.manifest
+            new_manifest = {}
+            changes = {'added': [], 'removed': [], 'modified': []}
+            scanned_dirs = skipped_dirs = 0
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                pending = {pool.submit(self._scan_directory, '.', full)}
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rel_path, record, scanned = future.result()
+                        if record is None:
+                            continue
+                        new_manifest[rel_path] = record
+                        if scanned:
+                            scanned_dirs += 1
+                            previous = old_manifest.get(rel_path)
+                            self._diff_files(rel_path, previous['files'] if previous else {}, record['files'], changes)
+                        else:
+                            skipped_dirs += 1
+                        for name in record['dirs']:
+                            child = name if rel_path == '.' else os.path.join(rel_path, name)
+                            pending.add(pool.submit(self._scan_directory, child, full))
+
+            # Файлы из исчезнувших каталогов
+            removed_dirs = old_manifest.keys() - new_manifest.keys()
+            for rel_path in removed_dirs:
+                self._diff_files(rel_path, old_manifest[rel_path]['files'], {}, changes)
+
+            self.manifest = new_manifest
+            if self.manifest_path and (scanned_dirs or removed_dirs):
+                self.save_manifest()
+
+            return {
+                'root': self.root,
+                'directories': len(new_manifest),
+                'files': sum(len(record['files']) for record in new_manifest.values()),
+                'total_size': self.total_size(),
+                'scanned_dirs': scanned_dirs,
+                'skipped_dirs': skipped_dirs,
+                'added': changes['added'],
+                'removed': changes['removed'],
+                'modified': changes['modified'],
+                'elapsed': time.perf_counter() - start_time
+            }
+
+    def total_size(self) -> int:
+        """Суммарный размер файлов по манифесту"""
+        return sum(record['size'] for record in self.manifest.values())
+
+    def files_count(self) -> Dict[str, int]:
+        """Количество файлов в каждом каталоге по манифесту"""
+        return {rel_path: len(record['files']) for rel_path, record in self.manifest.items()}
+
+    def iter_files(self):
+        """Перебирает (относительный путь, размер, mtime_ns) всех файлов из манифеста"""
+        for rel_path, record in self.manifest.items():
+            prefix = '' if rel_path == '.' else rel_path + os.sep
+            for name, (size, mtime_ns) in record['files'].items():
+                yield prefix + name, size, mtime_ns
+
 
 # Решение задания 1: Работа с файловой системой
 class FileSystemManager:
@@ -17,6 +185,7 @@ class FileSystemManager:
     def __init__(self):
         self.current_directory = os.getcwd()
         self.lock = threading.Lock()
+        self.scanners: Dict[str, DirectoryScanner] = {}
     
     def get_current_directory_info(self) -> Dict[str, Any]:
         """Получает информацию о текущей директории"""
@@ -29,28 +198,38 @@ class FileSystemManager:
             }
             
             try:
-                items = os.listdir(self.current_directory)
-                info['total_items'] = len(items)
-                
-                for item in items:
-                    item_path = os.path.join(self.current_directory, item)
-                    is_dir = os.path.isdir(item_path)
-                    size = 0 if is_dir else os.path.getsize(item_path)
-                    info['total_size'] += size
-                    
-                    item_info = {
-                        'name': item,
-                        'type': 'directory' if is_dir else 'file',
-                        'size': size,
-                        'path': item_path,
-                        'modified': os.path.getmtime(item_path)
-                    }
-                    info['items'].append(item_info)
+                # DirEntry уже знает тип элемента, а stat() кэшируется в самой записи
+                with os.scandir(self.current_directory) as entries:
+                    for entry in entries:
+                        is_dir = entry.is_dir()
+                        stat = entry.stat()
+                        size = 0 if is_dir else stat.st_size
+                        info['total_size'] += size
+                        
+                        item_info = {
+                            'name': entry.name,
+                            'type': 'directory' if is_dir else 'file',
+                            'size': size,
+                            'path': entry.path,
+                            'modified': stat.st_mtime
+                        }
+                        info['items'].append(item_info)
+                info['total_items'] = len(info['items'])
             except PermissionError as e:
                 print(f"Ошибка доступа к директории: {e}")
             
             return info
     
+    def scan_tree(self, path: str = None, manifest_path: str = None, full: bool = False) -> Dict[str, Any]:
+        """Инкрементально сканирует дерево каталогов (по умолчанию - текущую директорию)"""
+        root = os.path.abspath(path or self.current_directory)
+        with self.lock:
+            scanner = self.scanners.get(root)
+            if scanner is None or scanner.manifest_path != manifest_path:
+                scanner = DirectoryScanner(root, manifest_path)
+                self.scanners[root] = scanner
+        return scanner.scan(full=full)
+    
     def create_directory_and_files(self, dir_name: str, file_names: List[str]) -> bool:
         """Создает директорию и файлы в ней"""
         with self.lock:
@@ -282,20 +461,214 @@ class SystemInfo:
             'path_hooks': sys.path_hooks
         }
 
+# Фоновый сбор метрик процесса в кольцевой буфер
+class MetricsRing:
+    """Кольцевой буфер метрик фиксированного размера.
+
+    Каждая метрика хранится в заранее выделенном array('d'). Запись идет под
+    счетчиком версий (seqlock): писатель делает счетчик нечетным, заполняет
+    ячейку и снова делает его четным. Читатель копирует столбцы без
+    блокировок и повторяет копирование, если счетчик изменился, поэтому
+    снимок всегда согласован, а поток сбора никогда не ждет читателей.
+    """
+    def __init__(self, fields: List[str], capacity: int = 3600):
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.columns = {field: array('d', bytes(8 * capacity)) for field in self.fields}
+        self.count = 0
+        self._sequence = 0
+
+    def append(self, values: Dict[str, float]):
+        """Записывает один замер (вызывается только из потока сбора)"""
+        index = self.count % self.capacity
+        self._sequence += 1
+        for field in self.fields:
+            self.columns[field][index] = values[field]
+        self.count += 1
+        self._sequence += 1
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        """Возвращает согласованную копию замеров от старых к новым"""
+        while True:
+            sequence = self._sequence
+            if sequence & 1:
+                time.sleep(0)  # Писатель посередине записи - уступаем ему
+                continue
+            count = self.count
+            copies = {field: column[:] for field, column in self.columns.items()}
+            if sequence == self._sequence:
+                break
+
+        size = min(count, self.capacity)
+        start = count % self.capacity if count > self.capacity else 0
+        return {field: (column[start:] + column[:start]).tolist()[:size] for field, column in copies.items()}
+
+
+class MetricsSampler:
+    """Поток, который с заданной частотой записывает метрики процесса в MetricsRing"""
+    FIELDS = ['timestamp', 'cpu_percent', 'rss_bytes', 'open_fds',
+              'gc_gen0', 'gc_gen1', 'gc_gen2', 'gc_collections']
+
+    def __init__(self, interval: float = 1.0, capacity: int = 3600):
+        self.interval = interval
+        self.ring = MetricsRing(self.FIELDS, capacity)
+        self._stop = threading.Event()
+        self._thread = None
+        self._statm_fd = None
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self._fd_dir = '/proc/self/fd' if os.path.isdir('/proc/self/fd') else None
+        self._last_cpu = time.process_time()
+        self._last_wall = time.monotonic()
+
+    def _read_rss(self) -> float:
+        # /proc/self/statm держим открытым и перечитываем через pread
+        if self._statm_fd is None and os.path.exists('/proc/self/statm'):
+            self._statm_fd = os.open('/proc/self/statm', os.O_RDONLY)
+        if self._statm_fd is not None:
+            return float(int(os.pread(self._statm_fd, 128, 0).split()[1]) * self._page_size)
+        if resource is not None:
+            # Вне Linux доступен только пиковый RSS (в Linux ru_maxrss в КБ, в macOS - в байтах)
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return float(max_rss if sys.platform == 'darwin' else max_rss * 1024)
+        return -1.0
+
+    def _count_fds(self) -> float:
+        if self._fd_dir is None:
+            return -1.0
+        return float(len(os.listdir(self._fd_dir)) - 1)  # Без дескриптора самого listdir
+
+    def sample(self) -> Dict[str, float]:
+        """Снимает один замер метрик процесса"""
+        cpu_time = time.process_time()
+        wall_time = time.monotonic()
+        elapsed = wall_time - self._last_wall
+        cpu_percent = 100.0 * (cpu_time - self._last_cpu) / elapsed if elapsed > 0 else 0.0
+        self._last_cpu, self._last_wall = cpu_time, wall_time
+
+        gen0, gen1, gen2 = gc.get_count()
+        return {
+            'timestamp': time.time(),
+            'cpu_percent': cpu_percent,
+            'rss_bytes': self._read_rss(),
+            'open_fds': self._count_fds(),
+            'gc_gen0': float(gen0),
+            'gc_gen1': float(gen1),
+            'gc_gen2': float(gen2),
+            'gc_collections': float(sum(stats['collections'] for stats in gc.get_stats()))
+        }
+
+    def _run(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            self.ring.append(self.sample())
+            next_time += self.interval
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                next_time = time.monotonic()  # Не догоняем пропущенные замеры
+                delay = 0
+            self._stop.wait(delay)
+
+    def start(self):
+        """Запускает поток сбора метрик"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._last_cpu = time.process_time()
+            self._last_wall = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="MetricsSampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Останавливает поток сбора метрик"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._statm_fd is not None:
+            os.close(self._statm_fd)
+            self._statm_fd = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], fraction: float) -> float:
+        position = (len(sorted_values) - 1) * fraction
+        lower = int(position)
+        upper = min(lower + 1, len(sorted_values) - 1)
+        return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+    def summary(self, percentiles=(0.5, 0.9, 0.99), snapshot: Dict[str, List[float]] = None) -> Dict[str, Dict[str, float]]:
+        """Возвращает min/max/среднее и перцентили каждой метрики по снимку буфера"""
+        if snapshot is None:
+            snapshot = self.ring.snapshot()
+        result = {}
+        for field in self.FIELDS[1:]:
+            values = sorted(snapshot[field])
+            if not values:
+                continue
+            stats = {
+                'min': values[0],
+                'max': values[-1],
+                'mean': sum(values) / len(values)
+            }
+            for fraction in percentiles:
+                stats[f"p{fraction * 100:g}"] = self._percentile(values, fraction)
+            result[field] = stats
+        return result
+
+    def export_csv(self, filename: str) -> int:
+        """Сохраняет замеры в CSV и возвращает их количество"""
+        snapshot = self.ring.snapshot()
+        rows = list(zip(*(snapshot[field] for field in self.FIELDS)))
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.FIELDS)
+            writer.writerows(rows)
+        return len(rows)
+
+    def export_json(self, filename: str) -> int:
+        """Сохраняет замеры и сводку в JSON и возвращает количество замеров"""
+        snapshot = self.ring.snapshot()
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'interval': self.interval, 'samples': snapshot, 'summary': self.summary(snapshot=snapshot)}, f, indent=2)
+        return len(snapshot['timestamp'])
+
+
 class DiagnosticTool:
     """Утилита системной диагностики"""
     def __init__(self):
         self.info = SystemInfo()
+        self.sampler = None
+        self._static_info = None  # Сведения о Python и платформе не меняются за время работы
+    
+    def start_sampling(self, interval: float = 1.0, capacity: int = 3600) -> MetricsSampler:
+        """Запускает фоновый сбор метрик процесса"""
+        if self.sampler is None:
+            self.sampler = MetricsSampler(interval, capacity)
+        self.sampler.start()
+        return self.sampler
+    
+    def stop_sampling(self):
+        """Останавливает фоновый сбор метрик"""
+        if self.sampler is not None:
+            self.sampler.stop()
     
     def run_full_diagnostic(self) -> Dict[str, Any]:
         """Запускает полную диагностику системы"""
+        if self._static_info is None:
+            self._static_info = {
+                'python_info': self.info.get_python_info(),
+                'platform_info': self.info.get_platform_info()
+            }
         diagnostic_results = {
             'timestamp': time.time(),
-            'python_info': self.info.get_python_info(),
-            'platform_info': self.info.get_platform_info(),
+            **self._static_info,
             'memory_info': self.info.get_memory_info(),
             'module_info': self.info.get_module_info()
         }
+        if self.sampler is not None:
+            diagnostic_results['metrics_summary'] = self.sampler.summary()
         return diagnostic_results
     
     def print_diagnostic_report(self):
@@ -332,6 +705,11 @@ class DiagnosticTool:
         module_info = results['module_info']
         print(f"Встроенные модули: {len(module_info['builtin_modules'])} шт.")
         print(f"Загруженные модули: {len(module_info['loaded_modules'])} шт.")
+        
+        if results.get('metrics_summary'):
+            print("\n--- МЕТРИКИ ПРОЦЕССА ---")
+            for field, stats in results['metrics_summary'].items():
+                print(f"{field}: p50={stats['p50']:.1f}, p99={stats['p99']:.1f}, max={stats['max']:.1f}")
 
 # Дополнительные примеры использования модулей os и sys
 def demonstrate_os_functions():
@@ -422,6 +800,12 @@ if __name__ == "__main__":
     print(f"Всего элементов: {dir_info['total_items']}")
     print(f"Общий размер: {dir_info['total_size']} байт")
     
+    # Инкрементальное сканирование дерева: второй проход перечитывает только измененные каталоги
+    tree_info = fs_manager.scan_tree()
+    print(f"Дерево: {tree_info['files']} файлов в {tree_info['directories']} каталогах")
+    tree_info = fs_manager.scan_tree()
+    print(f"Повторное сканирование: пропущено каталогов {tree_info['skipped_dirs']}, за {tree_info['elapsed']:.3f} с")
+    
     # Создаем тестовую директорию и файлы
     test_dir = "test_fs_operations"
     test_files = ["file1.txt", "file2.txt", "file3.txt"]
@@ -468,7 +852,10 @@ if __name__ == "__main__":
     
     print("\n5. Решение задания 5: Системная информация")
     diagnostic_tool = DiagnosticTool()
+    diagnostic_tool.start_sampling(interval=0.05, capacity=100)
+    time.sleep(0.5)
     diagnostic_tool.print_diagnostic_report()
+    diagnostic_tool.stop_sampling()
     
     print("\n6. Дополнительные примеры")
     demonstrate_os_functions()
@@ -1,9 +1,28 @@
 # Решения для практического задания 7: Работа с JSON в игровом контексте
 
+import copy
+import heapq
 import json
-from datetime import datetime
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: индекс защищен только блокировкой внутри процесса
+
 # Ниже приведены реализованные игровые классы и функции согласно заданию
 
 def serialize_game_object(obj):
@@ -77,12 +96,103 @@ def deserialize_game_object(json_str):
     return deserialize_helper(parsed_json)
 
 
+class DebouncedWriter:
+    """
+    Фоновая запись с объединением изменений: после вызова schedule() функция
+    записи выполняется в отдельном потоке не чаще одного раза за interval секунд,
+    а все изменения, накопленные за это время, попадают в одну запись
+    """
+    def __init__(self, write_func, interval=1.0):
+        self.write_func = write_func
+        self.interval = interval
+        self.write_count = 0
+        self._timer = None
+        self._last_write = float('-inf')
+        self._lock = threading.Lock()
+    
+    def schedule(self):
+        """Планирует запись, если она еще не запланирована"""
+        with self._lock:
+            if self._timer is not None:
+                return  # Запись уже запланирована - изменения объединятся
+            delay = max(0.0, self._last_write + self.interval - time.monotonic())
+            self._timer = threading.Timer(delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _run(self):
+        with self._lock:
+            self._timer = None
+            self._last_write = time.monotonic()
+            self.write_count += 1
+        self.write_func()
+    
+    def flush(self):
+        """Отменяет запланированную запись и выполняет ее немедленно"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.write_func()
+
+
+class ConfigSnapshot(Mapping):
+    """
+    Неизменяемое представление конфигурации.
+    Создается за O(1): вложенные словари оборачиваются только при обращении.
+    GameConfig никогда не изменяет опубликованные словари (копирование при записи),
+    поэтому снимок остается согласованным при любых последующих изменениях.
+    """
+    def __init__(self, data):
+        self._data = data
+    
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, dict):
+            return ConfigSnapshot(value)
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __repr__(self):
+        return f"ConfigSnapshot({self._data!r})"
+    
+    def get_setting(self, *keys):
+        """
+        Возвращает значение настройки по цепочке ключей
+        
+        Args:
+            *keys: Ключи для доступа к настройке
+        """
+        value = self
+        for key in keys:
+            if isinstance(value, ConfigSnapshot) and key in value:
+                value = value[key]
+            else:
+                return None
+        return value
+    
+    def to_dict(self):
+        """Возвращает изменяемую глубокую копию конфигурации"""
+        return copy.deepcopy(self._data)
+
+
 class GameConfig:
     """
     Система конфигурации игры через JSON-файл
     """
-    def __init__(self, config_file="config.json"):
+    def __init__(self, config_file="config.json", autosave_interval=None):
         self.config_file = Path(config_file)
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._version = 0  # Номер изменения конфигурации
+        self._dirty_keys = set()  # Цепочки ключей, измененные после последнего сохранения
         self.default_config = {
             "resolution": {
                 "width": 1920,
@@ -116,6 +226,8 @@ class GameConfig:
             }
         }
         self.config = self.load_config()
+        # При autosave_interval изменения сохраняются в фоне не чаще раза за интервал
+        self._writer = DebouncedWriter(self.save_config, autosave_interval) if autosave_interval else None
     
     def load_config(self):
         """
@@ -138,15 +250,63 @@ class GameConfig:
                 return self.default_config
         else:
             # Создаем файл конфигурации со значениями по умолчанию
+            self.config = self.default_config
             self.save_config()
             return self.default_config
     
     def save_config(self):
         """
-        Сохраняет текущую конфигурацию в файл
+        Атомарно сохраняет текущую конфигурацию в файл (временный файл + переименование)
+        """
+        with self._save_lock:
+            with self._lock:
+                snapshot = self.config
+                version = self._version
+            
+            temp_path = self.config_file.with_name(self.config_file.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.config_file)
+            
+            with self._lock:
+                if self._version == version:
+                    self._dirty_keys.clear()
+    
+    def _mark_dirty(self, keys):
+        """Отмечает изменение и планирует фоновое сохранение"""
+        self._version += 1
+        self._dirty_keys.add(tuple(keys))
+        if self._writer is not None:
+            self._writer.schedule()
+    
+    @property
+    def dirty_keys(self):
+        """Цепочки ключей, измененные после последнего сохранения"""
+        with self._lock:
+            return set(self._dirty_keys)
+    
+    def is_dirty(self):
+        """Есть ли несохраненные изменения"""
+        with self._lock:
+            return bool(self._dirty_keys)
+    
+    def snapshot(self):
+        """
+        Возвращает неизменяемый снимок текущей конфигурации
+        
+        Returns:
+            ConfigSnapshot: Снимок конфигурации
+        """
+        return ConfigSnapshot(self.config)
+    
+    def flush(self):
+        """
+        Немедленно сохраняет несохраненные изменения
         """
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
+        if self._writer is not None:
+            self._writer.flush()
+        elif self.is_dirty():
+            self.save_config()
     
     def get_setting(self, *keys):
         """
@@ -174,13 +334,32 @@ class GameConfig:
             value: Значение для установки
             *keys: Ключи для доступа к настройке
         """
-        config_ref = self.config
-        for key in keys[:-1]:
-            if key not in config_ref or not isinstance(config_ref[key], dict):
-                config_ref[key] = {}
-            config_ref = config_ref[key]
+        with self._lock:
+            # Копирование при записи: копируются только словари на пути к ключу,
+            # а опубликованная конфигурация не изменяется
+            new_config = dict(self.config)
+            config_ref = new_config
+            for key in keys[:-1]:
+                child = config_ref.get(key)
+                child = dict(child) if isinstance(child, dict) else {}
+                config_ref[key] = child
+                config_ref = child
+            
+            config_ref[keys[-1]] = value
+            self.config = new_config
+            self._mark_dirty(keys)
+    
+    def update_settings(self, override):
+        """
+        Объединяет переопределения с текущей конфигурацией и публикует результат целиком
         
-        config_ref[keys[-1]] = value
+        Args:
+            override (dict): Переопределяемые настройки
+        """
+        with self._lock:
+            self.config = self.merge_configs(self.config, override)
+            for key in override:
+                self._mark_dirty((key,))
     
     def merge_configs(self, default, override):
         """
@@ -204,34 +383,864 @@ class GameConfig:
         return result
 
 
+class JSONSaveCodec:
+    """
+    Кодек сохранений в текстовом JSON (исходный формат сохранений)
+    """
+    name = 'json'
+    extension = '.json'
+    
+    def __init__(self, indent=2):
+        self.indent = indent  # None - компактная запись без пробелов
+    
+    def encode(self, data):
+        """
+        Кодирует словарь сохранения в байты
+        
+        Args:
+            data (dict): Данные сохранения
+            
+        Returns:
+            bytes: Закодированные данные
+        """
+        if self.indent is None:
+            return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return json.dumps(data, indent=self.indent, ensure_ascii=False).encode('utf-8')
+    
+    def decode(self, raw):
+        """
+        Декодирует байты сохранения в словарь
+        
+        Args:
+            raw (bytes): Закодированные данные
+            
+        Returns:
+            dict: Данные сохранения
+        """
+        return json.loads(raw)
+
+
+class BinarySaveCodec:
+    """
+    Компактный двоичный кодек сохранений игрока.
+    
+    Формат знает схему Player.to_dict: известные поля пишутся по позициям
+    одной записью struct без имен ключей, даты - числом микросекунд от эпохи,
+    инвентарь - массивом количеств и строкой идентификаторов. Маска полей
+    отмечает, какие поля упакованы; поля вне схемы (или с неожиданным типом)
+    дописываются в конец компактным JSON, поэтому кодируется любой словарь.
+    Сохранения версии 1 (универсальный формат с таблицей ключей) читаются.
+    """
+    name = 'binary'
+    extension = '.sav'
+    MAGIC = b'GSAV'
+    SCHEMA_VERSION = 2
+    
+    _HEADER = struct.Struct('<4sH')
+    # сигнатура, версия, маска полей, level, health, max_health, позиция (x, y),
+    # play_time, creation_date, last_played, save_date (мкс от эпохи),
+    # strength, agility, intelligence, длины: name, description,
+    # число предметов, идентификаторы предметов, дополнительный JSON
+    _RECORD = struct.Struct('<4sHHiiiddqqqqiiiHHHII')
+    _EPOCH = datetime(1970, 1, 1)
+    
+    # Биты маски упакованных полей
+    _NAME = 1 << 0
+    _LEVEL = 1 << 1
+    _HEALTH = 1 << 2
+    _MAX_HEALTH = 1 << 3
+    _POSITION = 1 << 4
+    _POSITION_INT = 1 << 5
+    _INVENTORY = 1 << 6
+    _STATS = 1 << 7
+    _PLAY_TIME = 1 << 8
+    _CREATION_DATE = 1 << 9
+    _LAST_PLAYED = 1 << 10
+    _SAVE_DATE = 1 << 11
+    _DESCRIPTION = 1 << 12
+    # Поля, которые всегда есть в Player.to_dict
+    _PLAYER_FIELDS = (_NAME | _LEVEL | _HEALTH | _MAX_HEALTH | _POSITION | _INVENTORY
+                      | _STATS | _PLAY_TIME | _CREATION_DATE | _LAST_PLAYED)
+    
+    _INT32 = (-2 ** 31, 2 ** 31)
+    _INT64 = (-2 ** 63, 2 ** 63)
+    _STAT_KEYS = ('strength', 'agility', 'intelligence')
+    
+    @staticmethod
+    def _is_int(value, bounds):
+        return type(value) is int and bounds[0] <= value < bounds[1]
+    
+    # Даты переводятся через кэш по целым секундам: строки isoformat
+    # без долей секунды всегда длиной 19 символов
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _epoch_seconds(text):
+        """Секунды от эпохи для строки вида YYYY-MM-DDTHH:MM:SS (None, если формат другой)"""
+        try:
+            moment = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if moment.tzinfo is not None or moment.isoformat() != text:
+            return None
+        delta = moment - BinarySaveCodec._EPOCH
+        return delta.days * 86400 + delta.seconds
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _iso_seconds(seconds):
+        return (BinarySaveCodec._EPOCH + timedelta(seconds=seconds)).isoformat()
+    
+    @classmethod
+    def _pack_datetime(cls, value):
+        """
+        ISO-строку наивного времени переводит в микросекунды от эпохи.
+        Возвращает None, если строку нельзя восстановить без потерь
+        """
+        if type(value) is not str:
+            return None
+        if len(value) == 19:
+            micro = 0
+        elif len(value) == 26 and value[19] == '.' and value[20:].isascii() and value[20:].isdigit():
+            micro = int(value[20:])
+            if not micro:
+                return None  # isoformat() не пишет нулевые микросекунды
+            value = value[:19]
+        else:
+            return None
+        seconds = cls._epoch_seconds(value)
+        if seconds is None:
+            return None
+        return seconds * 1000000 + micro
+    
+    @classmethod
+    def _unpack_datetime(cls, micros):
+        """Собирает строку datetime.isoformat() без создания объекта datetime"""
+        seconds, micro = divmod(micros, 1000000)
+        if micro:
+            return f"{cls._iso_seconds(seconds)}.{micro:06d}"
+        return cls._iso_seconds(seconds)
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _quantities(count):
+        """Скомпилированный struct для массива количеств предметов"""
+        return struct.Struct(f'<{count}i')
+    
+    def encode(self, data):
+        """
+        Кодирует словарь сохранения в двоичный формат
+        
+        Args:
+            data (dict): Данные сохранения
+            
+        Returns:
+            bytes: Закодированные данные
+        """
+        mask = 0
+        level = health = max_health = play_time = 0
+        x = y = 0.0
+        created = last_played = saved = 0
+        strength = agility = intelligence = 0
+        name = description = item_ids = b''
+        quantities = ()
+        extra = {}
+        
+        for key, value in data.items():
+            if key == 'name' and type(value) is str:
+                name = value.encode('utf-8')
+                if len(name) <= 0xFFFF:
+                    mask |= self._NAME
+                    continue
+            elif key == 'description' and type(value) is str:
+                description = value.encode('utf-8')
+                if len(description) <= 0xFFFF:
+                    mask |= self._DESCRIPTION
+                    continue
+            elif key in ('level', 'health', 'max_health') and self._is_int(value, self._INT32):
+                if key == 'level':
+                    level = value
+                    mask |= self._LEVEL
+                elif key == 'health':
+                    health = value
+                    mask |= self._HEALTH
+                else:
+                    max_health = value
+                    mask |= self._MAX_HEALTH
+                continue
+            elif key == 'play_time' and self._is_int(value, self._INT64):
+                play_time = value
+                mask |= self._PLAY_TIME
+                continue
+            elif key == 'position' and isinstance(value, (list, tuple)) and len(value) == 2:
+                if type(value[0]) is float and type(value[1]) is float:
+                    x, y = value
+                    mask |= self._POSITION
+                    continue
+                if all(self._is_int(coord, (-2 ** 53, 2 ** 53)) for coord in value):
+                    x, y = value
+                    mask |= self._POSITION | self._POSITION_INT
+                    continue
+            elif key in ('creation_date', 'last_played', 'save_date'):
+                micros = self._pack_datetime(value)
+                if micros is not None and self._is_int(micros, self._INT64):
+                    if key == 'creation_date':
+                        created = micros
+                        mask |= self._CREATION_DATE
+                    elif key == 'last_played':
+                        last_played = micros
+                        mask |= self._LAST_PLAYED
+                    else:
+                        saved = micros
+                        mask |= self._SAVE_DATE
+                    continue
+            elif key == 'stats' and type(value) is dict and len(value) == 3:
+                stats = [value.get(stat) for stat in self._STAT_KEYS]
+                if all(self._is_int(stat, self._INT32) for stat in stats):
+                    strength, agility, intelligence = stats
+                    mask |= self._STATS
+                    continue
+            elif key == 'inventory' and type(value) is list and len(value) <= 0xFFFF:
+                if all(type(item) is dict and len(item) == 2
+                       and type(item.get('id')) is str and '\x00' not in item['id']
+                       and self._is_int(item.get('quantity'), self._INT32)
+                       for item in value):
+                    item_ids = '\x00'.join(item['id'] for item in value).encode('utf-8')
+                    quantities = [item['quantity'] for item in value]
+                    mask |= self._INVENTORY
+                    continue
+            extra[key] = value
+        
+        extra_raw = json.dumps(extra, ensure_ascii=False, separators=(',', ':')).encode('utf-8') if extra else b''
+        return b''.join((
+            self._RECORD.pack(self.MAGIC, self.SCHEMA_VERSION, mask,
+                              level, health, max_health, x, y,
+                              play_time, created, last_played, saved,
+                              strength, agility, intelligence,
+                              len(name), len(description), len(quantities),
+                              len(item_ids), len(extra_raw)),
+            name, description,
+            self._quantities(len(quantities)).pack(*quantities),
+            item_ids, extra_raw,
+        ))
+    
+    def _decode_record(self, raw):
+        (_, _, mask, level, health, max_health, x, y,
+         play_time, created, last_played, saved,
+         strength, agility, intelligence,
+         name_length, description_length, item_count,
+         item_ids_length, extra_length) = self._RECORD.unpack_from(raw, 0)
+        pos = self._RECORD.size
+        if len(raw) < pos + name_length + description_length + item_count * 4 + item_ids_length + extra_length:
+            raise ValueError("Двоичное сохранение обрезано")
+        
+        # Порядок ключей совпадает с Player.to_dict
+        if mask & self._PLAYER_FIELDS == self._PLAYER_FIELDS and not mask & self._POSITION_INT:
+            # Обычное сохранение игрока - словарь собирается одним выражением
+            inventory_start = pos + name_length + description_length
+            packer = self._quantities(item_count)
+            ids_start = inventory_start + packer.size
+            item_ids = str(raw[ids_start:ids_start + item_ids_length], 'utf-8').split('\x00') if item_count else ()
+            unpack_datetime = self._unpack_datetime
+            data = {
+                'name': str(raw[pos:pos + name_length], 'utf-8'),
+                'level': level,
+                'health': health,
+                'max_health': max_health,
+                'position': [x, y],
+                'inventory': [{'id': item_id, 'quantity': quantity} for item_id, quantity
+                              in zip(item_ids, packer.unpack_from(raw, inventory_start))],
+                'stats': {'strength': strength, 'agility': agility, 'intelligence': intelligence},
+                'play_time': play_time,
+                'creation_date': unpack_datetime(created),
+                'last_played': unpack_datetime(last_played),
+            }
+            if mask & self._SAVE_DATE:
+                data['save_date'] = unpack_datetime(saved)
+            if mask & self._DESCRIPTION:
+                data['description'] = str(raw[pos + name_length:inventory_start], 'utf-8')
+            if extra_length:
+                extra_start = ids_start + item_ids_length
+                data.update(json.loads(bytes(raw[extra_start:extra_start + extra_length])))
+            return data
+        
+        data = {}
+        if mask & self._NAME:
+            data['name'] = str(raw[pos:pos + name_length], 'utf-8')
+        pos += name_length
+        if mask & self._LEVEL:
+            data['level'] = level
+        if mask & self._HEALTH:
+            data['health'] = health
+        if mask & self._MAX_HEALTH:
+            data['max_health'] = max_health
+        if mask & self._POSITION:
+            data['position'] = [int(x), int(y)] if mask & self._POSITION_INT else [x, y]
+        if mask & self._INVENTORY:
+            packer = self._quantities(item_count)
+            quantities = packer.unpack_from(raw, pos + description_length)
+            ids_start = pos + description_length + packer.size
+            item_ids = str(raw[ids_start:ids_start + item_ids_length], 'utf-8').split('\x00') if item_count else ()
+            data['inventory'] = [{'id': item_id, 'quantity': quantity}
+                                 for item_id, quantity in zip(item_ids, quantities)]
+        if mask & self._STATS:
+            data['stats'] = {'strength': strength, 'agility': agility, 'intelligence': intelligence}
+        if mask & self._PLAY_TIME:
+            data['play_time'] = play_time
+        if mask & self._CREATION_DATE:
+            data['creation_date'] = self._unpack_datetime(created)
+        if mask & self._LAST_PLAYED:
+            data['last_played'] = self._unpack_datetime(last_played)
+        if mask & self._SAVE_DATE:
+            data['save_date'] = self._unpack_datetime(saved)
+        if mask & self._DESCRIPTION:
+            data['description'] = str(raw[pos:pos + description_length], 'utf-8')
+        pos += description_length + item_count * 4 + item_ids_length
+        if extra_length:
+            data.update(json.loads(bytes(raw[pos:pos + extra_length])))
+        return data
+    
+    @staticmethod
+    def _read_varint(raw, pos):
+        """Читает число переменной длины; возвращает (число, новая позиция)"""
+        result = 0
+        shift = 0
+        while True:
+            byte = raw[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+    
+    _V1_INTS = {ord('b'): struct.Struct('<b'), ord('h'): struct.Struct('<h'),
+                ord('i'): struct.Struct('<i'), ord('q'): struct.Struct('<q')}
+    _V1_FLOAT = struct.Struct('<d')
+    
+    def _decode_v1_value(self, raw, pos, keys):
+        """Читает значение универсального формата версии 1"""
+        tag = raw[pos]
+        pos += 1
+        if tag == 0x4E:  # N
+            return None, pos
+        if tag == 0x54:  # T
+            return True, pos
+        if tag == 0x46:  # F
+            return False, pos
+        if tag == 0x73:  # s
+            length, pos = self._read_varint(raw, pos)
+            return str(raw[pos:pos + length], 'utf-8'), pos + length
+        if tag == 0x6F:  # o
+            count, pos = self._read_varint(raw, pos)
+            result = {}
+            for _ in range(count):
+                key_index, pos = self._read_varint(raw, pos)
+                result[keys[key_index]], pos = self._decode_v1_value(raw, pos, keys)
+            return result, pos
+        if tag == 0x6C:  # l
+            count, pos = self._read_varint(raw, pos)
+            result = []
+            for _ in range(count):
+                item, pos = self._decode_v1_value(raw, pos, keys)
+                result.append(item)
+            return result, pos
+        if tag == 0x64:  # d
+            return self._V1_FLOAT.unpack_from(raw, pos)[0], pos + self._V1_FLOAT.size
+        if tag == 0x49:  # I
+            length, pos = self._read_varint(raw, pos)
+            return int(str(raw[pos:pos + length], 'ascii')), pos + length
+        packer = self._V1_INTS.get(tag)
+        if packer is not None:
+            return packer.unpack_from(raw, pos)[0], pos + packer.size
+        raise ValueError(f"Неизвестный тип значения в сохранении: {tag!r}")
+    
+    def _decode_v1(self, raw):
+        pos = self._HEADER.size
+        key_count, pos = self._read_varint(raw, pos)
+        keys = []
+        for _ in range(key_count):
+            length, pos = self._read_varint(raw, pos)
+            keys.append(str(raw[pos:pos + length], 'utf-8'))
+            pos += length
+        data, _ = self._decode_v1_value(raw, pos, keys)
+        return data
+    
+    def decode(self, raw):
+        """
+        Декодирует двоичное сохранение в словарь
+        
+        Args:
+            raw (bytes): Закодированные данные
+            
+        Returns:
+            dict: Данные сохранения
+        """
+        try:
+            magic, schema_version = self._HEADER.unpack_from(raw, 0)
+            if magic != self.MAGIC:
+                raise ValueError("Неверная сигнатура двоичного сохранения")
+            if schema_version == self.SCHEMA_VERSION:
+                return self._decode_record(raw)
+            if schema_version == 1:
+                return self._decode_v1(memoryview(raw))
+            raise ValueError(f"Неподдерживаемая версия схемы сохранения: {schema_version}")
+        except (IndexError, struct.error, UnicodeDecodeError, OverflowError) as e:
+            raise ValueError(f"Поврежденное двоичное сохранение: {e}")
+
+
+# Зарегистрированные кодеки сохранений
+SAVE_CODECS = {
+    JSONSaveCodec.name: JSONSaveCodec(),
+    BinarySaveCodec.name: BinarySaveCodec(),
+}
+
+
+def detect_save_codec(raw):
+    """
+    Определяет кодек сохранения по сигнатуре в начале данных
+    
+    Args:
+        raw (bytes): Содержимое файла сохранения
+        
+    Returns:
+        object: Кодек; если сигнатура не найдена - JSON-кодек
+    """
+    for codec in SAVE_CODECS.values():
+        magic = getattr(codec, 'MAGIC', None)
+        if magic and raw[:len(magic)] == magic:
+            return codec
+    return SAVE_CODECS[JSONSaveCodec.name]
+
+
+def benchmark_save_codecs(player_count=10000, repeat=3):
+    """
+    Сравнивает кодеки сохранений по размеру на диске и времени кодирования/декодирования.
+    Для честного сравнения добавлен компактный JSON (без отступов и пробелов)
+    
+    Args:
+        player_count (int): Количество игроков в тесте
+        repeat (int): Число повторов замера (берется лучшее время)
+        
+    Returns:
+        dict: Результаты по каждому кодеку
+    """
+    players = []
+    for i in range(player_count):
+        player = Player(f"Игрок_{i}", level=i % 100 + 1, health=100 - i % 50, position=(i * 1.5, -i * 0.25))
+        player.inventory = [{'id': f"item_{i % 37}", 'quantity': i % 5 + 1}]
+        player.play_time = i * 37
+        data = player.to_dict()
+        data['save_date'] = player.last_played.isoformat()
+        players.append(data)
+    
+    codecs = dict(SAVE_CODECS)
+    codecs['json_compact'] = JSONSaveCodec(indent=None)
+    
+    results = {}
+    for name, codec in codecs.items():
+        encode_time = decode_time = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            encoded = [codec.encode(data) for data in players]
+            encode_time = min(encode_time, time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            for raw in encoded:
+                detect_save_codec(raw).decode(raw)
+            decode_time = min(decode_time, time.perf_counter() - start)
+        
+        results[name] = {
+            'bytes': sum(len(raw) for raw in encoded),
+            'encode_time': encode_time,
+            'decode_time': decode_time
+        }
+        print(f"{name:>12}: {results[name]['bytes']:>10} байт, "
+              f"кодирование {encode_time:.3f} с, декодирование {decode_time:.3f} с")
+    
+    return results
+
+
+# Запись индекса сохранений: метаданные, достаточные для списка и сортировки
+SaveIndexEntry = namedtuple(
+    'SaveIndexEntry',
+    ['name', 'size', 'timestamp', 'level', 'description',
+     'player_count', 'npc_count', 'item_count', 'version', 'game_version'],
+    defaults=(0, 0.0, 0, '', 0, 0, 0, '', '')
+)
+
+
+class SaveIndex:
+    """
+    Постоянный индекс директории сохранений в файле, отображенном в память (mmap).
+    
+    Файл состоит из заголовка и записей фиксированного размера, поэтому
+    список, сортировка и фильтрация сохранений не открывают сами файлы сохранений.
+    Изменение записи транзакционно: новая версия пишется в свободный слот
+    и только потом помечается действующей, а старый слот освобождается.
+    
+    Один файл индекса могут открыть несколько объектов (и процессов). Каждая
+    операция берет блокировку файла (fcntl, где он есть), и после каждого
+    изменения растет счетчик поколений в заголовке. Если счетчик изменился,
+    таблица слотов перечитывается из файла.
+    """
+    MAGIC = b'GIDX'
+    VERSION = 2
+    INITIAL_CAPACITY = 16
+    
+    # сигнатура, версия, размер записи, число слотов, поколение
+    _HEADER = struct.Struct('<4sHHQQ')
+    _RECORD = struct.Struct('<BQ128s128sqdiiii16s16s')
+    _VALID = 1
+    
+    def __init__(self, directory, index_name="saves.idx"):
+        self.index_path = Path(directory) / index_name
+        self._lock = threading.RLock()
+        self._depth = 0  # Вложенность _locked: файл блокируется только на внешнем уровне
+        self._slots = {}  # имя сохранения -> (номер слота, seq)
+        self._free_slots = []
+        self._stale_slots = []
+        self._seq = 0
+        self._used = 0
+        self._generation = None
+        
+        self._file = open(self.index_path, 'a+b')
+        self.created = False
+        with self._locked(exclusive=True, sync=False):
+            self._file.seek(0)
+            header = self._file.read(self._HEADER.size)
+            if len(header) < self._HEADER.size or self._HEADER.unpack(header)[:3] != (self.MAGIC, self.VERSION, self._RECORD.size):
+                # Нового или устаревшего индекса нет смысла читать - его перестроят по директории
+                self._file.truncate(0)
+                self._file.write(self._HEADER.pack(self.MAGIC, self.VERSION, self._RECORD.size, 0, 0))
+                self._file.truncate(self._HEADER.size + self.INITIAL_CAPACITY * self._RECORD.size)
+                self._file.flush()
+                self.created = True
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            self._sync()
+    
+    @contextmanager
+    def _locked(self, exclusive=False, sync=True):
+        """Блокирует индекс в потоке и в файле и подтягивает чужие изменения"""
+        with self._lock:
+            outer = self._depth == 0
+            if outer and fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            self._depth += 1
+            try:
+                if outer and sync:
+                    self._sync()
+                yield
+            finally:
+                self._depth -= 1
+                if outer and fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+    
+    def _sync(self):
+        """Перечитывает таблицу слотов, если индекс изменил другой объект"""
+        file_size = os.fstat(self._file.fileno()).st_size
+        if file_size != len(self._map):
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        _, _, _, used, generation = self._HEADER.unpack_from(self._map, 0)
+        if generation == self._generation and used == self._used:
+            return
+        self._used = used
+        self._generation = generation
+        self._slots = {}
+        self._free_slots = []
+        self._stale_slots = []
+        self._load_slots()
+    
+    def _commit(self):
+        """Записывает заголовок с новым поколением после изменения индекса"""
+        for slot in self._stale_slots:
+            self._map[self._offset(slot)] = 0
+            self._free_slots.append(slot)
+        self._stale_slots = []
+        self._generation = (self._generation or 0) + 1
+        self._HEADER.pack_into(self._map, 0, self.MAGIC, self.VERSION, self._RECORD.size, self._used, self._generation)
+        self._map.flush()
+    
+    @property
+    def _capacity(self):
+        return (len(self._map) - self._HEADER.size) // self._RECORD.size
+    
+    def _offset(self, slot):
+        return self._HEADER.size + slot * self._RECORD.size
+    
+    def _load_slots(self):
+        """Строит словарь имя -> слот по записям индекса (файлы сохранений не читаются)"""
+        for slot in range(self._used):
+            offset = self._offset(slot)
+            if self._map[offset] != self._VALID:
+                self._free_slots.append(slot)
+                continue
+            seq = struct.unpack_from('<Q', self._map, offset + 1)[0]
+            name = self._decode_text(self._RECORD.unpack_from(self._map, offset)[2])
+            self._seq = max(self._seq, seq)
+            
+            previous = self._slots.get(name)
+            if previous is not None:
+                # Сбой между записью новой версии и освобождением старой:
+                # оставляем запись с большим номером, а слот другой освободит
+                # следующее изменение индекса (оно идет под монопольной блокировкой)
+                stale_slot = previous[0] if previous[1] < seq else slot
+                self._stale_slots.append(stale_slot)
+                if stale_slot == slot:
+                    continue
+            self._slots[name] = (slot, seq)
+    
+    @staticmethod
+    def _encode_text(text, size):
+        """Кодирует строку в UTF-8, обрезая ее по границе символа до size байт"""
+        encoded = text.encode('utf-8')
+        if len(encoded) > size:
+            encoded = encoded[:size].decode('utf-8', 'ignore').encode('utf-8')
+        return encoded
+    
+    @staticmethod
+    def _decode_text(raw):
+        return raw.rstrip(b'\0').decode('utf-8')
+    
+    def _take_free_slot(self):
+        """Возвращает номер свободного слота, при необходимости увеличивая файл"""
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self._used == self._capacity:
+            new_size = self._offset(self._capacity * 2)
+            self._map.close()
+            self._file.truncate(new_size)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        slot = self._used
+        self._used += 1
+        return slot
+    
+    def put(self, entry):
+        """
+        Добавляет или обновляет запись о сохранении
+        
+        Args:
+            entry (SaveIndexEntry): Метаданные сохранения
+        """
+        name = entry.name.encode('utf-8')
+        if len(name) > 128:
+            raise ValueError(f"Слишком длинное имя сохранения для индекса: {entry.name}")
+        
+        with self._locked(exclusive=True):
+            self._seq += 1
+            slot = self._take_free_slot()
+            offset = self._offset(slot)
+            # Пишем запись с пустым флагом, затем помечаем ее действующей
+            self._RECORD.pack_into(
+                self._map, offset, 0, self._seq, name,
+                self._encode_text(entry.description, 128),
+                entry.size, entry.timestamp, entry.level,
+                entry.player_count, entry.npc_count, entry.item_count,
+                self._encode_text(entry.version, 16),
+                self._encode_text(entry.game_version, 16)
+            )
+            self._map.flush()
+            self._map[offset] = self._VALID
+            
+            previous = self._slots.get(entry.name)
+            if previous is not None:
+                self._map[self._offset(previous[0])] = 0
+                self._free_slots.append(previous[0])
+            self._slots[entry.name] = (slot, self._seq)
+            self._commit()
+    
+    def remove(self, name):
+        """
+        Удаляет запись о сохранении
+        
+        Args:
+            name (str): Имя сохранения
+            
+        Returns:
+            bool: Была ли запись в индексе
+        """
+        with self._locked(exclusive=True):
+            previous = self._slots.pop(name, None)
+            if previous is None:
+                return False
+            self._map[self._offset(previous[0])] = 0
+            self._free_slots.append(previous[0])
+            self._commit()
+            return True
+    
+    def get(self, name):
+        """
+        Возвращает запись о сохранении
+        
+        Args:
+            name (str): Имя сохранения
+            
+        Returns:
+            SaveIndexEntry: Запись или None
+        """
+        with self._locked():
+            slot_info = self._slots.get(name)
+            if slot_info is None:
+                return None
+            return self._read_entry(slot_info[0])
+    
+    def _read_entry(self, slot):
+        (_, _, name, description, size, timestamp, level,
+         player_count, npc_count, item_count, version, game_version) = self._RECORD.unpack_from(self._map, self._offset(slot))
+        return SaveIndexEntry(
+            self._decode_text(name), size, timestamp, level, self._decode_text(description),
+            player_count, npc_count, item_count, self._decode_text(version), self._decode_text(game_version)
+        )
+    
+    def __contains__(self, name):
+        with self._locked():
+            return name in self._slots
+    
+    def __len__(self):
+        with self._locked():
+            return len(self._slots)
+    
+    def names(self):
+        """Возвращает имена всех проиндексированных сохранений"""
+        with self._locked():
+            return list(self._slots)
+    
+    def query(self, sort_by=None, reverse=False, predicate=None):
+        """
+        Возвращает записи индекса с фильтрацией и сортировкой
+        
+        Args:
+            sort_by (str): Поле SaveIndexEntry для сортировки (опционально)
+            reverse (bool): Сортировать по убыванию
+            predicate (callable): Фильтр записей (опционально)
+            
+        Returns:
+            list: Список записей SaveIndexEntry
+        """
+        with self._locked():
+            entries = [self._read_entry(slot) for slot, _ in self._slots.values()]
+        if predicate is not None:
+            entries = [entry for entry in entries if predicate(entry)]
+        if sort_by is not None:
+            entries.sort(key=lambda entry: getattr(entry, sort_by), reverse=reverse)
+        return entries
+    
+    def clear(self):
+        """Удаляет все записи индекса"""
+        with self._locked(exclusive=True):
+            for slot, _ in self._slots.values():
+                self._map[self._offset(slot)] = 0
+                self._free_slots.append(slot)
+            self._slots.clear()
+            self._commit()
+    
+    def close(self):
+        """Закрывает отображение индекса в память"""
+        with self._lock:
+            self._map.close()
+            self._file.close()
+
+
 class PlayerProgressManager:
     """
     Система управления сохранением и загрузкой прогресса игрока
     """
-    def __init__(self, saves_directory="saves"):
+    def __init__(self, saves_directory="saves", codec="json"):
         self.saves_directory = Path(saves_directory)
         self.saves_directory.mkdir(exist_ok=True)
+        self.codec = SAVE_CODECS[codec]  # Кодек для новых сохранений
+        self.index = SaveIndex(self.saves_directory)
+        self.sync_index()
     
-    def save_player_progress(self, player, save_name):
+    def _find_save_path(self, save_name):
         """
-        Сохраняет прогресс игрока в JSON-файл
+        Ищет файл сохранения среди расширений всех кодеков
+        
+        Args:
+            save_name (str): Имя сохранения
+            
+        Returns:
+            Path: Путь к файлу сохранения или None
+        """
+        for codec in SAVE_CODECS.values():
+            save_path = self.saves_directory / f"{save_name}{codec.extension}"
+            if save_path.exists():
+                return save_path
+        return None
+    
+    def _index_entry(self, save_name, player_data, size, save_date):
+        """Формирует запись индекса по данным сохранения игрока"""
+        return SaveIndexEntry(
+            name=save_name,
+            size=size,
+            timestamp=save_date.timestamp(),
+            level=player_data.get('level', 0),
+            description=player_data.get('description', player_data.get('name', ''))
+        )
+    
+    def _index_save(self, save_name):
+        """Читает файл сохранения и добавляет его в индекс"""
+        save_path = self._find_save_path(save_name)
+        if save_path is None:
+            return
+        try:
+            raw = save_path.read_bytes()
+            player_data = detect_save_codec(raw).decode(raw)
+            save_date = datetime.fromisoformat(player_data.get('save_date', player_data['last_played']))
+        except (OSError, ValueError, KeyError):
+            print(f"Ошибка чтения сохранения: {save_path}")
+            return
+        self.index.put(self._index_entry(save_name, player_data, len(raw), save_date))
+    
+    def rebuild_index(self):
+        """
+        Перестраивает индекс, читая все файлы сохранений в директории
+        """
+        self.index.clear()
+        for save_name in self._scan_save_names():
+            self._index_save(save_name)
+    
+    def sync_index(self):
+        """
+        Сверяет индекс со списком файлов в директории и исправляет расхождения
+        (читаются только файлы, которых нет в индексе)
+        """
+        on_disk = self._scan_save_names()
+        indexed = set(self.index.names())
+        for save_name in indexed - on_disk:
+            self.index.remove(save_name)
+        for save_name in on_disk - indexed:
+            self._index_save(save_name)
+    
+    def save_player_progress(self, player, save_name, description=""):
+        """
+        Сохраняет прогресс игрока в файл в формате выбранного кодека
         
         Args:
             player (object): Объект игрока
             save_name (str): Имя сохранения
+            description (str): Описание сохранения (опционально)
         """
-        save_path = self.saves_directory / f"{save_name}.json"
+        save_path = self.saves_directory / f"{save_name}{self.codec.extension}"
         
         # Подготовим данные игрока для сохранения
+        save_date = datetime.now()
         player_data = player.to_dict()
-        player_data['save_date'] = datetime.now().isoformat()
-        
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(player_data, f, indent=2, ensure_ascii=False)
+        player_data['save_date'] = save_date.isoformat()
+        if description:
+            player_data['description'] = description
+        
+        raw = self.codec.encode(player_data)
+        save_path.write_bytes(raw)
+        self.index.put(self._index_entry(save_name, player_data, len(raw), save_date))
+        
+        # Удаляем сохранение с тем же именем в другом формате
+        for codec in SAVE_CODECS.values():
+            if codec is not self.codec:
+                (self.saves_directory / f"{save_name}{codec.extension}").unlink(missing_ok=True)
     
     def load_player_progress(self, save_name):
         """
-        Загружает прогресс игрока из JSON-файла
+        Загружает прогресс игрока из файла; формат определяется по сигнатуре
         
         Args:
             save_name (str): Имя сохранения для загрузки
@@ -239,33 +1248,62 @@ class PlayerProgressManager:
         Returns:
             object: Загруженный объект игрока
         """
-        save_path = self.saves_directory / f"{save_name}.json"
+        save_path = self._find_save_path(save_name)
         
-        if not save_path.exists():
+        if save_path is None:
             return None
         
         try:
-            with open(save_path, 'r', encoding='utf-8') as f:
-                player_data = json.load(f)
+            raw = save_path.read_bytes()
+            player_data = detect_save_codec(raw).decode(raw)
             
             # Обновим время последней игры
-            player_data['last_played'] = datetime.now()
+            player_data['last_played'] = datetime.now().isoformat()
             
             return Player.from_dict(player_data)
-        except json.JSONDecodeError:
+        except ValueError:
             print(f"Ошибка чтения сохранения: {save_path}")
             return None
     
+    def _scan_save_names(self):
+        """Находит имена сохранений, просматривая директорию"""
+        save_names = set()
+        for codec in SAVE_CODECS.values():
+            save_names.update(f.stem for f in self.saves_directory.glob(f"*{codec.extension}"))  # Имя файла без расширения
+        return save_names
+    
     def list_saves(self):
         """
-        Возвращает список доступных сохранений
+        Возвращает список доступных сохранений (по индексу, сверенному с директорией)
         
         Returns:
             list: Список имен файлов сохранений
         """
-        save_files = list(self.saves_directory.glob("*.json"))
-        save_names = [f.stem for f in save_files]  # Имя файла без расширения
-        return sorted(save_names, reverse=True)  # Сортируем в обратном порядке (новые первыми)
+        self.sync_index()
+        return sorted(self.index.names(), reverse=True)  # Сортируем в обратном порядке (новые первыми)
+    
+    def list_save_entries(self, sort_by='timestamp', reverse=True, min_level=None, max_level=None):
+        """
+        Возвращает метаданные сохранений из индекса с сортировкой и фильтрацией
+        
+        Args:
+            sort_by (str): Поле для сортировки (timestamp, level, size, name)
+            reverse (bool): Сортировать по убыванию
+            min_level (int): Минимальный уровень игрока (опционально)
+            max_level (int): Максимальный уровень игрока (опционально)
+            
+        Returns:
+            list: Список записей SaveIndexEntry
+        """
+        def level_filter(entry):
+            if min_level is not None and entry.level < min_level:
+                return False
+            if max_level is not None and entry.level > max_level:
+                return False
+            return True
+        
+        self.sync_index()
+        return self.index.query(sort_by=sort_by, reverse=reverse, predicate=level_filter)
     
     def delete_save(self, save_name):
         """
@@ -274,9 +1312,10 @@ class PlayerProgressManager:
         Args:
             save_name (str): Имя сохранения для удаления
         """
-        save_path = self.saves_directory / f"{save_name}.json"
-        if save_path.exists():
+        save_path = self._find_save_path(save_name)
+        if save_path is not None:
             save_path.unlink()  # Удаляем файл
+            self.index.remove(save_name)
             return True
         return False
 
@@ -334,25 +1373,392 @@ class Player:
             position=tuple(data['position'])  # Преобразуем обратно в кортеж
         )
         
-        # Восстановим остальные атрибуты
-        player.max_health = data['max_health']
-        player.inventory = data['inventory']
-        player.stats = data['stats']
-        player.play_time = data['play_time']
-        player.creation_date = creation_date
-        player.last_played = last_played
+        # Восстановим остальные атрибуты
+        player.max_health = data['max_health']
+        player.inventory = data['inventory']
+        player.stats = data['stats']
+        player.play_time = data['play_time']
+        player.creation_date = creation_date
+        player.last_played = last_played
+        
+        return player
+
+
+class AssetCache:
+    """
+    Потокобезопасный LRU-кэш ассетов с ограничением по суммарному размеру в байтах.
+    Давно не использованные ассеты вытесняются, когда бюджет превышен.
+    """
+    def __init__(self, byte_budget=256 * 1024 * 1024):
+        self.byte_budget = byte_budget
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # ключ -> (ассет, размер)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def asset_size(asset):
+        """Оценивает размер ассета в байтах (строки - по длине в UTF-8)"""
+        data = asset.get('data') if isinstance(asset, dict) else asset
+        if isinstance(data, str):
+            return len(data.encode('utf-8'))
+        if isinstance(data, memoryview):
+            return data.nbytes
+        try:
+            return len(data)
+        except TypeError:
+            return 0
+    
+    def get(self, key, default=None):
+        """
+        Возвращает ассет из кэша и отмечает его как недавно использованный
+        
+        Args:
+            key (str): Ключ ассета
+            default: Значение, если ассета нет в кэше
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, asset):
+        """
+        Помещает ассет в кэш, вытесняя давно не использованные ассеты
+        
+        Args:
+            key (str): Ключ ассета
+            asset: Загруженный ассет
+            
+        Returns:
+            bool: Поместился ли ассет в бюджет
+        """
+        size = self.asset_size(asset)
+        if size > self.byte_budget:
+            return False
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (asset, size)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.byte_budget:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return True
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def __getitem__(self, key):
+        asset = self.get(key)
+        if asset is None:
+            raise KeyError(key)
+        return asset
+    
+    def __setitem__(self, key, asset):
+        self.put(key, asset)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def clear(self):
+        """Очищает кэш (счетчики сохраняются)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """
+        Возвращает статистику кэша
+        
+        Returns:
+            dict: Попадания, промахи, вытеснения, занятый объем и доля попаданий
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'byte_budget': self.byte_budget,
+                'hit_ratio': self.hits / requests if requests else 0.0
+            }
+
+
+def validate_schema_recursive(data, schema):
+    """
+    Проверяет данные по схеме рекурсивным обходом схемы (исходный алгоритм)
+    
+    Args:
+        data: Проверяемые данные
+        schema: Схема: словарь, список из одного элемента или имя типа
+            ("string", "number", "boolean", "object", "array" или имя типа Python)
+            
+    Returns:
+        bool: Соответствуют ли данные схеме
+    """
+    if isinstance(schema, dict):
+        if not isinstance(data, dict):
+            return False
+        
+        for key, value in schema.items():
+            if key not in data:
+                return False
+            if not validate_schema_recursive(data[key], value):
+                return False
+        return True
+    elif isinstance(schema, list) and len(schema) > 0:
+        if not isinstance(data, list):
+            return False
+        for item in data:
+            if not validate_schema_recursive(item, schema[0]):
+                return False
+        return True
+    elif schema == "string":
+        return isinstance(data, str)
+    elif schema == "number":
+        return isinstance(data, (int, float))
+    elif schema == "boolean":
+        return isinstance(data, bool)
+    elif schema == "object":
+        return isinstance(data, dict)
+    elif schema == "array":
+        return isinstance(data, list)
+    else:
+        return type(data).__name__ == schema
+
+
+# Проверки простых типов схемы
+_SCHEMA_TYPE_CHECKS = {
+    "string": str,
+    "number": (int, float),
+    "boolean": bool,
+    "object": dict,
+    "array": list,
+}
+
+# Скомпилированные схемы (LRU ограниченного размера):
+# каноническая запись схемы в JSON -> функция проверки.
+_SCHEMA_CACHE_SIZE = 256
+_COMPILED_SCHEMAS = OrderedDict()
+# Быстрый путь для повторных вызовов с тем же объектом схемы:
+# id(схемы) -> (схема, функция проверки). Схема хранится вместе с проверкой,
+# чтобы ее id не был переиспользован, пока запись в кэше.
+_COMPILED_SCHEMA_IDS = OrderedDict()
+_COMPILED_SCHEMAS_LOCK = threading.Lock()
+
+
+_MISSING = object()
+
+
+def _compile_schema_node(schema):
+    """
+    Компилирует узел схемы в одну функцию проверки.
+    Тип узла разбирается один раз при компиляции, а не при каждой проверке.
+    
+    Args:
+        schema: Узел схемы
+        
+    Returns:
+        callable: Проверка вида check(value) -> bool или None, если узел принимает любое значение
+    """
+    if isinstance(schema, dict):
+        return _compile_schema_dict(schema)
+    elif isinstance(schema, list) and len(schema) > 0:
+        item_check = _compile_schema_node(schema[0])
+        if item_check is None:
+            return lambda value: isinstance(value, list)
+        return lambda value: isinstance(value, list) and all(map(item_check, value))
+    elif schema == "any":
+        return None
+    elif isinstance(schema, str) and schema in _SCHEMA_TYPE_CHECKS:
+        expected_type = _SCHEMA_TYPE_CHECKS[schema]
+        return lambda value: isinstance(value, expected_type)
+    else:
+        return lambda value: type(value).__name__ == schema
+
+
+def _compile_schema_dict(schema):
+    """
+    Компилирует схему-словарь: проверки всех ключей выполняются в одном цикле,
+    а простые типы проверяются прямо в нем, без вызова вложенной функции
+    
+    Args:
+        schema (dict): Схема объекта
+        
+    Returns:
+        callable: Проверка объекта
+    """
+    type_checks = []  # (ключ, тип) - обязательные ключи простых типов
+    node_checks = []  # (ключ, проверка или None) - остальные обязательные ключи
+    optional_checks = []  # (ключ, проверка) - необязательные ключи
+    for key, value in schema.items():
+        if isinstance(key, str) and key.endswith('?'):
+            check = _compile_schema_node(value)
+            if check is not None:
+                optional_checks.append((key[:-1], check))
+        elif isinstance(value, str) and value in _SCHEMA_TYPE_CHECKS:
+            type_checks.append((key, _SCHEMA_TYPE_CHECKS[value]))
+        else:
+            node_checks.append((key, _compile_schema_node(value)))
+    type_checks = tuple(type_checks)
+    node_checks = tuple(node_checks)
+    optional_checks = tuple(optional_checks)
+    
+    def check_dict(value):
+        if not isinstance(value, dict):
+            return False
+        get = value.get
+        for key, expected_type in type_checks:
+            # Отсутствующий ключ дает _MISSING, который не подходит ни под один тип
+            if not isinstance(get(key, _MISSING), expected_type):
+                return False
+        for key, check in node_checks:
+            item = get(key, _MISSING)
+            if item is _MISSING or (check is not None and not check(item)):
+                return False
+        for key, check in optional_checks:
+            item = get(key, _MISSING)
+            if item is not _MISSING and not check(item):
+                return False
+        return True
+    
+    return check_dict
+
+
+def compile_schema(schema):
+    """
+    Компилирует схему в функцию проверки. Каждый узел схемы превращается
+    в замыкание один раз; проверки ключей объекта выполняются плоским циклом
+    по заранее подготовленному списку.
+    Результат хранится в LRU-кэше на _SCHEMA_CACHE_SIZE схем: по
+    идентичности объекта схемы и по ее канонической записи в JSON, поэтому
+    повторная проверка с той же (или равной) схемой не обходит ее заново,
+    а кэш не растет при вызовах с новыми литералами схем.
+    
+    Кроме типов validate_schema_recursive поддерживаются тип "any"
+    и необязательные ключи с суффиксом "?" (например, "players?").
+    
+    Args:
+        schema: Схема данных
+        
+    Returns:
+        callable: Проверка вида check(data) -> bool
+    """
+    schema_id = id(schema)
+    with _COMPILED_SCHEMAS_LOCK:
+        cached = _COMPILED_SCHEMA_IDS.get(schema_id)
+        if cached is not None and cached[0] is schema:
+            _COMPILED_SCHEMA_IDS.move_to_end(schema_id)
+            return cached[1]
+    
+    key = json.dumps(schema, sort_keys=True)
+    with _COMPILED_SCHEMAS_LOCK:
+        check = _COMPILED_SCHEMAS.get(key)
+        if check is not None:
+            _COMPILED_SCHEMAS.move_to_end(key)
+    
+    if check is None:
+        check = _compile_schema_node(schema)
+        if check is None:
+            check = lambda data: True
+    
+    with _COMPILED_SCHEMAS_LOCK:
+        _COMPILED_SCHEMAS[key] = check
+        _COMPILED_SCHEMAS.move_to_end(key)
+        _COMPILED_SCHEMA_IDS[schema_id] = (schema, check)
+        _COMPILED_SCHEMA_IDS.move_to_end(schema_id)
+        for cache in (_COMPILED_SCHEMAS, _COMPILED_SCHEMA_IDS):
+            while len(cache) > _SCHEMA_CACHE_SIZE:
+                cache.popitem(last=False)
+    return check
+
+
+def validate_schema(data, schema):
+    """
+    Проверяет данные по скомпилированной схеме за один проход с ранним выходом
+    
+    Args:
+        data: Проверяемые данные
+        schema: Схема данных
+        
+    Returns:
+        bool: Соответствуют ли данные схеме
+    """
+    return compile_schema(schema)(data)
+
+
+def benchmark_schema_validation(record_count=100000):
+    """
+    Сравнивает скорость рекурсивной и скомпилированной проверки схемы ассетов
+    
+    Args:
+        record_count (int): Количество записей ассетов
         
-        return player
+    Returns:
+        dict: Время проверки и число записей в секунду для каждого способа
+    """
+    schema = {
+        "id": "string",
+        "path": "string",
+        "size": "number",
+        "streaming": "boolean",
+        "tags": ["string"],
+        "metadata": {"author": "string", "version": "number"}
+    }
+    records = [
+        {
+            "id": f"asset_{i}",
+            "path": f"textures/asset_{i}.png",
+            "size": i * 16,
+            "streaming": i % 2 == 0,
+            "tags": ["terrain", "hd"],
+            "metadata": {"author": "studio", "version": i % 7}
+        }
+        for i in range(record_count)
+    ]
+    
+    results = {}
+    for name, validate in (("recursive", validate_schema_recursive), ("compiled", validate_schema)):
+        # Берем лучший из трех прогонов, чтобы уменьшить влияние шума
+        elapsed = float('inf')
+        for _ in range(3):
+            valid = 0
+            start = time.perf_counter()
+            for record in records:
+                if validate(record, schema):
+                    valid += 1
+            elapsed = min(elapsed, time.perf_counter() - start)
+        results[name] = {'seconds': elapsed, 'records_per_second': record_count / elapsed, 'valid': valid}
+        print(f"{name:>9}: {elapsed:.3f} с, {record_count / elapsed:,.0f} записей/с")
+    
+    return results
 
 
 class AssetManager:
     """
     Система загрузки игровых ассетов из JSON-файлов
     """
-    def __init__(self, assets_directory="assets"):
+    def __init__(self, assets_directory="assets", cache=None, byte_budget=256 * 1024 * 1024):
         self.assets_directory = Path(assets_directory)
-        self.loaded_assets = {}
+        # Кэш может быть общим для нескольких менеджеров ассетов
+        self.loaded_assets = cache if cache is not None else AssetCache(byte_budget)
         self.asset_manifests = {}
+        self._inflight = {}  # ключ -> Future загрузки, которая уже выполняется
+        self._inflight_lock = threading.Lock()
     
     def load_asset_manifest(self, manifest_file):
         """
@@ -381,6 +1787,75 @@ class AssetManager:
             print(f"Ошибка чтения JSON из файла: {manifest_path}")
             return {}
     
+    def read_asset_file(self, asset_path):
+        """
+        Читает и декодирует файл ассета в зависимости от его типа
+        
+        Args:
+            asset_path (Path): Путь к файлу ассета
+            
+        Returns:
+            object: Данные ассета
+        """
+        if asset_path.suffix.lower() in ['.obj', '.fbx', '.dae', '.gltf']:
+            # Загрузка 3D модели
+            with open(asset_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        elif asset_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.bmp', '.tga']:
+            # Загрузка текстуры (в реальном приложении это будет бинарные данные)
+            with open(asset_path, 'rb') as f:
+                return f.read()
+        elif asset_path.suffix.lower() in ['.wav', '.mp3', '.ogg']:
+            # Загрузка звука (в реальном приложении это будет бинарные данные)
+            with open(asset_path, 'rb') as f:
+                return f.read()
+        else:
+            # Для других файлов просто читаем как текст
+            with open(asset_path, 'r', encoding='utf-8') as f:
+                return f.read()
+    
+    def _load_into_cache(self, cache_key, asset_info):
+        """
+        Загружает ассет и кладет его в кэш; одновременные запросы одного ассета
+        ждут одну и ту же загрузку
+        
+        Args:
+            cache_key (str): Ключ ассета в кэше
+            asset_info (dict): Информация об ассете из манифеста
+            
+        Returns:
+            dict: Загруженный ассет или None
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            asset_path = self.assets_directory / asset_info['path']
+            if asset_path.exists():
+                asset = {
+                    'data': self.read_asset_file(asset_path),
+                    'info': asset_info
+                }
+                self.loaded_assets.put(cache_key, asset)
+            else:
+                print(f"Файл ассета не найден: {asset_path}")
+                asset = None
+            future.set_result(asset)
+            return asset
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+    
     def load_asset(self, asset_type, asset_name):
         """
         Загружает указанный ассет
@@ -394,48 +1869,60 @@ class AssetManager:
         """
         # Проверяем, загружен ли ассет в кэш
         cache_key = f"{asset_type}:{asset_name}"
-        if cache_key in self.loaded_assets:
-            return self.loaded_assets[cache_key]
+        cached_asset = self.loaded_assets.get(cache_key)
+        if cached_asset is not None:
+            return cached_asset
         
         # Ищем информацию об ассете в манифестах
         for manifest in self.asset_manifests.values():
             if asset_type in manifest and asset_name in manifest[asset_type]:
-                asset_info = manifest[asset_type][asset_name]
-                asset_path = self.assets_directory / asset_info['path']
-                
-                if asset_path.exists():
-                    # Загружаем ассет в зависимости от типа
-                    if asset_path.suffix.lower() in ['.obj', '.fbx', '.dae', '.gltf']:
-                        # Загрузка 3D модели
-                        with open(asset_path, 'r', encoding='utf-8') as f:
-                            asset_data = f.read()
-                    elif asset_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.bmp', '.tga']:
-                        # Загрузка текстуры (в реальном приложении это будет бинарные данные)
-                        with open(asset_path, 'rb') as f:
-                            asset_data = f.read()
-                    elif asset_path.suffix.lower() in ['.wav', '.mp3', '.ogg']:
-                        # Загрузка звука (в реальном приложении это будет бинарные данные)
-                        with open(asset_path, 'rb') as f:
-                            asset_data = f.read()
-                    else:
-                        # Для других файлов просто читаем как текст
-                        with open(asset_path, 'r', encoding='utf-8') as f:
-                            asset_data = f.read()
-                    
-                    # Сохраняем в кэш
-                    self.loaded_assets[cache_key] = {
-                        'data': asset_data,
-                        'info': asset_info
-                    }
-                    
-                    return self.loaded_assets[cache_key]
-                else:
-                    print(f"Файл ассета не найден: {asset_path}")
-                    return None
+                return self._load_into_cache(cache_key, manifest[asset_type][asset_name])
         
         print(f"Ассет не найден: {asset_type}/{asset_name}")
         return None
     
+    def preload_assets(self, manifest, max_workers=4, wait=True):
+        """
+        Загружает ассеты манифеста в кэш параллельно в пуле потоков.
+        Ассеты с большим значением 'priority' загружаются первыми.
+        
+        Args:
+            manifest (dict): Манифест из load_asset_manifest
+            max_workers (int): Количество потоков загрузки
+            wait (bool): Дождаться ли окончания загрузки
+            
+        Returns:
+            list: Объекты Future для каждой загрузки
+        """
+        jobs = []
+        for asset_type, assets in manifest.items():
+            if not isinstance(assets, dict):
+                continue
+            for asset_name, asset_info in assets.items():
+                if isinstance(asset_info, dict) and 'path' in asset_info:
+                    jobs.append((asset_info.get('priority', 0), f"{asset_type}:{asset_name}", asset_info))
+        
+        # Пул выполняет задачи в порядке отправки, поэтому сортируем по приоритету
+        jobs.sort(key=lambda job: job[0], reverse=True)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset-preload")
+        futures = [
+            executor.submit(self._load_into_cache, cache_key, asset_info)
+            for _, cache_key, asset_info in jobs
+            if cache_key not in self.loaded_assets
+        ]
+        executor.shutdown(wait=wait)
+        return futures
+    
+    def cache_stats(self):
+        """
+        Возвращает статистику кэша ассетов
+        
+        Returns:
+            dict: Попадания, промахи, вытеснения и занятый объем
+        """
+        return self.loaded_assets.stats()
+    
     def get_asset_info(self, asset_type, asset_name):
         """
         Возвращает информацию об ассете
@@ -464,38 +1951,7 @@ class AssetManager:
         Returns:
             bool: Соответствует ли ассет схеме
         """
-        def check_schema(data, schema):
-            if isinstance(schema, dict):
-                if not isinstance(data, dict):
-                    return False
-                
-                for key, value in schema.items():
-                    if key not in data:
-                        return False
-                    if not check_schema(data[key], value):
-                        return False
-                return True
-            elif isinstance(schema, list) and len(schema) > 0:
-                if not isinstance(data, list):
-                    return False
-                for item in data:
-                    if not check_schema(item, schema[0]):
-                        return False
-                return True
-            elif schema == "string":
-                return isinstance(data, str)
-            elif schema == "number":
-                return isinstance(data, (int, float))
-            elif schema == "boolean":
-                return isinstance(data, bool)
-            elif schema == "object":
-                return isinstance(data, dict)
-            elif schema == "array":
-                return isinstance(data, list)
-            else:
-                return type(data).__name__ == schema
-        
-        return check_schema(asset_data, expected_schema)
+        return validate_schema(asset_data, expected_schema)
 
 
 class QuestSystem:
@@ -645,6 +2101,215 @@ class QuestSystem:
         return active_quests_info
 
 
+@lru_cache(maxsize=4096)
+def parse_version(version):
+    """
+    Преобразует строку версии X.Y.Z в кортеж чисел (результат кэшируется)
+    
+    Args:
+        version (str): Версия
+        
+    Returns:
+        tuple: Кортеж чисел; кортежи сравниваются так же, как compare_versions
+    """
+    return tuple(int(x) for x in version.split('.'))
+
+
+class ModDependencyResolver:
+    """
+    Граф зависимостей модов с инкрементальным обновлением.
+    
+    Конфигурации модов кэшируются по времени изменения и размеру файла,
+    поэтому повторное сканирование разбирает только измененные моды.
+    Порядок загрузки (топологическая сортировка) вычисляется один раз
+    и сбрасывается только при изменении набора модов.
+    """
+    def __init__(self, mods_directory, config_name, parse_config):
+        self.mods_directory = Path(mods_directory)
+        self.config_name = config_name
+        self.parse_config = parse_config  # путь -> (конфигурация, описание мода)
+        self.mods = {}  # ID мода -> описание мода
+        self._entries = {}  # имя директории -> запись кэша
+        self._load_order = None
+    
+    def _describe(self, descriptor, directory):
+        """Дополняет описание мода каталогом и кортежами зависимостей и конфликтов"""
+        descriptor = dict(descriptor)
+        descriptor['directory'] = directory
+        descriptor['dependencies'] = tuple(descriptor.get('dependencies') or ())
+        descriptor['conflicts'] = tuple(descriptor.get('conflicts') or ())
+        return descriptor
+    
+    def _refresh_entry(self, directory, report):
+        """Перечитывает конфигурацию одного мода, если файл изменился с прошлого разбора"""
+        config_path = directory / self.config_name
+        previous = self._entries.get(directory.name)
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            if previous is None or previous['key'] is not None:
+                report['missing_config'].append(directory.name)
+                if previous is not None and previous['mod_id'] is not None:
+                    self.mods.pop(previous['mod_id'], None)
+                    report['removed'].append(previous['mod_id'])
+            self._entries[directory.name] = {'key': None, 'mod_id': None, 'config': None}
+            return
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        if previous is not None and previous['key'] == key:
+            return  # Конфигурация не менялась - разбор не нужен
+        
+        if previous is not None and previous['mod_id'] is not None:
+            self.mods.pop(previous['mod_id'], None)
+        try:
+            config, descriptor = self.parse_config(config_path)
+            descriptor = self._describe(descriptor, directory)
+        except (ValueError, KeyError, TypeError):
+            report['errors'].append(directory.name)
+            if previous is not None and previous['mod_id'] is not None:
+                report['removed'].append(previous['mod_id'])
+            self._entries[directory.name] = {'key': key, 'mod_id': None, 'config': None}
+            return
+        
+        mod_id = descriptor['id']
+        self.mods[mod_id] = descriptor
+        self._entries[directory.name] = {'key': key, 'mod_id': mod_id, 'config': config}
+        if previous is not None and previous['mod_id'] == mod_id:
+            report['changed'].append(mod_id)
+        else:
+            if previous is not None and previous['mod_id'] is not None:
+                report['removed'].append(previous['mod_id'])
+            report['added'].append(mod_id)
+    
+    def _new_report(self):
+        """Пустой отчет об изменениях"""
+        return {'added': [], 'changed': [], 'removed': [], 'missing_config': [], 'errors': []}
+    
+    def _finish(self, report):
+        """Сбрасывает кэш порядка загрузки, только если набор модов изменился"""
+        if report['added'] or report['changed'] or report['removed']:
+            self._load_order = None
+        return report
+    
+    def refresh(self):
+        """
+        Обновляет кэш по директории модов, разбирая только новые и измененные конфигурации
+        
+        Returns:
+            dict: {'added': [...], 'changed': [...], 'removed': [...], 'missing_config': [...], 'errors': [...]}
+        """
+        report = self._new_report()
+        seen = set()
+        
+        with os.scandir(self.mods_directory) as it:
+            for dir_entry in it:
+                if dir_entry.is_dir():
+                    seen.add(dir_entry.name)
+                    self._refresh_entry(Path(dir_entry.path), report)
+        
+        for name in list(self._entries):
+            if name not in seen:
+                entry = self._entries.pop(name)
+                if entry['mod_id'] is not None:
+                    self.mods.pop(entry['mod_id'], None)
+                    report['removed'].append(entry['mod_id'])
+        
+        return self._finish(report)
+    
+    def refresh_mod(self, mod_id):
+        """
+        Перепроверяет конфигурацию одного мода без сканирования всей директории
+        
+        Args:
+            mod_id (str): ID мода
+            
+        Returns:
+            dict: Отчет в формате refresh()
+        """
+        report = self._new_report()
+        descriptor = self.mods.get(mod_id)
+        if descriptor is not None:
+            self._refresh_entry(descriptor['directory'], report)
+        return self._finish(report)
+    
+    def get_config(self, mod_id):
+        """
+        Возвращает разобранную конфигурацию мода из кэша
+        
+        Args:
+            mod_id (str): ID мода
+        """
+        descriptor = self.mods.get(mod_id)
+        if descriptor is None:
+            return None
+        return self._entries[descriptor['directory'].name]['config']
+    
+    def dependents(self, mod_id):
+        """
+        Возвращает моды, которые напрямую зависят от указанного мода
+        
+        Args:
+            mod_id (str): ID мода
+        """
+        return [other_id for other_id, descriptor in self.mods.items() if mod_id in descriptor['dependencies']]
+    
+    def load_order(self):
+        """
+        Возвращает порядок загрузки модов: зависимости загружаются раньше зависимых модов.
+        Результат кэшируется до следующего изменения набора модов.
+        
+        Returns:
+            tuple: (список ID модов в порядке загрузки, список ошибок)
+        """
+        if self._load_order is not None:
+            return list(self._load_order[0]), list(self._load_order[1])
+        
+        errors = []
+        in_degree = {mod_id: 0 for mod_id in self.mods}
+        dependents = {mod_id: [] for mod_id in self.mods}
+        for mod_id, descriptor in self.mods.items():
+            for dependency in descriptor['dependencies']:
+                if dependency not in self.mods:
+                    errors.append(f"Мод {mod_id}: отсутствует зависимость {dependency}")
+                    continue
+                in_degree[mod_id] += 1
+                dependents[dependency].append(mod_id)
+            for conflict in descriptor['conflicts']:
+                # Каждую пару конфликтующих модов сообщаем один раз
+                if conflict in self.mods and (mod_id < conflict or mod_id not in self.mods[conflict]['conflicts']):
+                    errors.append(f"Конфликт модов: {mod_id} и {conflict}")
+        
+        # Алгоритм Кана; куча дает детерминированный порядок среди независимых модов
+        ready = [mod_id for mod_id, degree in in_degree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            mod_id = heapq.heappop(ready)
+            order.append(mod_id)
+            for dependent in dependents[mod_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+        
+        if len(order) < len(self.mods):
+            # Отсекаем моды, которые лишь зависят от цикла, но сами в него не входят
+            remaining = {mod_id for mod_id, degree in in_degree.items() if degree > 0}
+            pruned = True
+            while pruned:
+                pruned = False
+                for mod_id in list(remaining):
+                    if not any(dependent in remaining for dependent in dependents[mod_id]):
+                        remaining.discard(mod_id)
+                        pruned = True
+            errors.append(f"Циклические зависимости между модами: {', '.join(sorted(remaining))}")
+            blocked = sorted(mod_id for mod_id, degree in in_degree.items() if degree > 0 and mod_id not in remaining)
+            if blocked:
+                errors.append(f"Моды не могут быть загружены из-за циклических зависимостей: {', '.join(blocked)}")
+        
+        self._load_order = (order, errors)
+        return list(order), list(errors)
+
+
 class ModManager:
     """
     Система управления модами с JSON-конфигурацией
@@ -654,39 +2319,82 @@ class ModManager:
         self.installed_mods = {}
         self.enabled_mods = []
         self.mod_dependencies = {}
+        self.resolver = ModDependencyResolver(self.mods_directory, "mod.json", self._parse_mod_config)
+    
+    @staticmethod
+    def _parse_mod_config(config_path):
+        """
+        Разбирает mod.json в конфигурацию и описание мода для графа зависимостей
+        
+        Args:
+            config_path (Path): Путь к mod.json
+            
+        Returns:
+            tuple: (конфигурация, описание мода)
+        """
+        with open(config_path, 'r', encoding='utf-8') as f:
+            mod_config = json.load(f)
+        
+        descriptor = {
+            'id': mod_config['id'],
+            'name': mod_config.get('name', mod_config['id']),
+            'dependencies': mod_config.get('dependencies', []),
+            'conflicts': mod_config.get('conflicts', []),
+            'game_version_min': mod_config.get('game_version_min'),
+            'game_version_max': mod_config.get('game_version_max')
+        }
+        return mod_config, descriptor
     
     def scan_mods(self):
         """
-        Сканирует директорию на наличие модов и загружает их конфигурацию
+        Сканирует директорию на наличие модов и загружает их конфигурацию.
+        Повторное сканирование разбирает только новые и измененные mod.json.
         """
-        for mod_dir in self.mods_directory.iterdir():
-            if mod_dir.is_dir():
-                config_path = mod_dir / "mod.json"
-                if config_path.exists():
-                    try:
-                        with open(config_path, 'r', encoding='utf-8') as f:
-                            mod_config = json.load(f)
-                        
-                        mod_id = mod_config['id']
-                        self.installed_mods[mod_id] = {
-                            'config': mod_config,
-                            'directory': mod_dir,
-                            'enabled': False
-                        }
-                        
-                        # Сохраняем зависимости
-                        if 'dependencies' in mod_config:
-                            self.mod_dependencies[mod_id] = mod_config['dependencies']
-                        
-                        print(f"Найден мод: {mod_config['name']} (ID: {mod_id})")
-                    except json.JSONDecodeError:
-                        print(f"Ошибка чтения конфигурации мода: {mod_dir.name}")
-                else:
-                    print(f"Конфигурационный файл не найден для мода: {mod_dir.name}")
+        report = self.resolver.refresh()
+        self._apply_resolver_report(report)
+        
+        for name in report['errors']:
+            print(f"Ошибка чтения конфигурации мода: {name}")
+        for name in report['missing_config']:
+            print(f"Конфигурационный файл не найден для мода: {name}")
+    
+    def _apply_resolver_report(self, report):
+        """Переносит изменения из графа зависимостей в installed_mods"""
+        for mod_id in report['removed']:
+            self.installed_mods.pop(mod_id, None)
+            self.mod_dependencies.pop(mod_id, None)
+            if mod_id in self.enabled_mods:
+                self.enabled_mods.remove(mod_id)
+        
+        for mod_id in report['added'] + report['changed']:
+            descriptor = self.resolver.mods[mod_id]
+            previous = self.installed_mods.get(mod_id)
+            self.installed_mods[mod_id] = {
+                'config': self.resolver.get_config(mod_id),
+                'directory': descriptor['directory'],
+                'enabled': previous['enabled'] if previous else False
+            }
+            
+            # Сохраняем зависимости
+            if descriptor['dependencies']:
+                self.mod_dependencies[mod_id] = list(descriptor['dependencies'])
+            else:
+                self.mod_dependencies.pop(mod_id, None)
+            
+            print(f"Найден мод: {descriptor['name']} (ID: {mod_id})")
+    
+    def get_load_order(self):
+        """
+        Возвращает порядок загрузки установленных модов с учетом зависимостей
+        
+        Returns:
+            tuple: (список ID модов в порядке загрузки, список ошибок)
+        """
+        return self.resolver.load_order()
     
     def load_mod_config(self, mod_id):
         """
-        Загружает конфигурацию мода из JSON-файла
+        Загружает конфигурацию мода из JSON-файла (из кэша, если файл не менялся)
         
         Args:
             mod_id (str): ID мода
@@ -695,15 +2403,17 @@ class ModManager:
             return None
         
         config_path = self.installed_mods[mod_id]['directory'] / "mod.json"
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
+        report = self.resolver.refresh_mod(mod_id)
+        self._apply_resolver_report(report)
+        if report['missing_config']:
             print(f"Конфигурационный файл мода не найден: {config_path}")
             return None
-        except json.JSONDecodeError:
+        if report['errors']:
             print(f"Ошибка чтения JSON-конфигурации мода: {config_path}")
             return None
+        
+        config = self.resolver.get_config(mod_id)
+        return copy.deepcopy(config) if config is not None else None
     
     def validate_mod_compatibility(self, mod_id):
         """
@@ -756,21 +2466,10 @@ class ModManager:
         Returns:
             int: -1 если version1 < version2, 0 если равны, 1 если version1 > version2
         """
-        v1_parts = [int(x) for x in version1.split('.')]
-        v2_parts = [int(x) for x in version2.split('.')]
-        
-        for i in range(min(len(v1_parts), len(v2_parts))):
-            if v1_parts[i] < v2_parts[i]:
-                return -1
-            elif v1_parts[i] > v2_parts[i]:
-                return 1
-        
-        if len(v1_parts) < len(v2_parts):
-            return -1
-        elif len(v1_parts) > len(v2_parts):
-            return 1
-        else:
-            return 0
+        # Кортежи сравниваются поэлементно, а более короткий префикс считается меньше
+        v1_parts = parse_version(version1)
+        v2_parts = parse_version(version2)
+        return (v1_parts > v2_parts) - (v1_parts < v2_parts)
     
     def enable_mod(self, mod_id):
         """
@@ -815,6 +2514,297 @@ class ModManager:
         return False
 
 
+# Регулярные выражения для быстрого поиска границ JSON-значений в байтовом буфере
+_JSON_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_JSON_STRING_SPECIAL = re.compile(rb'["\\]')
+_JSON_SCALAR_END = re.compile(rb'[,\]}\s]')
+_JSON_WHITESPACE = b' \t\r\n'
+
+
+class StreamingJSONReader:
+    """
+    Потоковый читатель JSON: разбирает файл блоками, не загружая его целиком.
+    
+    Читатель работает как курсор: iter_object/iter_array выдают ключи или индексы,
+    а значение под курсором вызывающий код обязан прочитать (read_value),
+    пропустить (skip_value) или обойти вложенным iter_object/iter_array
+    до перехода к следующему элементу.
+    """
+    def __init__(self, file, chunk_size=64 * 1024):
+        self.file = file  # Файл должен быть открыт в бинарном режиме
+        self.chunk_size = chunk_size
+        self._buf = b''
+        self._pos = 0
+        self._base = file.tell()  # Смещение начала буфера в файле
+    
+    @property
+    def offset(self):
+        """Текущая позиция курсора в файле (в байтах)"""
+        return self._base + self._pos
+    
+    def _fill(self):
+        """
+        Дочитывает следующий блок файла в буфер.
+        Уже разобранная часть буфера (до курсора) отбрасывается.
+        
+        Returns:
+            int: На сколько байт сдвинулось начало буфера, или -1 в конце файла
+        """
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            return -1
+        dropped = self._pos
+        self._base += dropped
+        self._buf = self._buf[dropped:] + chunk
+        self._pos = 0
+        return dropped
+    
+    def peek(self):
+        """
+        Пропускает пробельные символы и возвращает следующий байт, не сдвигая курсор
+        
+        Returns:
+            bytes: Следующий значащий символ
+        """
+        while True:
+            buf = self._buf
+            n = len(buf)
+            i = self._pos
+            while i < n and buf[i] in _JSON_WHITESPACE:
+                i += 1
+            self._pos = i
+            if i < n:
+                return buf[i:i + 1]
+            if self._fill() < 0:
+                raise ValueError("Неожиданный конец JSON")
+    
+    def expect(self, token):
+        """
+        Проверяет, что следующий символ совпадает с ожидаемым, и пропускает его
+        
+        Args:
+            token (bytes): Ожидаемый символ
+        """
+        if self.peek() != token:
+            raise ValueError(f"Ожидался {token.decode()!r} на позиции {self.offset}")
+        self._pos += 1
+    
+    def _scan_value(self, keep=True):
+        """
+        Находит конец JSON-значения под курсором, не разбирая его
+        
+        Args:
+            keep (bool): Сохранять ли байты значения в буфере (False при пропуске)
+            
+        Returns:
+            int: Индекс конца значения в буфере
+        """
+        self.peek()
+        i = self._pos
+        depth = 0
+        in_string = False
+        while True:
+            buf = self._buf
+            n = len(buf)
+            while i < n:
+                if in_string:
+                    match = _JSON_STRING_SPECIAL.search(buf, i)
+                    if match is None:
+                        i = n
+                        break
+                    i = match.end()
+                    if match.group() == b'\\':
+                        if i >= n:
+                            # Экранированный символ еще не прочитан
+                            i -= 1
+                            break
+                        i += 1
+                        continue
+                    in_string = False
+                    if depth == 0:
+                        return i
+                elif depth == 0:
+                    ch = buf[i]
+                    if ch == 0x22:  # '"'
+                        in_string = True
+                        i += 1
+                    elif ch in b'{[':
+                        depth = 1
+                        i += 1
+                    else:
+                        # Число, true, false или null
+                        match = _JSON_SCALAR_END.search(buf, i)
+                        if match is not None:
+                            return match.start()
+                        i = n
+                else:
+                    match = _JSON_STRUCTURAL.search(buf, i)
+                    if match is None:
+                        i = n
+                        break
+                    i = match.end()
+                    token = match.group()
+                    if token == b'"':
+                        in_string = True
+                    elif token in (b'{', b'['):
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            return i
+            
+            if not keep:
+                # При пропуске значения прочитанные байты больше не нужны
+                self._pos = i
+            dropped = self._fill()
+            if dropped < 0:
+                if depth == 0 and not in_string and i > self._pos:
+                    return len(self._buf)  # Скаляр в самом конце файла
+                raise ValueError("Неожиданный конец JSON")
+            i -= dropped
+    
+    def read_value(self):
+        """
+        Читает и разбирает JSON-значение под курсором
+        
+        Returns:
+            object: Разобранное значение
+        """
+        end = self._scan_value()
+        raw = self._buf[self._pos:end]
+        self._pos = end
+        return json.loads(raw)
+    
+    def skip_value(self):
+        """
+        Пропускает JSON-значение под курсором без разбора и без накопления в памяти
+        
+        Returns:
+            tuple: (начало, конец) значения в файле в байтах
+        """
+        self.peek()
+        start = self.offset
+        self._pos = self._scan_value(keep=False)
+        return start, self.offset
+    
+    def iter_object(self):
+        """
+        Перебирает ключи JSON-объекта под курсором
+        
+        Yields:
+            str: Ключ, значение которого находится под курсором
+        """
+        self.expect(b'{')
+        if self.peek() == b'}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(b':')
+            yield key
+            if self.peek() == b',':
+                self._pos += 1
+            else:
+                self.expect(b'}')
+                return
+    
+    def iter_array(self):
+        """
+        Перебирает элементы JSON-массива под курсором
+        
+        Yields:
+            int: Индекс элемента, который находится под курсором
+        """
+        self.expect(b'[')
+        if self.peek() == b']':
+            self._pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.peek() == b',':
+                self._pos += 1
+            else:
+                self.expect(b']')
+                return
+
+
+class LazyWorldState(Mapping):
+    """
+    Ленивое состояние мира: раздел разбирается из файла только при первом обращении
+    """
+    def __init__(self, save_path, offsets, chunk_size=64 * 1024):
+        self.save_path = Path(save_path)
+        self.chunk_size = chunk_size
+        self._offsets = offsets  # раздел -> (начало, конец) в байтах
+        self._loaded = {}
+    
+    def __getitem__(self, section):
+        if section not in self._loaded:
+            start, end = self._offsets[section]
+            with open(self.save_path, 'rb') as f:
+                f.seek(start)
+                self._loaded[section] = json.loads(f.read(end - start))
+        return self._loaded[section]
+    
+    def __iter__(self):
+        return iter(self._offsets)
+    
+    def __len__(self):
+        return len(self._offsets)
+    
+    def is_loaded(self, section):
+        """Проверяет, был ли раздел уже разобран"""
+        return section in self._loaded
+    
+    def unload(self, section=None):
+        """
+        Освобождает память, занятую разобранными разделами
+        
+        Args:
+            section (str): Раздел для выгрузки (по умолчанию - все разделы)
+        """
+        if section is None:
+            self._loaded.clear()
+        else:
+            self._loaded.pop(section, None)
+    
+    def iter_section(self, section):
+        """
+        Потоково перебирает элементы раздела, не разбирая его целиком
+        
+        Args:
+            section (str): Имя раздела
+            
+        Yields:
+            tuple: (ключ или индекс, значение)
+        """
+        start, _ = self._offsets[section]
+        with open(self.save_path, 'rb') as f:
+            f.seek(start)
+            reader = StreamingJSONReader(f, self.chunk_size)
+            yield from _iter_json_container(reader)
+
+
+def _iter_json_container(reader):
+    """
+    Перебирает элементы массива или объекта под курсором читателя
+    
+    Yields:
+        tuple: (индекс или ключ, значение); для скаляра - (None, значение)
+    """
+    token = reader.peek()
+    if token == b'[':
+        for index in reader.iter_array():
+            yield index, reader.read_value()
+    elif token == b'{':
+        for key in reader.iter_object():
+            yield key, reader.read_value()
+    else:
+        yield None, reader.read_value()
+
+
 class WorldSaveSystem:
     """
     Система сохранения игрового мира в JSON
@@ -823,6 +2813,52 @@ class WorldSaveSystem:
         self.saves_directory = Path(saves_directory)
         self.saves_directory.mkdir(exist_ok=True)
         self.current_world_state = {}
+        self.index = SaveIndex(self.saves_directory)
+        self.sync_index()
+    
+    def rebuild_index(self):
+        """
+        Перестраивает индекс по заголовкам всех сохранений в директории
+        """
+        self.index.clear()
+        for save_path in self.saves_directory.glob("*.json"):
+            self._index_save(save_path)
+    
+    def _index_save(self, save_path):
+        """Читает заголовок сохранения и добавляет его в индекс"""
+        info = self._read_save_info(save_path.stem)
+        if info is not None:
+            self.index.put(self._index_entry(info, save_path.stat().st_size))
+    
+    def sync_index(self):
+        """
+        Сверяет индекс со списком файлов в директории и исправляет расхождения
+        """
+        on_disk = {save_path.stem: save_path for save_path in self.saves_directory.glob("*.json")}
+        indexed = set(self.index.names())
+        for save_name in indexed - on_disk.keys():
+            self.index.remove(save_name)
+        for save_name in on_disk.keys() - indexed:
+            self._index_save(on_disk[save_name])
+    
+    @staticmethod
+    def _index_entry(info, size):
+        """Формирует запись индекса из информации о сохранении"""
+        try:
+            timestamp = datetime.fromisoformat(info['timestamp']).timestamp()
+        except ValueError:
+            timestamp = 0.0
+        return SaveIndexEntry(
+            name=info['name'],
+            size=size,
+            timestamp=timestamp,
+            description=info['description'],
+            player_count=info['player_count'],
+            npc_count=info['npc_count'],
+            item_count=info['item_count'],
+            version=info['version'],
+            game_version=info['game_version']
+        )
     
     def save_world(self, world_state, save_name, description=""):
         """
@@ -835,13 +2871,19 @@ class WorldSaveSystem:
         """
         save_path = self.saves_directory / f"{save_name}.json"
         
-        # Добавляем метаданные к сохранению
+        # Добавляем метаданные к сохранению. Раздел 'meta' записывается первым,
+        # чтобы get_save_info мог прочитать его, не разбирая состояние мира
         save_data = {
             'meta': {
                 'version': '1.0',
                 'timestamp': datetime.now().isoformat(),
                 'description': description,
-                'game_version': '1.0.0'  # В реальной игре будет динамически получаться
+                'game_version': '1.0.0',  # В реальной игре будет динамически получаться
+                'section_sizes': {
+                    section: len(value)
+                    for section, value in world_state.items()
+                    if isinstance(value, (list, dict))
+                }
             },
             'world_state': world_state
         }
@@ -849,8 +2891,50 @@ class WorldSaveSystem:
         with open(save_path, 'w', encoding='utf-8') as f:
             json.dump(save_data, f, indent=2, ensure_ascii=False)
         
+        meta = save_data['meta']
+        section_sizes = meta['section_sizes']
+        self.index.put(self._index_entry({
+            'name': save_name,
+            'timestamp': meta['timestamp'],
+            'description': description,
+            'player_count': section_sizes.get('players', 0),
+            'npc_count': section_sizes.get('npcs', 0),
+            'item_count': section_sizes.get('items_on_ground', 0),
+            'version': meta['version'],
+            'game_version': meta['game_version']
+        }, save_path.stat().st_size))
+        
         print(f"Мир сохранен: {save_path}")
     
+    def delete_world(self, save_name):
+        """
+        Удаляет сохранение мира
+        
+        Args:
+            save_name (str): Имя сохранения для удаления
+        """
+        save_path = self.saves_directory / f"{save_name}.json"
+        if save_path.exists():
+            save_path.unlink()
+            self.index.remove(save_name)
+            return True
+        return False
+    
+    def list_worlds(self, sort_by='timestamp', reverse=True, predicate=None):
+        """
+        Возвращает метаданные сохранений мира из индекса
+        
+        Args:
+            sort_by (str): Поле SaveIndexEntry для сортировки
+            reverse (bool): Сортировать по убыванию
+            predicate (callable): Фильтр записей (опционально)
+            
+        Returns:
+            list: Список записей SaveIndexEntry
+        """
+        self.sync_index()
+        return self.index.query(sort_by=sort_by, reverse=reverse, predicate=predicate)
+    
     def load_world(self, save_name):
         """
         Загружает состояние игрового мира из JSON-файла
@@ -878,9 +2962,100 @@ class WorldSaveSystem:
             print(f"Ошибка чтения сохранения: {save_path}")
             return None
     
+    def iter_world(self, save_name, chunk_size=64 * 1024):
+        """
+        Потоково перебирает состояние мира по мере разбора файла.
+        В памяти одновременно находится только один элемент раздела.
+        
+        Args:
+            save_name (str): Имя сохранения
+            chunk_size (int): Размер блока чтения в байтах
+            
+        Yields:
+            tuple: (раздел, ключ или индекс, значение) - например ('npcs', 0, {...})
+        """
+        save_path = self.saves_directory / f"{save_name}.json"
+        
+        if not save_path.exists():
+            print(f"Файл сохранения не найден: {save_path}")
+            return
+        
+        try:
+            with open(save_path, 'rb') as f:
+                reader = StreamingJSONReader(f, chunk_size)
+                for top_key in reader.iter_object():
+                    if top_key != 'world_state':
+                        reader.skip_value()
+                        continue
+                    for section in reader.iter_object():
+                        for key, value in _iter_json_container(reader):
+                            yield section, key, value
+        except ValueError:
+            print(f"Ошибка чтения сохранения: {save_path}")
+    
+    def load_world_lazy(self, save_name, chunk_size=64 * 1024):
+        """
+        Загружает состояние мира лениво: файл просматривается один раз без разбора,
+        а каждый раздел разбирается только при обращении к нему
+        
+        Args:
+            save_name (str): Имя сохранения для загрузки
+            chunk_size (int): Размер блока чтения в байтах
+            
+        Returns:
+            LazyWorldState: Ленивое состояние мира
+        """
+        save_path = self.saves_directory / f"{save_name}.json"
+        
+        if not save_path.exists():
+            print(f"Файл сохранения не найден: {save_path}")
+            return None
+        
+        offsets = {}
+        try:
+            with open(save_path, 'rb') as f:
+                reader = StreamingJSONReader(f, chunk_size)
+                for top_key in reader.iter_object():
+                    if top_key != 'world_state':
+                        reader.skip_value()
+                        continue
+                    for section in reader.iter_object():
+                        offsets[section] = reader.skip_value()
+        except ValueError:
+            print(f"Ошибка чтения сохранения: {save_path}")
+            return None
+        
+        self.current_world_state = LazyWorldState(save_path, offsets, chunk_size)
+        return self.current_world_state
+    
     def get_save_info(self, save_name):
         """
-        Возвращает информацию о сохранении
+        Возвращает информацию о сохранении из индекса; файл сохранения не открывается
+        
+        Args:
+            save_name (str): Имя сохранения
+            
+        Returns:
+            dict: Информация о сохранении
+        """
+        entry = self.index.get(save_name)
+        if entry is None:
+            return None
+        
+        return {
+            'name': entry.name,
+            'version': entry.version or 'unknown',
+            'timestamp': datetime.fromtimestamp(entry.timestamp).isoformat() if entry.timestamp else 'unknown',
+            'description': entry.description,
+            'game_version': entry.game_version or 'unknown',
+            'player_count': entry.player_count,
+            'npc_count': entry.npc_count,
+            'item_count': entry.item_count
+        }
+    
+    def _read_save_info(self, save_name):
+        """
+        Читает информацию о сохранении из заголовка 'meta'; тело сохранения не разбирается
         
         Args:
             save_name (str): Имя сохранения
@@ -894,29 +3069,64 @@ class WorldSaveSystem:
             return None
         
         try:
-            with open(save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            meta = save_data.get('meta', {})
-            world_state = save_data.get('world_state', {})
+            with open(save_path, 'rb') as f:
+                reader = StreamingJSONReader(f)
+                meta = {}
+                section_sizes = None
+                for top_key in reader.iter_object():
+                    if top_key == 'meta':
+                        meta = reader.read_value()
+                        section_sizes = meta.get('section_sizes')
+                        if section_sizes is not None:
+                            break  # Заголовок содержит все нужные данные
+                    elif top_key == 'world_state':
+                        # Старый формат без размеров разделов: считаем элементы,
+                        # пропуская их без разбора
+                        section_sizes = {}
+                        for section in reader.iter_object():
+                            token = reader.peek()
+                            if token == b'[':
+                                elements = reader.iter_array()
+                            elif token == b'{':
+                                elements = reader.iter_object()
+                            else:
+                                reader.skip_value()
+                                continue
+                            count = 0
+                            for _ in elements:
+                                reader.skip_value()
+                                count += 1
+                            section_sizes[section] = count
+                    else:
+                        reader.skip_value()
             
+            section_sizes = section_sizes or {}
             return {
                 'name': save_name,
                 'version': meta.get('version', 'unknown'),
                 'timestamp': meta.get('timestamp', 'unknown'),
                 'description': meta.get('description', ''),
                 'game_version': meta.get('game_version', 'unknown'),
-                'player_count': len(world_state.get('players', [])),
-                'npc_count': len(world_state.get('npcs', [])),
-                'item_count': len(world_state.get('items_on_ground', []))
+                'player_count': section_sizes.get('players', 0),
+                'npc_count': section_sizes.get('npcs', 0),
+                'item_count': section_sizes.get('items_on_ground', 0)
             }
-        except json.JSONDecodeError:
+        except ValueError:
             print(f"Ошибка чтения информации о сохранении: {save_path}")
             return None
     
+    # Схема данных мира для быстрой проверки через compile_schema
+    WORLD_DATA_SCHEMA = {
+        "meta": {"version": "any", "timestamp": "any"},
+        "players?": [{"id": "any", "name": "any", "position": "any"}],
+        "npcs?": [{"id": "any", "name": "any"}]
+    }
+    
     def validate_world_data(self, world_data):
         """
-        Проверяет корректность данных игрового мира
+        Проверяет корректность данных игрового мира.
+        Сначала выполняется быстрая проверка по скомпилированной схеме;
+        подробный список ошибок собирается только для некорректных данных.
         
         Args:
             world_data (dict): Данные игрового мира для проверки
@@ -924,6 +3134,9 @@ class WorldSaveSystem:
         Returns:
             tuple: (корректны ли данные, список ошибок)
         """
+        if validate_schema(world_data, self.WORLD_DATA_SCHEMA):
+            return True, []
+        
         errors = []
         
         # Проверяем обязательные поля
@@ -1222,6 +3435,306 @@ class InventoryManager:
             json.dump(inventory_data, f, indent=2, ensure_ascii=False)
 
 
+class JournaledInventoryManager(InventoryManager):
+    """
+    Система управления инвентарем с журналом изменений.
+    
+    Каждое изменение дописывается компактной строкой в журнал игрока
+    ({player_id}.journal), а не переписывает весь файл инвентаря.
+    Состояние восстанавливается из последнего снимка ({player_id}.json)
+    и записей журнала, а фоновое уплотнение переносит журнал в новый снимок,
+    когда журнал превышает заданный размер.
+    
+    Операции с инвентарем блокируют только своего игрока. Уплотнение
+    копирует состояние и откладывает журнал ({player_id}.journal.old) под
+    блокировкой игрока, а снимок пишет и сбрасывает на диск без нее, так что
+    запись в журнал не ждет fsync снимка.
+    """
+    def __init__(self, inventories_directory="inventories", compaction_threshold=64 * 1024, fsync=False):
+        super().__init__(inventories_directory)
+        self.compaction_threshold = compaction_threshold  # Размер журнала в байтах
+        self.fsync = fsync  # Сбрасывать ли каждую запись на диск (os.fsync)
+        self._states = {}  # player_id -> {'items': [...], 'seq': номер последней записи}
+        self._journals = {}  # player_id -> открытый файл журнала
+        self._compacting = set()
+        self._player_locks = {}  # player_id -> блокировка состояния и журнала игрока
+        self._compaction_locks = {}  # player_id -> блокировка уплотнения игрока
+        self._lock = threading.RLock()  # Защищает словари блокировок и _compacting
+    
+    def _journal_path(self, player_id):
+        return self.inventories_directory / f"{player_id}.journal"
+    
+    def _old_journal_path(self, player_id):
+        return self.inventories_directory / f"{player_id}.journal.old"
+    
+    def _player_lock(self, player_id):
+        with self._lock:
+            lock = self._player_locks.get(player_id)
+            if lock is None:
+                lock = self._player_locks[player_id] = threading.RLock()
+            return lock
+    
+    def _compaction_lock(self, player_id):
+        with self._lock:
+            lock = self._compaction_locks.get(player_id)
+            if lock is None:
+                lock = self._compaction_locks[player_id] = threading.Lock()
+            return lock
+    
+    @staticmethod
+    def _apply_record(items, record):
+        """
+        Применяет запись журнала к списку предметов
+        
+        Args:
+            items (list): Список предметов (изменяется на месте)
+            record (dict): Запись журнала
+        """
+        if record['op'] == 'add':
+            item = record['item']
+            for inv_item in items:
+                if inv_item['id'] == item['id'] and inv_item.get('stackable', False):
+                    inv_item['quantity'] += item.get('quantity', 1)
+                    return
+            items.append(copy.deepcopy(item))
+        elif record['op'] == 'remove':
+            for i, inv_item in enumerate(items):
+                if inv_item['id'] == record['item_id']:
+                    items.pop(i)
+                    return
+        elif record['op'] == 'set':
+            items[:] = copy.deepcopy(record['items'])
+    
+    def _load_state(self, player_id):
+        """
+        Восстанавливает состояние инвентаря из снимка и журнала
+        
+        Args:
+            player_id (str): ID игрока
+            
+        Returns:
+            dict: Состояние инвентаря {'items': [...], 'seq': int}
+        """
+        if player_id in self._states:
+            return self._states[player_id]
+        
+        items = []
+        snapshot_seq = 0
+        inventory_path = self.inventories_directory / f"{player_id}.json"
+        if inventory_path.exists():
+            try:
+                with open(inventory_path, 'r', encoding='utf-8') as f:
+                    inventory_data = json.load(f)
+                items = inventory_data.get('items', [])
+                snapshot_seq = inventory_data.get('journal_seq', 0)
+            except json.JSONDecodeError:
+                print(f"Ошибка чтения инвентаря игрока {player_id}")
+        
+        seq = snapshot_seq
+        # Отложенный журнал остается, если уплотнение не успело завершиться
+        for journal_path in (self._old_journal_path(player_id), self._journal_path(player_id)):
+            if not journal_path.exists():
+                continue
+            valid_length = 0
+            with open(journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Оборванная запись после сбоя - дальше журнал не читаем
+                        print(f"Журнал инвентаря игрока {player_id} поврежден, хвост отброшен")
+                        break
+                    if not line.endswith(b'\n'):
+                        break
+                    valid_length += len(line)
+                    # Записи, уже перенесенные в снимок, пропускаем
+                    if record['seq'] > snapshot_seq:
+                        self._apply_record(items, record)
+                        seq = record['seq']
+            if valid_length != journal_path.stat().st_size:
+                os.truncate(journal_path, valid_length)
+        
+        state = {'items': items, 'seq': seq}
+        self._states[player_id] = state
+        return state
+    
+    def _append_record(self, player_id, state, record):
+        """
+        Дописывает запись в журнал игрока и применяет ее к состоянию
+        
+        Args:
+            player_id (str): ID игрока
+            state (dict): Текущее состояние инвентаря
+            record (dict): Запись без номера
+        """
+        record['seq'] = state['seq'] + 1
+        journal = self._journals.get(player_id)
+        if journal is None:
+            journal = open(self._journal_path(player_id), 'ab')
+            self._journals[player_id] = journal
+        
+        journal.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+        journal.flush()
+        if self.fsync:
+            os.fsync(journal.fileno())
+        
+        state['seq'] = record['seq']
+        self._apply_record(state['items'], record)
+        
+        if journal.tell() >= self.compaction_threshold:
+            self._schedule_compaction(player_id)
+    
+    def _schedule_compaction(self, player_id):
+        """Запускает уплотнение журнала игрока в фоновом потоке"""
+        with self._lock:
+            if player_id in self._compacting:
+                return
+            self._compacting.add(player_id)
+        
+        def run():
+            try:
+                self.compact(player_id)
+            finally:
+                with self._lock:
+                    self._compacting.discard(player_id)
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def compact(self, player_id):
+        """
+        Переносит журнал игрока в новый снимок инвентаря и очищает журнал
+        
+        Args:
+            player_id (str): ID игрока
+        """
+        with self._compaction_lock(player_id):
+            with self._player_lock(player_id):
+                state = self._load_state(player_id)
+                inventory_data = {
+                    'player_id': player_id,
+                    'updated_at': datetime.now().isoformat(),
+                    'items': copy.deepcopy(state['items']),
+                    'max_size': self.max_inventory_size,
+                    'journal_seq': state['seq']
+                }
+                self._set_journal_aside(player_id)
+            
+            # Снимок пишется без блокировки игрока: новые записи тем временем
+            # уходят в новый журнал с номерами больше journal_seq
+            inventory_path = self.inventories_directory / f"{player_id}.json"
+            temp_path = inventory_path.with_suffix('.json.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(inventory_data, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            # Снимок заменяется атомарно; если сбой случится до удаления
+            # отложенного журнала, его записи будут пропущены по номеру journal_seq
+            os.replace(temp_path, inventory_path)
+            self._old_journal_path(player_id).unlink(missing_ok=True)
+    
+    def _set_journal_aside(self, player_id):
+        """
+        Закрывает журнал игрока и откладывает его до записи снимка
+        (вызывается под блокировкой игрока)
+        """
+        journal = self._journals.pop(player_id, None)
+        if journal is not None:
+            journal.close()
+        journal_path = self._journal_path(player_id)
+        old_path = self._old_journal_path(player_id)
+        if not journal_path.exists():
+            return
+        if old_path.exists():
+            # Остался журнал прерванного уплотнения - дописываем к нему
+            with open(journal_path, 'rb') as src, open(old_path, 'ab') as dst:
+                dst.write(src.read())
+            journal_path.unlink()
+        else:
+            os.replace(journal_path, old_path)
+    
+    def create_inventory(self, player_id, initial_items=None):
+        with self._compaction_lock(player_id), self._player_lock(player_id):
+            journal = self._journals.pop(player_id, None)
+            if journal is not None:
+                journal.close()
+            self._journal_path(player_id).unlink(missing_ok=True)
+            self._old_journal_path(player_id).unlink(missing_ok=True)
+            self._states.pop(player_id, None)
+            super().create_inventory(player_id, initial_items)
+    
+    def add_item(self, player_id, item):
+        """
+        Добавляет предмет в инвентарь игрока, дописывая одну запись в журнал
+        
+        Args:
+            player_id (str): ID игрока
+            item (dict): Предмет для добавления
+        """
+        with self._player_lock(player_id):
+            state = self._load_state(player_id)
+            
+            if len(state['items']) >= self.max_inventory_size:
+                print(f"Инвентарь игрока {player_id} полон")
+                return False
+            
+            self._append_record(player_id, state, {'op': 'add', 'item': item})
+            return True
+    
+    def remove_item(self, player_id, item_id):
+        """
+        Удаляет предмет из инвентаря игрока, дописывая одну запись в журнал
+        
+        Args:
+            player_id (str): ID игрока
+            item_id (str): ID предмета для удаления
+        """
+        with self._player_lock(player_id):
+            state = self._load_state(player_id)
+            
+            if not any(item['id'] == item_id for item in state['items']):
+                return False  # Предмет не найден
+            
+            self._append_record(player_id, state, {'op': 'remove', 'item_id': item_id})
+            return True
+    
+    def get_inventory(self, player_id):
+        """
+        Возвращает инвентарь игрока (снимок плюс журнал)
+        
+        Args:
+            player_id (str): ID игрока
+            
+        Returns:
+            list: Список предметов в инвентаре
+        """
+        with self._player_lock(player_id):
+            return copy.deepcopy(self._load_state(player_id)['items'])
+    
+    def save_inventory(self, player_id, inventory):
+        """
+        Полностью заменяет инвентарь игрока новым снимком
+        
+        Args:
+            player_id (str): ID игрока
+            inventory (list): Инвентарь для сохранения
+        """
+        with self._player_lock(player_id):
+            state = self._load_state(player_id)
+            # Замена тоже идет через журнал, чтобы не потеряться при сбое до снимка
+            self._append_record(player_id, state, {'op': 'set', 'items': copy.deepcopy(inventory)})
+        self.compact(player_id)
+    
+    def close(self):
+        """
+        Закрывает открытые журналы (записи в них уже сохранены на диск)
+        """
+        for player_id in list(self._journals):
+            with self._player_lock(player_id):
+                journal = self._journals.pop(player_id, None)
+                if journal is not None:
+                    journal.close()
+
+
 class AchievementManager:
     """
     Система управления достижениями с JSON-хранилищем
@@ -1277,6 +3790,7 @@ class AchievementManager:
                 return self.default_achievements
         else:
             # Создаем файл со стандартными достижениями
+            self.achievements = self.default_achievements
             self.save_achievements()
             return self.default_achievements
     
@@ -1394,6 +3908,339 @@ class AchievementManager:
         return True
 
 
+class WriteBehindAchievementManager(AchievementManager):
+    """
+    Система достижений с отложенной записью прогресса.
+    
+    Прогресс хранится в памяти, а каждое изменение дописывается короткой
+    строкой в журнал предзаписи (progress.wal), поэтому прирост прогресса
+    не переписывает файлы игрока. Накопленные изменения периодически
+    (не чаще раза в flush_interval секунд) или при закрытии сбрасываются
+    в шардированные файлы shard_XX.json, по одному на группу игроков.
+    После сбоя прогресс восстанавливается из шардов и журнала.
+    """
+    WAL_NAME = "progress.wal"
+    
+    def __init__(self, achievements_file="achievements.json", progress_directory="achievement_progress",
+                 shard_count=16, flush_interval=1.0, fsync=False):
+        super().__init__(achievements_file, progress_directory)
+        self.shard_count = shard_count
+        self.fsync = fsync  # Сбрасывать ли каждую запись журнала на диск (os.fsync)
+        self._achievement_index = {ach['id']: ach for ach in self.achievements}
+        self._shards = {}  # номер шарда -> {player_id: прогресс}
+        self._shard_seqs = {}  # номер шарда -> номер последней записи журнала в файле шарда
+        self._dirty_shards = set()
+        self._pending = {}  # (player_id, achievement_id) -> накопленный прирост
+        self._seq = 0
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._metrics = {
+            'flush_count': 0,
+            'flush_time_total': 0.0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'last_flush_records': 0
+        }
+        self._wal_records = 0
+        
+        self._load_shards()
+        self._recover()
+        self._wal = open(self._wal_path(), 'ab')
+        self._writer = DebouncedWriter(self.flush, flush_interval)
+    
+    def _wal_path(self):
+        return self.progress_directory / self.WAL_NAME
+    
+    def _shard_path(self, index):
+        return self.progress_directory / f"shard_{index:02d}.json"
+    
+    def _shard_index(self, player_id):
+        # crc32 стабилен между запусками, в отличие от hash() для строк
+        return zlib.crc32(player_id.encode('utf-8')) % self.shard_count
+    
+    def _load_shards(self):
+        """Загружает все шарды прогресса и определяет последний номер записи журнала"""
+        for index in range(self.shard_count):
+            players, seq = {}, 0
+            shard_path = self._shard_path(index)
+            if shard_path.exists():
+                try:
+                    with open(shard_path, 'r', encoding='utf-8') as f:
+                        shard_data = json.load(f)
+                    players = shard_data.get('players', {})
+                    seq = shard_data.get('wal_seq', 0)
+                except json.JSONDecodeError:
+                    print(f"Ошибка чтения шарда прогресса достижений: {shard_path.name}")
+            self._shards[index] = players
+            self._shard_seqs[index] = seq
+            self._seq = max(self._seq, seq)
+    
+    def _read_wal(self, wal_path):
+        """
+        Читает записи журнала, отбрасывая оборванный после сбоя хвост
+        
+        Args:
+            wal_path (Path): Путь к файлу журнала
+            
+        Returns:
+            list: Записи журнала
+        """
+        records = []
+        valid_length = 0
+        with open(wal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_length += len(line)
+        if valid_length != wal_path.stat().st_size:
+            print(f"Журнал прогресса достижений {wal_path.name} поврежден, хвост отброшен")
+            os.truncate(wal_path, valid_length)
+        return records
+    
+    def _recover(self):
+        """
+        Применяет к шардам записи журналов, которые не успели попасть в файлы шардов
+        """
+        rotated = sorted(self.progress_directory.glob("progress.*.wal"),
+                         key=lambda path: int(path.name.split('.')[1]))
+        wal_files = rotated + ([self._wal_path()] if self._wal_path().exists() else [])
+        if not wal_files:
+            return
+        
+        replayed = 0
+        for wal_path in wal_files:
+            for record in self._read_wal(wal_path):
+                self._seq = max(self._seq, record['seq'])
+                # Записи, уже сохраненные в шард, пропускаем
+                if record['seq'] > self._shard_seqs[self._shard_index(record['p'])]:
+                    self._apply_record(record)
+                    replayed += 1
+        
+        if replayed:
+            print(f"Восстановлено записей прогресса достижений из журнала: {replayed}")
+        # Сразу переносим восстановленный прогресс в шарды и очищаем журналы
+        self._write_shards(set(self._dirty_shards), self._seq)
+        self._dirty_shards.clear()
+        self._pending.clear()
+        for wal_path in wal_files:
+            wal_path.unlink(missing_ok=True)
+    
+    def _player_progress(self, player_id):
+        """
+        Возвращает изменяемый прогресс игрока из шарда
+        (при первом обращении переносит прогресс из старого файла {player_id}.json)
+        """
+        index = self._shard_index(player_id)
+        players = self._shards[index]
+        progress = players.get(player_id)
+        if progress is None:
+            progress = super().load_player_progress(player_id)
+            players[player_id] = progress
+            if progress:
+                self._dirty_shards.add(index)
+        return progress
+    
+    def _apply_record(self, record):
+        """
+        Применяет запись журнала к прогрессу в памяти
+        
+        Args:
+            record (dict): Запись журнала
+            
+        Returns:
+            bool: Выполнено ли достижение этой записью
+        """
+        player_id = record['p']
+        progress = self._player_progress(player_id)
+        self._dirty_shards.add(self._shard_index(player_id))
+        
+        if 'set' in record:
+            progress.clear()
+            progress.update(copy.deepcopy(record['set']))
+            return False
+        
+        achievement_id = record['a']
+        achievement_def = self._achievement_index.get(achievement_id)
+        if achievement_def is None:
+            return False
+        
+        key = (player_id, achievement_id)
+        self._pending[key] = self._pending.get(key, 0) + record['inc']
+        
+        entry = progress.setdefault(achievement_id, {"achieved": False, "progress": 0})
+        entry["progress"] = min(entry["progress"] + record['inc'], achievement_def["target"])
+        if entry["progress"] >= achievement_def["target"] and not entry["achieved"]:
+            entry["achieved"] = True
+            entry["achieved_at"] = record.get('t') or datetime.now().isoformat()
+            return True
+        return False
+    
+    def _append_wal(self, record):
+        """
+        Дописывает запись в журнал и применяет ее к прогрессу в памяти
+        
+        Args:
+            record (dict): Запись без номера
+            
+        Returns:
+            bool: Выполнено ли достижение этой записью
+        """
+        with self._lock:
+            self._seq += 1
+            record['seq'] = self._seq
+            achieved = self._apply_record(record)
+            if achieved:
+                # Время выполнения фиксируется в записи, чтобы восстановление дало то же значение
+                record['t'] = self._shards[self._shard_index(record['p'])][record['p']][record['a']]["achieved_at"]
+            self._wal.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n')
+            self._wal.flush()
+            if self.fsync:
+                os.fsync(self._wal.fileno())
+            self._wal_records += 1
+        self._writer.schedule()
+        return achieved
+    
+    def _write_shards(self, indexes, seq):
+        """
+        Атомарно записывает указанные шарды
+        
+        Args:
+            indexes (set): Номера шардов
+            seq (int): Номер последней записи журнала, вошедшей в шарды
+        """
+        with self._lock:
+            payloads = {
+                index: json.dumps({'wal_seq': seq, 'players': self._shards[index]}, ensure_ascii=False)
+                for index in indexes
+            }
+        for index, payload in payloads.items():
+            shard_path = self._shard_path(index)
+            temp_path = shard_path.with_suffix('.json.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, shard_path)
+            self._shard_seqs[index] = seq
+    
+    def flush(self):
+        """
+        Сбрасывает накопленный прогресс в файлы шардов и очищает журнал
+        
+        Returns:
+            int: Количество записанных шардов
+        """
+        with self._flush_lock:
+            started = time.perf_counter()
+            with self._lock:
+                if not self._dirty_shards:
+                    return 0
+                indexes = set(self._dirty_shards)
+                seq = self._seq
+                flushed_records = self._wal_records
+                # Журнал откладывается в сторону: новые записи пойдут в новый файл,
+                # пока шарды записываются без удержания блокировки
+                rotated_path = self.progress_directory / f"progress.{seq}.wal"
+                self._wal.close()
+                os.replace(self._wal_path(), rotated_path)
+                self._wal = open(self._wal_path(), 'ab')
+                self._dirty_shards.clear()
+                self._pending.clear()
+                self._wal_records = 0
+            
+            try:
+                self._write_shards(indexes, seq)
+            except OSError as e:
+                # Отложенный журнал остается на диске; шарды будут записаны при следующем сбросе
+                print(f"Ошибка записи прогресса достижений: {e}")
+                with self._lock:
+                    self._dirty_shards.update(indexes)
+                return 0
+            
+            for wal_path in self.progress_directory.glob("progress.*.wal"):
+                if int(wal_path.name.split('.')[1]) <= seq:
+                    wal_path.unlink(missing_ok=True)
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            metrics = self._metrics
+            metrics['flush_count'] += 1
+            metrics['flush_time_total'] += elapsed_ms
+            metrics['last_flush_ms'] = elapsed_ms
+            metrics['max_flush_ms'] = max(metrics['max_flush_ms'], elapsed_ms)
+            metrics['last_flush_records'] = flushed_records
+            return len(indexes)
+    
+    def get_metrics(self):
+        """
+        Возвращает метрики отложенной записи
+        
+        Returns:
+            dict: Глубина очереди и задержки сброса в миллисекундах
+        """
+        with self._lock:
+            metrics = self._metrics
+            return {
+                'queue_depth': len(self._pending),
+                'pending_increments': sum(self._pending.values()),
+                'wal_records': self._wal_records,
+                'dirty_shards': len(self._dirty_shards),
+                'flush_count': metrics['flush_count'],
+                'last_flush_ms': round(metrics['last_flush_ms'], 3),
+                'avg_flush_ms': round(metrics['flush_time_total'] / metrics['flush_count'], 3) if metrics['flush_count'] else 0.0,
+                'max_flush_ms': round(metrics['max_flush_ms'], 3),
+                'last_flush_records': metrics['last_flush_records']
+            }
+    
+    def load_player_progress(self, player_id):
+        """
+        Возвращает копию прогресса достижений игрока из памяти
+        
+        Args:
+            player_id (str): ID игрока
+        """
+        with self._lock:
+            return copy.deepcopy(self._player_progress(player_id))
+    
+    def save_player_progress(self, player_id, progress):
+        """
+        Заменяет прогресс достижений игрока (запись попадет в шард при следующем сбросе)
+        
+        Args:
+            player_id (str): ID игрока
+            progress (dict): Прогресс для сохранения
+        """
+        self._append_wal({'p': player_id, 'set': progress})
+    
+    def update_achievement_progress(self, player_id, achievement_id, progress_increment=1):
+        """
+        Обновляет прогресс по достижению, дописывая одну запись в журнал
+        
+        Args:
+            player_id (str): ID игрока
+            achievement_id (str): ID достижения
+            progress_increment (int): Прирост прогресса
+        """
+        if achievement_id not in self._achievement_index:
+            print(f"Достижение не найдено: {achievement_id}")
+            return False
+        
+        if self._append_wal({'p': player_id, 'a': achievement_id, 'inc': progress_increment}):
+            print(f"Достижение выполнено игроком {player_id}: {achievement_id}")
+        return True
+    
+    def close(self):
+        """
+        Сбрасывает накопленный прогресс в шарды и закрывает журнал
+        """
+        self._writer.flush()
+        with self._lock:
+            self._wal.close()
+
+
 class LocationManager:
     """
     Система управления игровыми локациями с JSON-описанием
@@ -1966,6 +4813,13 @@ if __name__ == "__main__":
     print(f"Текущее разрешение по ширине: {current_resolution}")
     config.set_setting(1280, "resolution", "width")
     config.save_config()
+    # Фоновое сохранение: несколько изменений объединяются в одну запись
+    autosaved_config = GameConfig(autosave_interval=0.5)
+    config_snapshot = autosaved_config.snapshot()
+    autosaved_config.set_setting(0.5, "audio", "music_volume")
+    autosaved_config.set_setting("ultra", "graphics", "quality")
+    print(f"Снимок не изменился: {config_snapshot.get_setting('graphics', 'quality')}")
+    autosaved_config.flush()
     print()
     
     # Пример использования класса Player
@@ -1981,6 +4835,13 @@ if __name__ == "__main__":
     loaded_player = manager.load_player_progress("save1")
     if loaded_player:
         print(f"Загруженный игрок: {loaded_player.name}, уровень: {loaded_player.level}")
+    binary_manager = PlayerProgressManager(codec="binary")
+    binary_manager.save_player_progress(player, "save2")
+    # Формат определяется автоматически, поэтому оба менеджера читают оба сохранения
+    print(f"Двоичное сохранение: {manager.load_player_progress('save2').name}")
+    print(f"Сохранения по уровню: {[(e.name, e.level) for e in manager.list_save_entries(sort_by='level')]}")
+    benchmark_save_codecs(player_count=1000)
+    benchmark_schema_validation(record_count=10000)
     print()
     
     # Пример использования класса InventoryManager
@@ -2004,6 +4865,30 @@ if __name__ == "__main__":
     print(f"Инвентарь игрока: {inventory}")
     print()
     
+    # Пример использования журналируемого инвентаря
+    print("--- Класс JournaledInventoryManager ---")
+    journaled_manager = JournaledInventoryManager(compaction_threshold=4096)
+    journaled_manager.add_item("player2", dict(sample_item, id="potion", stackable=True, quantity=3))
+    journaled_manager.add_item("player2", dict(sample_item, id="potion", stackable=True, quantity=2))
+    journaled_manager.remove_item("player2", "potion")
+    journaled_manager.add_item("player2", sample_item)
+    print(f"Инвентарь игрока: {journaled_manager.get_inventory('player2')}")
+    journaled_manager.compact("player2")
+    journaled_manager.close()
+    print()
+    
+    # Пример предварительной загрузки ассетов
+    print("--- Предварительная загрузка AssetManager ---")
+    asset_manager = AssetManager(byte_budget=1024 * 1024)
+    asset_manager.assets_directory.mkdir(exist_ok=True)
+    (asset_manager.assets_directory / "hero.obj").write_text("v 0 0 0", encoding='utf-8')
+    demo_manifest = {"models": {"hero": {"path": "hero.obj", "priority": 10}}}
+    asset_manager.asset_manifests["demo"] = demo_manifest
+    asset_manager.preload_assets(demo_manifest)
+    asset_manager.load_asset("models", "hero")
+    print(f"Статистика кэша: {asset_manager.cache_stats()}")
+    print()
+    
     # Пример использования класса AchievementManager
     print("--- Класс AchievementManager ---")
     ach_manager = AchievementManager()
@@ -2011,4 +4896,31 @@ if __name__ == "__main__":
     ach_manager.grant_achievement("player1", "first_steps")
     print()
     
+    # Пример отложенной записи прогресса достижений
+    print("--- Класс WriteBehindAchievementManager ---")
+    write_behind_manager = WriteBehindAchievementManager(progress_directory="achievement_progress_sharded")
+    for _ in range(100):
+        write_behind_manager.update_achievement_progress("player1", "monster_hunter", 1)
+    print(f"Метрики до сброса: {write_behind_manager.get_metrics()}")
+    write_behind_manager.close()
+    print(f"Метрики после сброса: {write_behind_manager.get_metrics()}")
+    print()
+    
+    # Пример потоковой загрузки мира
+    print("--- Потоковая загрузка WorldSaveSystem ---")
+    world_saves = WorldSaveSystem()
+    world_saves.save_world({
+        "players": [{"id": "p1", "name": "Алекс", "position": [0, 0]}],
+        "npcs": [{"id": f"npc_{i}", "name": f"Житель {i}"} for i in range(3)],
+        "regions": {"forest": {"danger": 2}, "city": {"danger": 0}}
+    }, "world1", "Демонстрационный мир")
+    for section, key, value in world_saves.iter_world("world1"):
+        print(f"{section}[{key}] = {value}")
+    lazy_world = world_saves.load_world_lazy("world1")
+    print(f"Разделы мира: {list(lazy_world)}, npcs разобран: {lazy_world.is_loaded('npcs')}")
+    print(f"Первый NPC: {lazy_world['npcs'][0]}")
+    print(f"Информация о сохранении: {world_saves.get_save_info('world1')}")
+    print(f"Сохранения мира по индексу: {[entry.name for entry in world_saves.list_worlds()]}")
+    print()
+    
     print("Все игровые классы успешно реализованы и готовы к использованию!")
\ No newline at end of file
@@ -1,7 +1,16 @@
 # Решения для практического задания 8: Работа с XML в игровом контексте
 
+import copy
+import heapq
+import os
+import re
+import threading
+import time
 import xml.etree.ElementTree as ET
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 # Ниже приведены реализованные игровые классы и функции согласно заданию
@@ -107,12 +116,56 @@ def game_object_to_xml(obj):
     return ET.tostring(root_element, encoding='unicode')
 
 
+class DebouncedWriter:
+    """
+    Фоновая запись с объединением изменений: после вызова schedule() функция
+    записи выполняется в отдельном потоке не чаще одного раза за interval секунд,
+    а все изменения, накопленные за это время, попадают в одну запись
+    """
+    def __init__(self, write_func, interval=1.0):
+        self.write_func = write_func
+        self.interval = interval
+        self.write_count = 0
+        self._timer = None
+        self._last_write = float('-inf')
+        self._lock = threading.Lock()
+    
+    def schedule(self):
+        """Планирует запись, если она еще не запланирована"""
+        with self._lock:
+            if self._timer is not None:
+                return  # Запись уже запланирована - изменения объединятся
+            delay = max(0.0, self._last_write + self.interval - time.monotonic())
+            self._timer = threading.Timer(delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _run(self):
+        with self._lock:
+            self._timer = None
+            self._last_write = time.monotonic()
+            self.write_count += 1
+        self.write_func()
+    
+    def flush(self):
+        """Отменяет запланированную запись и выполняет ее немедленно"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.write_func()
+
+
 class GameConfig:
     """
     Система конфигурации игры через XML-файл
     """
-    def __init__(self, config_file="config.xml"):
+    def __init__(self, config_file="config.xml", autosave_interval=None):
         self.config_file = Path(config_file)
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._version = 0  # Номер изменения конфигурации
+        self._dirty_keys = set()  # Цепочки ключей, измененные после последнего сохранения
         self.default_config = {
             "resolution": {
                 "width": 1920,
@@ -146,6 +199,8 @@ class GameConfig:
             }
         }
         self.root = self.load_config()
+        # При autosave_interval изменения сохраняются в фоне не чаще раза за интервал
+        self._writer = DebouncedWriter(self.save_config, autosave_interval) if autosave_interval else None
     
     def load_config(self):
         """
@@ -203,14 +258,64 @@ class GameConfig:
         Args:
             root_element (Element): Корневой элемент для сохранения
         """
+        # Пишем во временный файл и атомарно заменяем им конфигурацию
+        temp_path = self.config_file.with_name(self.config_file.name + '.tmp')
         tree = ET.ElementTree(root_element)
-        tree.write(self.config_file, encoding="utf-8", xml_declaration=True)
+        tree.write(temp_path, encoding="utf-8", xml_declaration=True)
+        os.replace(temp_path, self.config_file)
     
     def save_config(self):
         """
         Сохраняет текущую конфигурацию в XML-файл
         """
-        self.save_config_tree(self.root)
+        with self._save_lock:
+            with self._lock:
+                snapshot = self.root
+                version = self._version
+            
+            self.save_config_tree(snapshot)
+            
+            with self._lock:
+                if self._version == version:
+                    self._dirty_keys.clear()
+    
+    def _mark_dirty(self, keys):
+        """Отмечает изменение и планирует фоновое сохранение"""
+        self._version += 1
+        self._dirty_keys.add(tuple(keys))
+        if self._writer is not None:
+            self._writer.schedule()
+    
+    @property
+    def dirty_keys(self):
+        """Цепочки ключей, измененные после последнего сохранения"""
+        with self._lock:
+            return set(self._dirty_keys)
+    
+    def is_dirty(self):
+        """Есть ли несохраненные изменения"""
+        with self._lock:
+            return bool(self._dirty_keys)
+    
+    def snapshot(self):
+        """
+        Возвращает снимок текущей конфигурации.
+        GameConfig не изменяет опубликованное дерево (копирование при записи),
+        поэтому снимок остается согласованным; изменять его нельзя.
+        
+        Returns:
+            Element: Корневой элемент снимка
+        """
+        return self.root
+    
+    def flush(self):
+        """
+        Немедленно сохраняет несохраненные изменения
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        elif self.is_dirty():
+            self.save_config()
     
     def get_setting(self, *keys):
         """
@@ -256,31 +361,37 @@ class GameConfig:
             value: Значение для установки
             *keys: Ключи для доступа к настройке
         """
-        current = self.root
-        for key in keys[:-1]:
-            found = False
-            for child in current:
-                if child.tag == key:
-                    current = child
-                    found = True
+        with self._lock:
+            # Копирование при записи: копируются только элементы на пути к ключу,
+            # а опубликованное дерево не изменяется
+            new_root = copy.copy(self.root)
+            current = new_root
+            for key in keys[:-1]:
+                for index, child in enumerate(current):
+                    if child.tag == key:
+                        child_copy = copy.copy(child)
+                        current[index] = child_copy
+                        current = child_copy
+                        break
+                else:
+                    # Создаем новый элемент, если его нет
+                    current = ET.SubElement(current, key)
+            
+            # Устанавливаем значение для последнего ключа
+            last_key = keys[-1]
+            for index, child in enumerate(current):
+                if child.tag == last_key:
+                    child_copy = copy.copy(child)
+                    child_copy.text = str(value)
+                    current[index] = child_copy
                     break
-            if not found:
+            else:
                 # Создаем новый элемент, если его нет
-                current = ET.SubElement(current, key)
-        
-        # Устанавливаем значение для последнего ключа
-        last_key = keys[-1]
-        found = False
-        for child in current:
-            if child.tag == last_key:
-                child.text = str(value)
-                found = True
-                break
-        
-        if not found:
-            # Создаем новый элемент, если его нет
-            new_element = ET.SubElement(current, last_key)
-            new_element.text = str(value)
+                new_element = ET.SubElement(current, last_key)
+                new_element.text = str(value)
+            
+            self.root = new_root
+            self._mark_dirty(keys)
 
 
 class PlayerProgressManager:
@@ -535,14 +646,354 @@ class Player:
         return player
 
 
+# Запись потокового загрузчика XML: имя селектора, тег, путь к элементу и данные
+XMLRecord = namedtuple('XMLRecord', ['selector', 'tag', 'path', 'data'])
+
+# Шаг пути селектора: тег (или *) и необязательное условие [@attr] / [@attr='value']
+_XML_SELECTOR_STEP = re.compile(r"^([\w.\-]+|\*)(?:\[@([\w.\-]+)(?:=['\"]([^'\"]*)['\"])?\])?$")
+
+
+def convert_xml_text(text):
+    """
+    Преобразует текст XML-элемента к числу или булеву значению, если это возможно
+    
+    Args:
+        text (str): Текст элемента
+        
+    Returns:
+        object: Число, булево значение или исходная строка
+    """
+    if text is None:
+        return None
+    try:
+        if '.' in text:
+            return float(text)
+        return int(text)
+    except ValueError:
+        if text.lower() in ['true', 'false']:
+            return text.lower() == 'true'
+        return text
+
+
+def xml_element_to_value(element):
+    """
+    Преобразует XML-элемент в словарь (или в значение, если это простой элемент)
+    
+    Args:
+        element: XML-элемент для преобразования
+        
+    Returns:
+        object: Словарь с данными элемента или его значение
+    """
+    result = dict(element.attrib)
+    
+    for child in element:
+        child_data = xml_element_to_value(child)
+        if child.tag in result:
+            # Если тег уже существует, делаем список
+            if not isinstance(result[child.tag], list):
+                result[child.tag] = [result[child.tag]]
+            result[child.tag].append(child_data)
+        else:
+            result[child.tag] = child_data
+    
+    if not result and element.text and element.text.strip():
+        text = element.text.strip()
+        if text.isdigit():
+            return int(text)
+        try:
+            return float(text)
+        except ValueError:
+            if text.lower() in ['true', 'false']:
+                return text.lower() == 'true'
+            return text
+    
+    return result
+
+
+class StreamingXMLLoader:
+    """
+    Потоковый загрузчик XML на основе ET.iterparse.
+    
+    Вызывающий код регистрирует селекторы (упрощенный XPath относительно
+    корня: "world_state/npcs/npc", "./textures/texture[@id='grass']",
+    ".//item"), и загрузчик превращает в записи только совпавшие поддеревья.
+    Остальные элементы очищаются сразу после разбора, поэтому в памяти
+    находится только текущая ветка документа и текущая запись.
+    Если внутри выбранного поддерева есть элементы, совпадающие с другими
+    селекторами, они выдаются отдельными записями раньше родителя
+    и удаляются из него.
+    """
+    def __init__(self, source):
+        self.source = source
+        self._selectors = []  # (имя, шаги, искать на любой глубине, преобразователь)
+    
+    def select(self, path, converter=None, name=None):
+        """
+        Регистрирует селектор поддеревьев
+        
+        Args:
+            path (str): Путь селектора
+            converter (callable): Преобразователь элемента в запись (по умолчанию xml_element_to_value)
+            name (str): Имя селектора в записях (по умолчанию - сам путь)
+            
+        Returns:
+            StreamingXMLLoader: Сам загрузчик (для цепочек вызовов)
+        """
+        anywhere = path.startswith('.//') or path.startswith('//')
+        steps = []
+        for step in path.lstrip('./').split('/'):
+            match = _XML_SELECTOR_STEP.match(step)
+            if match is None:
+                raise ValueError(f"Неподдерживаемый шаг селектора: {step!r} в {path!r}")
+            steps.append(match.groups())
+        
+        self._selectors.append((name or path, steps, anywhere, converter or xml_element_to_value))
+        return self
+    
+    @staticmethod
+    def _step_matches(step, element):
+        tag, attr, value = step
+        if tag != '*' and tag != element.tag:
+            return False
+        if attr is not None:
+            actual = element.get(attr)
+            if actual is None or (value is not None and actual != value):
+                return False
+        return True
+    
+    def _match(self, branch):
+        """
+        Находит первый селектор, совпадающий с текущей веткой (без корневого элемента)
+        
+        Args:
+            branch (list): Элементы от потомка корня до текущего элемента
+        """
+        for selector in self._selectors:
+            _, steps, anywhere, _ = selector
+            if len(steps) > len(branch) or (not anywhere and len(steps) != len(branch)):
+                continue
+            tail = branch[len(branch) - len(steps):]
+            if all(self._step_matches(step, element) for step, element in zip(steps, tail)):
+                return selector
+        return None
+    
+    def __iter__(self):
+        """
+        Перебирает записи по мере разбора документа
+        
+        Yields:
+            XMLRecord: Запись для каждого совпавшего поддерева
+        """
+        stack = []  # (элемент, совпавший селектор)
+        captured = 0  # Сколько элементов ветки выбраны селекторами
+        
+        with open(self.source, 'rb') as f:
+            for event, element in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    selector = self._match([item[0] for item in stack[1:]] + [element]) if stack else None
+                    if selector is not None:
+                        captured += 1
+                    stack.append((element, selector))
+                    continue
+                
+                _, selector = stack.pop()
+                if selector is not None:
+                    captured -= 1
+                    path = '/'.join(item[0].tag for item in stack[1:]) + ('/' if len(stack) > 1 else '') + element.tag
+                    yield XMLRecord(selector[0], element.tag, path, selector[3](element))
+                
+                if stack and (selector is not None or captured == 0):
+                    # Поддерево больше не нужно: освобождаем его
+                    element.clear()
+                    stack[-1][0].remove(element)
+
+
+class AssetCache:
+    """
+    Потокобезопасный LRU-кэш ассетов с ограничением по суммарному размеру в байтах.
+    Давно не использованные ассеты вытесняются, когда бюджет превышен.
+    """
+    def __init__(self, byte_budget=256 * 1024 * 1024):
+        self.byte_budget = byte_budget
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # ключ -> (ассет, размер)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def asset_size(asset):
+        """Оценивает размер ассета в байтах (строки - по длине в UTF-8)"""
+        data = asset.get('data') if isinstance(asset, dict) else asset
+        if isinstance(data, str):
+            return len(data.encode('utf-8'))
+        if isinstance(data, memoryview):
+            return data.nbytes
+        try:
+            return len(data)
+        except TypeError:
+            return 0
+    
+    def get(self, key, default=None):
+        """
+        Возвращает ассет из кэша и отмечает его как недавно использованный
+        
+        Args:
+            key (str): Ключ ассета
+            default: Значение, если ассета нет в кэше
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, asset):
+        """
+        Помещает ассет в кэш, вытесняя давно не использованные ассеты
+        
+        Args:
+            key (str): Ключ ассета
+            asset: Загруженный ассет
+            
+        Returns:
+            bool: Поместился ли ассет в бюджет
+        """
+        size = self.asset_size(asset)
+        if size > self.byte_budget:
+            return False
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (asset, size)
+            self.current_bytes += size
+            
+            while self.current_bytes > self.byte_budget:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return True
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def __getitem__(self, key):
+        asset = self.get(key)
+        if asset is None:
+            raise KeyError(key)
+        return asset
+    
+    def __setitem__(self, key, asset):
+        self.put(key, asset)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def clear(self):
+        """Очищает кэш (счетчики сохраняются)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        """
+        Возвращает статистику кэша
+        
+        Returns:
+            dict: Попадания, промахи, вытеснения, занятый объем и доля попаданий
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'byte_budget': self.byte_budget,
+                'hit_ratio': self.hits / requests if requests else 0.0
+            }
+
+
 class AssetManager:
     """
     Система загрузки игровых ассетов из XML-файлов
     """
-    def __init__(self, assets_directory="assets"):
+    def __init__(self, assets_directory="assets", cache=None, byte_budget=256 * 1024 * 1024):
         self.assets_directory = Path(assets_directory)
-        self.loaded_assets = {}
+        # Кэш может быть общим для нескольких менеджеров ассетов
+        self.loaded_assets = cache if cache is not None else AssetCache(byte_budget)
         self.asset_manifests = {}
+        self.asset_index = {}  # (тип, id) -> информация об ассете из потокового манифеста
+        self._inflight = {}  # ключ -> Future загрузки, которая уже выполняется
+        self._inflight_lock = threading.Lock()
+    
+    def iter_manifest_assets(self, manifest_file, asset_types=None):
+        """
+        Потоково перебирает ассеты манифеста, не строя дерево документа
+        
+        Args:
+            manifest_file (str): Путь к файлу манифеста
+            asset_types (list): Типы ассетов для загрузки (по умолчанию - все)
+            
+        Yields:
+            XMLRecord: Запись ассета; selector - тип ассета, data - информация об ассете
+        """
+        manifest_path = self.assets_directory / manifest_file
+        loader = StreamingXMLLoader(manifest_path)
+        if asset_types is None:
+            loader.select("*/*", self.xml_to_dict, name='asset')
+        else:
+            for asset_type in asset_types:
+                loader.select(f"{asset_type}/{asset_type[:-1]}", self.xml_to_dict, name=asset_type)
+        
+        for record in loader:
+            if record.selector == 'asset':
+                record = record._replace(selector=record.path.split('/')[0])
+            yield record
+    
+    def index_asset_manifest(self, manifest_file, asset_types=None):
+        """
+        Загружает манифест потоково: в памяти остаются только словари с информацией
+        об ассетах, без дерева XML
+        
+        Args:
+            manifest_file (str): Путь к файлу манифеста
+            asset_types (list): Типы ассетов для загрузки (по умолчанию - все)
+            
+        Returns:
+            int: Количество загруженных записей
+        """
+        count = 0
+        try:
+            for record in self.iter_manifest_assets(manifest_file, asset_types):
+                if isinstance(record.data, dict) and 'id' in record.data:
+                    self.asset_index[(record.selector, record.data['id'])] = record.data
+                    count += 1
+        except FileNotFoundError:
+            print(f"Файл манифеста не найден: {self.assets_directory / manifest_file}")
+        except ET.ParseError:
+            print(f"Ошибка чтения XML из файла: {self.assets_directory / manifest_file}")
+        return count
+    
+    def _find_asset_info(self, asset_type, asset_name):
+        """Ищет информацию об ассете в потоковом индексе, затем в манифестах"""
+        asset_info = self.asset_index.get((asset_type, asset_name))
+        if asset_info is not None:
+            return asset_info
+        for manifest in self.asset_manifests.values():
+            asset_element = manifest.find(f"./{asset_type}/{asset_type[:-1]}[@id='{asset_name}']")
+            if asset_element is not None:
+                return self.xml_to_dict(asset_element)
+        return None
     
     def load_asset_manifest(self, manifest_file):
         """
@@ -615,6 +1066,75 @@ class AssetManager:
         
         return result
     
+    def read_asset_file(self, asset_path):
+        """
+        Читает и декодирует файл ассета в зависимости от его типа
+        
+        Args:
+            asset_path (Path): Путь к файлу ассета
+            
+        Returns:
+            object: Данные ассета
+        """
+        if asset_path.suffix.lower() in ['.obj', '.fbx', '.dae', '.gltf']:
+            # Загрузка 3D модели
+            with open(asset_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        elif asset_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.bmp', '.tga']:
+            # Загрузка текстуры (в реальном приложении это будет бинарные данные)
+            with open(asset_path, 'rb') as f:
+                return f.read()
+        elif asset_path.suffix.lower() in ['.wav', '.mp3', '.ogg']:
+            # Загрузка звука (в реальном приложении это будет бинарные данные)
+            with open(asset_path, 'rb') as f:
+                return f.read()
+        else:
+            # Для других файлов просто читаем как текст
+            with open(asset_path, 'r', encoding='utf-8') as f:
+                return f.read()
+    
+    def _load_into_cache(self, cache_key, asset_info):
+        """
+        Загружает ассет и кладет его в кэш; одновременные запросы одного ассета
+        ждут одну и ту же загрузку
+        
+        Args:
+            cache_key (str): Ключ ассета в кэше
+            asset_info (dict): Информация об ассете из манифеста
+            
+        Returns:
+            dict: Загруженный ассет или None
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            asset_path = self.assets_directory / asset_info['path']
+            if asset_path.exists():
+                asset = {
+                    'data': self.read_asset_file(asset_path),
+                    'info': asset_info
+                }
+                self.loaded_assets.put(cache_key, asset)
+            else:
+                print(f"Файл ассета не найден: {asset_path}")
+                asset = None
+            future.set_result(asset)
+            return asset
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+    
     def load_asset(self, asset_type, asset_name):
         """
         Загружает указанный ассет
@@ -628,49 +1148,68 @@ class AssetManager:
         """
         # Проверяем, загружен ли ассет в кэш
         cache_key = f"{asset_type}:{asset_name}"
-        if cache_key in self.loaded_assets:
-            return self.loaded_assets[cache_key]
+        cached_asset = self.loaded_assets.get(cache_key)
+        if cached_asset is not None:
+            return cached_asset
         
-        # Ищем информацию об ассете в манифестах
-        for manifest in self.asset_manifests.values():
-            asset_element = manifest.find(f"./{asset_type}/{asset_type[:-1]}[@id='{asset_name}']")
-            if asset_element is not None:
-                asset_info = self.xml_to_dict(asset_element)
-                asset_path = self.assets_directory / asset_info['path']
-                
-                if asset_path.exists():
-                    # Загружаем ассет в зависимости от типа
-                    if asset_path.suffix.lower() in ['.obj', '.fbx', '.dae', '.gltf']:
-                        # Загрузка 3D модели
-                        with open(asset_path, 'r', encoding='utf-8') as f:
-                            asset_data = f.read()
-                    elif asset_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.bmp', '.tga']:
-                        # Загрузка текстуры (в реальном приложении это будет бинарные данные)
-                        with open(asset_path, 'rb') as f:
-                            asset_data = f.read()
-                    elif asset_path.suffix.lower() in ['.wav', '.mp3', '.ogg']:
-                        # Загрузка звука (в реальном приложении это будет бинарные данные)
-                        with open(asset_path, 'rb') as f:
-                            asset_data = f.read()
-                    else:
-                        # Для других файлов просто читаем как текст
-                        with open(asset_path, 'r', encoding='utf-8') as f:
-                            asset_data = f.read()
-                    
-                    # Сохраняем в кэш
-                    self.loaded_assets[cache_key] = {
-                        'data': asset_data,
-                        'info': asset_info
-                    }
-                    
-                    return self.loaded_assets[cache_key]
-                else:
-                    print(f"Файл ассета не найден: {asset_path}")
-                    return None
+        # Ищем информацию об ассете в индексе и манифестах
+        asset_info = self._find_asset_info(asset_type, asset_name)
+        if asset_info is not None:
+            return self._load_into_cache(cache_key, asset_info)
         
         print(f"Ассет не найден: {asset_type}/{asset_name}")
         return None
     
+    def preload_assets(self, manifest, max_workers=4, wait=True):
+        """
+        Загружает ассеты манифеста в кэш параллельно в пуле потоков.
+        Ассеты с большим значением 'priority' загружаются первыми.
+        
+        Args:
+            manifest (dict): Манифест из load_asset_manifest
+            max_workers (int): Количество потоков загрузки
+            wait (bool): Дождаться ли окончания загрузки
+            
+        Returns:
+            list: Объекты Future для каждой загрузки
+        """
+        jobs = []
+        for asset_type, group in manifest.items():
+            if not isinstance(group, dict):
+                continue
+            # Элементы <texture> внутри <textures>: один элемент - словарь, несколько - список
+            assets = group.get(asset_type[:-1], [])
+            if isinstance(assets, dict):
+                assets = [assets]
+            for asset_info in assets:
+                if isinstance(asset_info, dict) and 'id' in asset_info and 'path' in asset_info:
+                    # Атрибуты XML остаются строками, поэтому приводим приоритет к числу
+                    priority = convert_xml_text(str(asset_info.get('priority', 0)))
+                    if not isinstance(priority, (int, float)):
+                        priority = 0
+                    jobs.append((priority, f"{asset_type}:{asset_info['id']}", asset_info))
+        
+        # Пул выполняет задачи в порядке отправки, поэтому сортируем по приоритету
+        jobs.sort(key=lambda job: job[0], reverse=True)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset-preload")
+        futures = [
+            executor.submit(self._load_into_cache, cache_key, asset_info)
+            for _, cache_key, asset_info in jobs
+            if cache_key not in self.loaded_assets
+        ]
+        executor.shutdown(wait=wait)
+        return futures
+    
+    def cache_stats(self):
+        """
+        Возвращает статистику кэша ассетов
+        
+        Returns:
+            dict: Попадания, промахи, вытеснения и занятый объем
+        """
+        return self.loaded_assets.stats()
+    
     def get_asset_info(self, asset_type, asset_name):
         """
         Возвращает информацию об ассете
@@ -682,12 +1221,7 @@ class AssetManager:
         Returns:
             dict: Информация об ассете
         """
-        for manifest in self.asset_manifests.values():
-            asset_element = manifest.find(f"./{asset_type}/{asset_type[:-1]}[@id='{asset_name}']")
-            if asset_element is not None:
-                return self.xml_to_dict(asset_element)
-        
-        return None
+        return self._find_asset_info(asset_type, asset_name)
     
     def validate_asset_data(self, asset_element, expected_schema):
         """
@@ -919,6 +1453,215 @@ class QuestSystem:
         return active_quests_info
 
 
+@lru_cache(maxsize=4096)
+def parse_version(version):
+    """
+    Преобразует строку версии X.Y.Z в кортеж чисел (результат кэшируется)
+    
+    Args:
+        version (str): Версия
+        
+    Returns:
+        tuple: Кортеж чисел; кортежи сравниваются так же, как compare_versions
+    """
+    return tuple(int(x) for x in version.split('.'))
+
+
+class ModDependencyResolver:
+    """
+    Граф зависимостей модов с инкрементальным обновлением.
+    
+    Конфигурации модов кэшируются по времени изменения и размеру файла,
+    поэтому повторное сканирование разбирает только измененные моды.
+    Порядок загрузки (топологическая сортировка) вычисляется один раз
+    и сбрасывается только при изменении набора модов.
+    """
+    def __init__(self, mods_directory, config_name, parse_config):
+        self.mods_directory = Path(mods_directory)
+        self.config_name = config_name
+        self.parse_config = parse_config  # путь -> (конфигурация, описание мода)
+        self.mods = {}  # ID мода -> описание мода
+        self._entries = {}  # имя директории -> запись кэша
+        self._load_order = None
+    
+    def _describe(self, descriptor, directory):
+        """Дополняет описание мода каталогом и кортежами зависимостей и конфликтов"""
+        descriptor = dict(descriptor)
+        descriptor['directory'] = directory
+        descriptor['dependencies'] = tuple(descriptor.get('dependencies') or ())
+        descriptor['conflicts'] = tuple(descriptor.get('conflicts') or ())
+        return descriptor
+    
+    def _refresh_entry(self, directory, report):
+        """Перечитывает конфигурацию одного мода, если файл изменился с прошлого разбора"""
+        config_path = directory / self.config_name
+        previous = self._entries.get(directory.name)
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
+            if previous is None or previous['key'] is not None:
+                report['missing_config'].append(directory.name)
+                if previous is not None and previous['mod_id'] is not None:
+                    self.mods.pop(previous['mod_id'], None)
+                    report['removed'].append(previous['mod_id'])
+            self._entries[directory.name] = {'key': None, 'mod_id': None, 'config': None}
+            return
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        if previous is not None and previous['key'] == key:
+            return  # Конфигурация не менялась - разбор не нужен
+        
+        if previous is not None and previous['mod_id'] is not None:
+            self.mods.pop(previous['mod_id'], None)
+        try:
+            config, descriptor = self.parse_config(config_path)
+            descriptor = self._describe(descriptor, directory)
+        except (ET.ParseError, ValueError, KeyError, TypeError):
+            report['errors'].append(directory.name)
+            if previous is not None and previous['mod_id'] is not None:
+                report['removed'].append(previous['mod_id'])
+            self._entries[directory.name] = {'key': key, 'mod_id': None, 'config': None}
+            return
+        
+        mod_id = descriptor['id']
+        self.mods[mod_id] = descriptor
+        self._entries[directory.name] = {'key': key, 'mod_id': mod_id, 'config': config}
+        if previous is not None and previous['mod_id'] == mod_id:
+            report['changed'].append(mod_id)
+        else:
+            if previous is not None and previous['mod_id'] is not None:
+                report['removed'].append(previous['mod_id'])
+            report['added'].append(mod_id)
+    
+    def _new_report(self):
+        """Пустой отчет об изменениях"""
+        return {'added': [], 'changed': [], 'removed': [], 'missing_config': [], 'errors': []}
+    
+    def _finish(self, report):
+        """Сбрасывает кэш порядка загрузки, только если набор модов изменился"""
+        if report['added'] or report['changed'] or report['removed']:
+            self._load_order = None
+        return report
+    
+    def refresh(self):
+        """
+        Обновляет кэш по директории модов, разбирая только новые и измененные конфигурации
+        
+        Returns:
+            dict: {'added': [...], 'changed': [...], 'removed': [...], 'missing_config': [...], 'errors': [...]}
+        """
+        report = self._new_report()
+        seen = set()
+        
+        with os.scandir(self.mods_directory) as it:
+            for dir_entry in it:
+                if dir_entry.is_dir():
+                    seen.add(dir_entry.name)
+                    self._refresh_entry(Path(dir_entry.path), report)
+        
+        for name in list(self._entries):
+            if name not in seen:
+                entry = self._entries.pop(name)
+                if entry['mod_id'] is not None:
+                    self.mods.pop(entry['mod_id'], None)
+                    report['removed'].append(entry['mod_id'])
+        
+        return self._finish(report)
+    
+    def refresh_mod(self, mod_id):
+        """
+        Перепроверяет конфигурацию одного мода без сканирования всей директории
+        
+        Args:
+            mod_id (str): ID мода
+            
+        Returns:
+            dict: Отчет в формате refresh()
+        """
+        report = self._new_report()
+        descriptor = self.mods.get(mod_id)
+        if descriptor is not None:
+            self._refresh_entry(descriptor['directory'], report)
+        return self._finish(report)
+    
+    def get_config(self, mod_id):
+        """
+        Возвращает разобранную конфигурацию мода из кэша
+        
+        Args:
+            mod_id (str): ID мода
+        """
+        descriptor = self.mods.get(mod_id)
+        if descriptor is None:
+            return None
+        return self._entries[descriptor['directory'].name]['config']
+    
+    def dependents(self, mod_id):
+        """
+        Возвращает моды, которые напрямую зависят от указанного мода
+        
+        Args:
+            mod_id (str): ID мода
+        """
+        return [other_id for other_id, descriptor in self.mods.items() if mod_id in descriptor['dependencies']]
+    
+    def load_order(self):
+        """
+        Возвращает порядок загрузки модов: зависимости загружаются раньше зависимых модов.
+        Результат кэшируется до следующего изменения набора модов.
+        
+        Returns:
+            tuple: (список ID модов в порядке загрузки, список ошибок)
+        """
+        if self._load_order is not None:
+            return list(self._load_order[0]), list(self._load_order[1])
+        
+        errors = []
+        in_degree = {mod_id: 0 for mod_id in self.mods}
+        dependents = {mod_id: [] for mod_id in self.mods}
+        for mod_id, descriptor in self.mods.items():
+            for dependency in descriptor['dependencies']:
+                if dependency not in self.mods:
+                    errors.append(f"Мод {mod_id}: отсутствует зависимость {dependency}")
+                    continue
+                in_degree[mod_id] += 1
+                dependents[dependency].append(mod_id)
+            for conflict in descriptor['conflicts']:
+                # Каждую пару конфликтующих модов сообщаем один раз
+                if conflict in self.mods and (mod_id < conflict or mod_id not in self.mods[conflict]['conflicts']):
+                    errors.append(f"Конфликт модов: {mod_id} и {conflict}")
+        
+        # Алгоритм Кана; куча дает детерминированный порядок среди независимых модов
+        ready = [mod_id for mod_id, degree in in_degree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            mod_id = heapq.heappop(ready)
+            order.append(mod_id)
+            for dependent in dependents[mod_id]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+        
+        if len(order) < len(self.mods):
+            # Отсекаем моды, которые лишь зависят от цикла, но сами в него не входят
+            remaining = {mod_id for mod_id, degree in in_degree.items() if degree > 0}
+            pruned = True
+            while pruned:
+                pruned = False
+                for mod_id in list(remaining):
+                    if not any(dependent in remaining for dependent in dependents[mod_id]):
+                        remaining.discard(mod_id)
+                        pruned = True
+            errors.append(f"Циклические зависимости между модами: {', '.join(sorted(remaining))}")
+            blocked = sorted(mod_id for mod_id, degree in in_degree.items() if degree > 0 and mod_id not in remaining)
+            if blocked:
+                errors.append(f"Моды не могут быть загружены из-за циклических зависимостей: {', '.join(blocked)}")
+        
+        self._load_order = (order, errors)
+        return list(order), list(errors)
+
+
 class ModManager:
     """
     Система управления модами с XML-конфигурацией
@@ -928,44 +1671,85 @@ class ModManager:
         self.installed_mods = {}
         self.enabled_mods = []
         self.mod_dependencies = {}
+        self.resolver = ModDependencyResolver(self.mods_directory, "mod.xml", self._parse_mod_config)
+    
+    @staticmethod
+    def _parse_mod_config(config_path):
+        """
+        Разбирает mod.xml в корневой элемент и описание мода для графа зависимостей
+        
+        Args:
+            config_path (Path): Путь к mod.xml
+            
+        Returns:
+            tuple: (корневой элемент, описание мода)
+        """
+        root = ET.parse(config_path).getroot()
+        mod_id = root.get("id")
+        if mod_id is None:
+            raise ValueError(f"У мода не указан id: {config_path}")
+        
+        version_elem = root.find("requirements/game_version")
+        descriptor = {
+            'id': mod_id,
+            'name': root.get('name', 'Unknown'),
+            'dependencies': [dep.text for dep in root.findall("requirements/dependencies/dependency")],
+            'conflicts': [conflict.text for conflict in root.findall("conflicts/mod")],
+            'game_version_min': version_elem.get("min") if version_elem is not None else None,
+            'game_version_max': version_elem.get("max") if version_elem is not None else None
+        }
+        return root, descriptor
     
     def scan_mods(self):
         """
-        Сканирует директорию на наличие модов и загружает их конфигурацию
+        Сканирует директорию на наличие модов и загружает их конфигурацию.
+        Повторное сканирование разбирает только новые и измененные mod.xml.
+        """
+        report = self.resolver.refresh()
+        self._apply_resolver_report(report)
+        
+        for name in report['errors']:
+            print(f"Ошибка чтения конфигурации мода: {name}")
+        for name in report['missing_config']:
+            print(f"Конфигурационный файл не найден для мода: {name}")
+    
+    def _apply_resolver_report(self, report):
+        """Переносит изменения из графа зависимостей в installed_mods"""
+        for mod_id in report['removed']:
+            self.installed_mods.pop(mod_id, None)
+            self.mod_dependencies.pop(mod_id, None)
+            if mod_id in self.enabled_mods:
+                self.enabled_mods.remove(mod_id)
+        
+        for mod_id in report['added'] + report['changed']:
+            descriptor = self.resolver.mods[mod_id]
+            previous = self.installed_mods.get(mod_id)
+            self.installed_mods[mod_id] = {
+                'config': self.resolver.get_config(mod_id),
+                'directory': descriptor['directory'],
+                'enabled': previous['enabled'] if previous else False
+            }
+            
+            # Сохраняем зависимости
+            if descriptor['dependencies']:
+                self.mod_dependencies[mod_id] = list(descriptor['dependencies'])
+            else:
+                self.mod_dependencies.pop(mod_id, None)
+            
+            print(f"Найден мод: {descriptor['name']} (ID: {mod_id})")
+    
+    def get_load_order(self):
         """
-        for mod_dir in self.mods_directory.iterdir():
-            if mod_dir.is_dir():
-                config_path = mod_dir / "mod.xml"
-                if config_path.exists():
-                    try:
-                        tree = ET.parse(config_path)
-                        root = tree.getroot()
-                        
-                        mod_id = root.get("id")
-                        mod_config = {
-                            'config': root,
-                            'directory': mod_dir,
-                            'enabled': False
-                        }
-                        
-                        self.installed_mods[mod_id] = mod_config
-                        
-                        # Сохраняем зависимости
-                        dependencies_elem = root.find("requirements/dependencies")
-                        if dependencies_elem is not None:
-                            dependencies = [dep.text for dep in dependencies_elem.findall("dependency")]
-                            if dependencies:
-                                self.mod_dependencies[mod_id] = dependencies
-                        
-                        print(f"Найден мод: {root.get('name', 'Unknown')} (ID: {mod_id})")
-                    except ET.ParseError:
-                        print(f"Ошибка чтения конфигурации мода: {mod_dir.name}")
-                else:
-                    print(f"Конфигурационный файл не найден для мода: {mod_dir.name}")
+        Возвращает порядок загрузки установленных модов с учетом зависимостей
+        
+        Returns:
+            tuple: (список ID модов в порядке загрузки, список ошибок)
+        """
+        return self.resolver.load_order()
     
     def load_mod_config(self, mod_id):
         """
-        Загружает конфигурацию мода из XML-файла
+        Загружает конфигурацию мода из XML-файла (из кэша, если файл не менялся)
         
         Args:
             mod_id (str): ID мода
@@ -974,15 +1758,17 @@ class ModManager:
             return None
         
         config_path = self.installed_mods[mod_id]['directory'] / "mod.xml"
-        try:
-            tree = ET.parse(config_path)
-            return tree.getroot()
-        except FileNotFoundError:
+        report = self.resolver.refresh_mod(mod_id)
+        self._apply_resolver_report(report)
+        if report['missing_config']:
             print(f"Конфигурационный файл мода не найден: {config_path}")
             return None
-        except ET.ParseError:
+        if report['errors']:
             print(f"Ошибка чтения XML-конфигурации мода: {config_path}")
             return None
+        
+        root = self.resolver.get_config(mod_id)
+        return copy.deepcopy(root) if root is not None else None
     
     def validate_mod_compatibility(self, mod_id):
         """
@@ -1042,21 +1828,10 @@ class ModManager:
         Returns:
             int: -1 если version1 < version2, 0 если равны, 1 если version1 > version2
         """
-        v1_parts = [int(x) for x in version1.split('.')]
-        v2_parts = [int(x) for x in version2.split('.')]
-        
-        for i in range(min(len(v1_parts), len(v2_parts))):
-            if v1_parts[i] < v2_parts[i]:
-                return -1
-            elif v1_parts[i] > v2_parts[i]:
-                return 1
-        
-        if len(v1_parts) < len(v2_parts):
-            return -1
-        elif len(v1_parts) > len(v2_parts):
-            return 1
-        else:
-            return 0
+        # Кортежи сравниваются поэлементно, а более короткий префикс считается меньше
+        v1_parts = parse_version(version1)
+        v2_parts = parse_version(version2)
+        return (v1_parts > v2_parts) - (v1_parts < v2_parts)
     
     def enable_mod(self, mod_id):
         """
@@ -1245,9 +2020,106 @@ class WorldSaveSystem:
                 sub_elem = ET.SubElement(elem, key)
                 sub_elem.text = str(value)
     
+    # Разделы мира, которые хранятся как списки записей: раздел -> тег записи
+    LIST_SECTIONS = {
+        'players': 'player',
+        'npcs': 'npc',
+        'items_on_ground': 'item',
+        'active_quests': 'quest'
+    }
+    
+    def _player_record(self, player_elem):
+        player_data = {"id": player_elem.get("id"), "name": player_elem.get("name")}
+        for sub_elem in player_elem:
+            if len(sub_elem) == 0:  # Простое значение
+                player_data[sub_elem.tag] = convert_xml_text(sub_elem.text)
+            else:  # Сложная структура
+                player_data[sub_elem.tag] = self.element_to_dict(sub_elem)
+        return player_data
+    
+    def _npc_record(self, npc_elem):
+        npc_data = {"id": npc_elem.get("id"), "name": npc_elem.get("name"), "type": npc_elem.get("type")}
+        pos_elem = npc_elem.find("position")
+        if pos_elem is not None:
+            npc_data["position"] = {
+                "x": float(pos_elem.get("x")),
+                "y": float(pos_elem.get("y")),
+                "z": float(pos_elem.get("z"))
+            }
+        return npc_data
+    
+    def _item_record(self, item_elem):
+        return {
+            "id": item_elem.get("id"),
+            "name": item_elem.get("name"),
+            "x": float(item_elem.get("x")),
+            "y": float(item_elem.get("y")),
+            "z": float(item_elem.get("z"))
+        }
+    
+    def _quest_record(self, quest_elem):
+        return {
+            "id": quest_elem.get("id"),
+            "name": quest_elem.get("name")
+        }
+    
+    def _section_record(self, child):
+        if child.tag in self.LIST_SECTIONS:
+            return None  # Записи списка уже выданы отдельно
+        if child.tag == "world_time":
+            return int(child.text)
+        if child.tag == "weather":
+            return child.text
+        if len(child) == 0:
+            # Для других элементов просто сохраняем текст
+            return convert_xml_text(child.text)
+        # Если есть дочерние элементы, преобразуем их рекурсивно
+        return self.element_to_dict(child)
+    
+    def _world_loader(self, save_path, selectors=None):
+        """Создает потоковый загрузчик с селекторами разделов мира"""
+        loader = StreamingXMLLoader(save_path)
+        for path, converter in (selectors or {}).items():
+            loader.select(path, converter)
+        converters = {
+            'players': self._player_record,
+            'npcs': self._npc_record,
+            'items_on_ground': self._item_record,
+            'active_quests': self._quest_record
+        }
+        for section, record_tag in self.LIST_SECTIONS.items():
+            loader.select(f"world_state/{section}/{record_tag}", converters[section], name=section)
+        loader.select("world_state/*", self._section_record, name='section')
+        return loader
+    
+    def iter_world(self, save_name, selectors=None):
+        """
+        Потоково перебирает состояние мира из XML-файла, не строя дерево целиком
+        
+        Args:
+            save_name (str): Имя сохранения
+            selectors (dict): Дополнительные селекторы {путь: преобразователь}
+                для выборочной загрузки других поддеревьев (опционально)
+            
+        Yields:
+            XMLRecord: Записи с типизированными данными; selector - имя раздела
+                ('players', 'npcs', ..., 'section' для прочих разделов)
+        """
+        save_path = self.saves_directory / f"{save_name}.xml"
+        
+        if not save_path.exists():
+            print(f"Файл сохранения не найден: {save_path}")
+            return
+        
+        try:
+            yield from self._world_loader(save_path, selectors)
+        except ET.ParseError:
+            print(f"Ошибка чтения сохранения: {save_path}")
+    
     def load_world(self, save_name):
         """
-        Загружает состояние игрового мира из XML-файла
+        Загружает состояние игрового мира из XML-файла.
+        Файл разбирается потоково, поэтому в памяти строится только итоговый словарь.
         
         Args:
             save_name (str): Имя сохранения для загрузки
@@ -1261,101 +2133,23 @@ class WorldSaveSystem:
             print(f"Файл сохранения не найден: {save_path}")
             return None
         
+        world_state = {}
         try:
-            tree = ET.parse(save_path)
-            root = tree.getroot()
-            
-            world_state = {}
-            
-            # Загружаем состояние мира
-            world_elem = root.find("world_state")
-            if world_elem is not None:
-                for child in world_elem:
-                    if child.tag == "players":
-                        players = []
-                        for player_elem in child.findall("player"):
-                            player_data = {"id": player_elem.get("id"), "name": player_elem.get("name")}
-                            for sub_elem in player_elem:
-                                if len(sub_elem) == 0:  # Простое значение
-                                    try:
-                                        # Пробуем преобразовать к числу
-                                        if '.' in sub_elem.text:
-                                            player_data[sub_elem.tag] = float(sub_elem.text)
-                                        else:
-                                            player_data[sub_elem.tag] = int(sub_elem.text)
-                                    except ValueError:
-                                        # Если не число, проверяем на булево
-                                        if sub_elem.text.lower() in ['true', 'false']:
-                                            player_data[sub_elem.tag] = sub_elem.text.lower() == 'true'
-                                        else:
-                                            player_data[sub_elem.tag] = sub_elem.text
-                                else:  # Сложная структура
-                                    player_data[sub_elem.tag] = self.element_to_dict(sub_elem)
-                            players.append(player_data)
-                        world_state["players"] = players
-                    elif child.tag == "npcs":
-                        npcs = []
-                        for npc_elem in child.findall("npc"):
-                            npc_data = {"id": npc_elem.get("id"), "name": npc_elem.get("name"), "type": npc_elem.get("type")}
-                            pos_elem = npc_elem.find("position")
-                            if pos_elem is not None:
-                                npc_data["position"] = {
-                                    "x": float(pos_elem.get("x")),
-                                    "y": float(pos_elem.get("y")),
-                                    "z": float(pos_elem.get("z"))
-                                }
-                            npcs.append(npc_data)
-                        world_state["npcs"] = npcs
-                    elif child.tag == "items_on_ground":
-                        items = []
-                        for item_elem in child.findall("item"):
-                            item_data = {
-                                "id": item_elem.get("id"),
-                                "name": item_elem.get("name"),
-                                "x": float(item_elem.get("x")),
-                                "y": float(item_elem.get("y")),
-                                "z": float(item_elem.get("z"))
-                            }
-                            items.append(item_data)
-                        world_state["items_on_ground"] = items
-                    elif child.tag == "active_quests":
-                        quests = []
-                        for quest_elem in child.findall("quest"):
-                            quest_data = {
-                                "id": quest_elem.get("id"),
-                                "name": quest_elem.get("name")
-                            }
-                            quests.append(quest_data)
-                        world_state["active_quests"] = quests
-                    elif child.tag == "world_time":
-                        world_state["world_time"] = int(child.text)
-                    elif child.tag == "weather":
-                        world_state["weather"] = child.text
+            for record in self._world_loader(save_path):
+                if record.selector == 'section':
+                    if record.tag in self.LIST_SECTIONS:
+                        world_state.setdefault(record.tag, [])
                     else:
-                        # Для других элементов просто сохраняем текст
-                        if len(child) == 0:
-                            try:
-                                # Пробуем преобразовать к числу
-                                if '.' in child.text:
-                                    world_state[child.tag] = float(child.text)
-                                else:
-                                    world_state[child.tag] = int(child.text)
-                            except ValueError:
-                                # Если не число, проверяем на булево
-                                if child.text.lower() in ['true', 'false']:
-                                    world_state[child.tag] = child.text.lower() == 'true'
-                                else:
-                                    world_state[child.tag] = child.text
-                        else:
-                            # Если есть дочерние элементы, преобразуем их рекурсивно
-                            world_state[child.tag] = self.element_to_dict(child)
-            
-            self.current_world_state = world_state
-            print(f"Мир загружен: {save_path}")
-            return self.current_world_state
+                        world_state[record.tag] = record.data
+                else:
+                    world_state.setdefault(record.selector, []).append(record.data)
         except ET.ParseError:
             print(f"Ошибка чтения сохранения: {save_path}")
             return None
+        
+        self.current_world_state = world_state
+        print(f"Мир загружен: {save_path}")
+        return self.current_world_state
     
     def element_to_dict(self, element):
         """
@@ -3225,4 +4019,16 @@ if __name__ == "__main__":
     ach_manager.grant_achievement("player1", "first_steps")
     print()
     
+    # Пример потоковой загрузки мира
+    print("--- Потоковая загрузка WorldSaveSystem ---")
+    world_saves = WorldSaveSystem()
+    world_saves.save_world({
+        "npcs": [{"id": f"npc_{i}", "name": f"Житель {i}", "type": "villager",
+                  "position": {"x": i, "y": 0, "z": 0}} for i in range(3)],
+        "weather": "rain"
+    }, "world1", "Демонстрационный мир")
+    for record in world_saves.iter_world("world1"):
+        print(f"{record.selector}: {record.data}")
+    print()
+    
     print("Все игровые классы успешно реализованы и готовы к использованию!")
\ No newline at end of file
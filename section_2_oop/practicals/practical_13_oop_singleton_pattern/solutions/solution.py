@@ -1,7 +1,14 @@
 # Решения для практического задания 13: ООП - паттерн Singleton в игровом контексте
 
+import atexit
+import gzip
+import shutil
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 from typing import Dict, Any
 
 class GameManager:
@@ -102,35 +109,266 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
+class AsyncLogWriter:
+    """
+    Буферизованная запись лога в файл с фоновым сбросом и ротацией.
+
+    Вызывающий поток только копирует закодированную строку в заранее
+    выделенный bytearray. Заполненные буферы, а также все накопленное за
+    flush_interval, записывает в файл фоновый поток. Когда файл дорастает до
+    max_bytes, он переименовывается и запись продолжается в новый файл,
+    а сжатие в .gz идет в отдельном потоке, не задерживая запись;
+    хранится не больше backup_count сжатых файлов. Если фоновый поток не
+    успевает и свободных буферов нет, запись ждет освобождения буфера.
+
+    Ошибка ввода-вывода (диск заполнен, нет прав) не останавливает фоновый
+    поток: пачка, которую не удалось записать, отбрасывается, ошибка
+    сохраняется в last_error, а число потерянных пачек - в dropped.
+    """
+    def __init__(self, path_factory, max_bytes, backup_count=5, buffer_size=64 * 1024,
+                 buffer_count=4, flush_interval=0.5):
+        self.path_factory = path_factory  # Возвращает путь для нового файла лога
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.backups = deque()  # Сжатые файлы, от старых к новым
+
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)  # Есть что записывать
+        self._space = threading.Condition(self._lock)  # Освободился буфер
+        self._done = threading.Condition(self._lock)  # Пачка записана
+        self._free = [bytearray(buffer_size) for _ in range(buffer_count)]
+        self._full = []  # (буфер, длина) в порядке записи
+        self._buffer = None
+        self._pos = 0
+        self._submitted = 0
+        self._written = 0
+        self._closed = False
+        self._compressor = None  # Пул из одного потока для сжатия ротированных файлов
+        self.last_error = None
+        self.dropped = 0  # Пачки и записи, потерянные из-за ошибок
+
+        self.current_path = Path(path_factory())
+        self._file = open(self.current_path, 'ab')
+        self._size = self._file.tell()
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+
+    def _submit_locked(self):
+        # Отдает текущий буфер фоновому потоку
+        if self._buffer is not None and self._pos:
+            self._full.append((self._buffer, self._pos))
+            self._submitted += 1
+            self._buffer = None
+            self._ready.notify()
+
+    def write(self, data):
+        """Скопировать запись в буфер (в файл ее запишет фоновый поток)"""
+        size = len(data)
+        with self._lock:
+            if self._closed:
+                raise ValueError("Запись в закрытый лог")
+            if self._buffer is None or self._pos + size > self.buffer_size:
+                self._submit_locked()
+                if size > self.buffer_size:
+                    # Слишком длинная запись идет в файл мимо буферов
+                    self._full.append((bytes(data), size))
+                    self._submitted += 1
+                    self._ready.notify()
+                    return
+                if self._buffer is None:
+                    while not self._free:
+                        if self._closed:
+                            raise ValueError("Запись в закрытый лог")
+                        if not self._thread.is_alive():
+                            # Фоновый поток остановлен - ждать буфер бессмысленно
+                            self.dropped += 1
+                            return
+                        self._space.wait(self.flush_interval)
+                    self._buffer = self._free.pop()
+                    self._pos = 0
+            self._buffer[self._pos:self._pos + size] = data
+            self._pos += size
+
+    def flush(self, timeout=None):
+        """Дождаться, пока все записанное до вызова попадет в файл"""
+        with self._lock:
+            self._submit_locked()
+            target = self._submitted
+            dropped = self.dropped
+            self._ready.notify()
+            return self._done.wait_for(
+                lambda: self._written >= target or not self._thread.is_alive(), timeout
+            ) and self._written >= target and self.dropped == dropped
+
+    def close(self):
+        """Сбросить оставшиеся данные и остановить фоновый поток"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._submit_locked()
+            self._ready.notify()
+        self._thread.join()
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+
+    def _record_error(self, error, dropped):
+        # Вызывается из потока записи и из потока сжатия
+        with self._lock:
+            first = self.last_error is None
+            self.last_error = error
+            self.dropped += dropped
+        if first:
+            print(f"Ошибка записи лога: {error}")
+
+    def _write_batch(self, batch):
+        for chunk, length in batch:
+            try:
+                self._write_chunk(chunk, length)
+            except Exception as error:
+                self._record_error(error, 1)
+        if batch:
+            try:
+                self._file.flush()
+            except Exception as error:
+                self._record_error(error, 0)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._full and not self._closed:
+                    self._ready.wait(self.flush_interval)
+                # Сброс по времени забирает и частично заполненный буфер
+                self._submit_locked()
+                batch, self._full = self._full, []
+                closed = self._closed
+
+            self._write_batch(batch)
+
+            with self._lock:
+                for chunk, _ in batch:
+                    if isinstance(chunk, bytearray):
+                        self._free.append(chunk)
+                self._written += len(batch)
+                self._space.notify_all()
+                self._done.notify_all()
+                if closed and not self._full:
+                    break
+        try:
+            self._file.close()
+        except OSError as error:
+            self._record_error(error, 0)
+
+    def _write_chunk(self, chunk, length):
+        if self._file.closed:
+            # Прошлая ротация не смогла открыть новый файл - пробуем снова
+            self._file = open(self.current_path, 'ab')
+            self._size = self._file.tell()
+        if self._size and self._size + length > self.max_bytes:
+            self._rotate()
+        with memoryview(chunk) as view:
+            self._file.write(view[:length])
+        self._size += length
+
+    def _rotate(self):
+        self._file.close()
+        old_path = self.current_path
+        try:
+            # Файл только переименовывается, а сжимает его отдельный поток:
+            # фоновый поток записи не задерживается и буферы освобождаются
+            pending = old_path.with_name(old_path.name + ".rotated")
+            index = 1
+            while pending.exists():
+                pending = old_path.with_name(f"{old_path.name}.{index}.rotated")
+                index += 1
+            old_path.rename(pending)
+            if self._compressor is None:
+                self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncLogCompressor")
+            self._compressor.submit(self._compress, pending, old_path)
+        finally:
+            # Новый файл открываем, даже если переименовать старый не удалось
+            self.current_path = Path(self.path_factory())
+            self._file = open(self.current_path, 'ab')
+            self._size = self._file.tell()
+
+    def _compress(self, pending, original):
+        """Сжимает отложенный ротацией файл лога в .gz (в потоке сжатия)"""
+        archive = original.with_name(original.name + ".gz")
+        index = 1
+        while archive.exists():
+            archive = original.with_name(f"{original.name}.{index}.gz")
+            index += 1
+        try:
+            with open(pending, 'rb') as src, gzip.open(archive, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            pending.unlink()
+        except Exception as error:
+            archive.unlink(missing_ok=True)  # Несжатый файл остается на месте
+            self._record_error(error, 0)
+            return
+        # Поток сжатия один, поэтому backups меняется только здесь
+        self.backups.append(archive)
+        while len(self.backups) > self.backup_count:
+            self.backups.popleft().unlink(missing_ok=True)
+
+
 class GameLogger(metaclass=SingletonMeta):
     """
     Логгер игры - Singleton для ведения игровых логов
+
+    В памяти хранится только последние max_logs записей (и отдельный хвост
+    для каждого уровня). Запись в файл включается enable_file_logging и идет
+    через AsyncLogWriter, не блокируя игровой поток.
     """
-    def __init__(self):
+    def __init__(self, max_logs=10000):
         if not hasattr(self, 'logs'):
-            self.logs = []
+            self.logs = deque(maxlen=max_logs)
+            self.logs_by_level = {}
+            self.max_logs = max_logs
             self.log_file = "game.log"
+            self.echo = True  # Дублировать записи в консоль
+            self.writer = None
+            self._stamp = (None, "")
+
+    def enable_file_logging(self, max_bytes=10 * 1024 * 1024, backup_count=5, flush_interval=0.5):
+        """Включить асинхронную запись логов в файл с ротацией"""
+        if self.writer is None:
+            self.writer = AsyncLogWriter(lambda: self.log_file, max_bytes, backup_count,
+                                         flush_interval=flush_interval)
+            atexit.register(self.writer.close)
+        return self.writer
 
     def log(self, message, level="INFO"):
         """Запись лога с уровнем"""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] [{level}] {message}"
+        now = time.time()
+        second = int(now)
+        stamp_second, stamp = self._stamp
+        if second != stamp_second:
+            stamp = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+            self._stamp = (second, stamp)
+        log_entry = f"[{stamp}] [{level}] {message}"
         self.logs.append(log_entry)
-        print(log_entry)  # Выводим в консоль
-        # Здесь могла бы быть запись в файл
-        # with open(self.log_file, "a", encoding="utf-8") as f:
-        #     f.write(log_entry + "\n")
+        level_logs = self.logs_by_level.get(level)
+        if level_logs is None:
+            level_logs = self.logs_by_level.setdefault(level, deque(maxlen=self.max_logs))
+        level_logs.append(log_entry)
+        if self.echo:
+            print(log_entry)  # Выводим в консоль
+        if self.writer is not None:
+            self.writer.write((log_entry + "\n").encode("utf-8"))
 
     def get_logs(self, level_filter=None):
         """Получить логи с фильтрацией по уровню"""
         if level_filter:
-            return [log for log in self.logs if level_filter in log]
-        return self.logs.copy()
+            return list(self.logs_by_level.get(level_filter, ()))
+        return list(self.logs)
 
     def clear_logs(self):
         """Очистить все логи"""
         self.logs.clear()
+        self.logs_by_level.clear()
         print("Логи очищены")
 
 